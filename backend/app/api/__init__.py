@@ -1,4 +1,4 @@
-from app.api.routes import bacteria, health, predictions
+from app.api.routes import bacteria, health, predictions, taxonomy
 from fastapi import APIRouter
 
 api_router = APIRouter()
@@ -8,3 +8,4 @@ api_router.include_router(bacteria.router, prefix="/bacteria", tags=["bacteria"]
 api_router.include_router(
     predictions.router, prefix="/predictions", tags=["predictions"]
 )
+api_router.include_router(taxonomy.router, prefix="/taxonomy", tags=["taxonomy"])
@@ -1,27 +1,126 @@
 import logging
-from typing import Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 from app.api.deps import get_db
+from app.core.cache import bacteria_cache_keys, entity_cache
 from app.core.response import (
     PaginatedResponseStructure,
     StandardResponse,
     paginated_response,
     success_response,
 )
+from app.core.singleflight import make_key, request_coalescer
 from app.models.bacteria import Bacteria
 from app.schemas.bacteria import (
     BacteriaCreateSchema,
+    BacteriaLookupRequestSchema,
+    BacteriaLookupResponseDataSchema,
     BacteriaResponseSchema,
     BacteriaUpdateSchema,
+    serialize_float_to_json_safe,
 )
+from app.services.taxonomy import taxonomy_index, taxonomy_path
 from fastapi import APIRouter, Depends, HTTPException, Query, status
-from sqlalchemy import func, or_
+from fastapi.responses import JSONResponse
+from sqlalchemy import any_, bindparam, func, or_
+from sqlalchemy.dialects.postgresql import ARRAY
 from sqlalchemy.orm import Session as SQLAlchemySession
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+BACTERIA_FIELDS = list(BacteriaResponseSchema.model_fields)
+
+LOOKUP_IN_CHUNK_SIZE = 500
+
+FIELDS_QUERY_DESCRIPTION = (
+    "Comma-separated list of fields to return (e.g. 'bacteria_id,name,gram_stain'). "
+    "Only these columns are selected from the database; 'id' is always included."
+)
+
+
+def _parse_fields(fields: Optional[str]) -> Optional[List[str]]:
+    if not fields:
+        return None
+    requested = [field.strip() for field in fields.split(",") if field.strip()]
+    unknown = [field for field in requested if field not in BACTERIA_FIELDS]
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown field(s): {', '.join(unknown)}. Valid fields: {', '.join(BACTERIA_FIELDS)}",
+        )
+    return ["id"] + [field for field in dict.fromkeys(requested) if field != "id"]
+
+
+def _select_fields(db: SQLAlchemySession, selected_fields: List[str]):
+    return db.query(*[getattr(Bacteria, field) for field in selected_fields])
+
+
+def _serialize_projected_row(row: Any, selected_fields: List[str]) -> Dict[str, Any]:
+    data = dict(zip(selected_fields, row))
+    if "optimal_temperature" in data:
+        data["optimal_temperature"] = serialize_float_to_json_safe(
+            data["optimal_temperature"]
+        )
+    for field in ("created_at", "updated_at"):
+        if data.get(field) is not None:
+            data[field] = data[field].isoformat()
+    return data
+
+
+def _projected_response(response: Any) -> JSONResponse:
+    """Skips response_model validation, which would fill in unselected fields."""
+    return JSONResponse(content=response.model_dump(mode="json"))
+
+
+def _cache_bacteria(bacteria: Bacteria, generation: Optional[int]) -> dict:
+    """
+    Serializes a row and stores it in the entity cache under both of its keys,
+    unless the cache was invalidated since ``generation`` (taken before the
+    row was read).
+    """
+    data = BacteriaResponseSchema.model_validate(bacteria).model_dump(mode="json")
+    entity_cache.set_many(
+        {
+            key: data
+            for key in bacteria_cache_keys(
+                obj_id=bacteria.id, bacteria_id=bacteria.bacteria_id
+            )
+        },
+        generation,
+    )
+    return data
+
+
+def _invalidate_bacteria(obj_id: int, bacteria_id: str) -> None:
+    entity_cache.invalidate(bacteria_cache_keys(obj_id=obj_id, bacteria_id=bacteria_id))
+
+
+def _get_bacteria(
+    db: SQLAlchemySession,
+    cache_key: str,
+    criterion: Any,
+    selected_fields: Optional[List[str]] = None,
+) -> Optional[Dict[str, Any]]:
+    """
+    Cache first, then the database. Projected misses select only the requested
+    columns and are not cached, since the cache holds full rows.
+    """
+    bacteria = entity_cache.get(cache_key)
+    if bacteria is not None:
+        if selected_fields:
+            return {field: bacteria.get(field) for field in selected_fields}
+        return bacteria
+
+    if selected_fields:
+        row = _select_fields(db, selected_fields).filter(criterion).first()
+        return _serialize_projected_row(row, selected_fields) if row else None
+
+    generation = entity_cache.generation()
+    bacteria_orm = db.query(Bacteria).filter(criterion).first()
+    return _cache_bacteria(bacteria_orm, generation) if bacteria_orm else None
+
 
 @router.post(
     "",
@@ -56,26 +155,106 @@ def create_bacteria_entry(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Database error: {str(e)}",
         )
+    _invalidate_bacteria(db_bacteria.id, db_bacteria.bacteria_id)
+    taxonomy_index.add(taxonomy_path(db_bacteria), db_bacteria.updated_at)
     return success_response(
         data=db_bacteria, message="Bacteria entry created successfully."
     )
 
 
+def _match_any(db: SQLAlchemySession, column: Any, values: List[Any]) -> List[Any]:
+    """
+    Criteria matching ``column`` against ``values`` in as few statements as
+    possible: one ``= ANY(:array)`` on Postgres, chunked ``IN`` elsewhere.
+    """
+    if db.get_bind().dialect.name == "postgresql":
+        keys = bindparam("lookup_keys", values, type_=ARRAY(column.type))
+        return [column == any_(keys)]
+    return [
+        column.in_(values[start : start + LOOKUP_IN_CHUNK_SIZE])
+        for start in range(0, len(values), LOOKUP_IN_CHUNK_SIZE)
+    ]
+
+
+@router.post(
+    "/lookup", response_model=StandardResponse[BacteriaLookupResponseDataSchema]
+)
+def lookup_bacteria(
+    *,
+    db: SQLAlchemySession = Depends(get_db),
+    lookup_in: BacteriaLookupRequestSchema,
+    fields: Optional[str] = Query(None, description=FIELDS_QUERY_DESCRIPTION),
+):
+    if lookup_in.bacteria_ids:
+        key_field, keys = "bacteria_id", lookup_in.bacteria_ids
+    else:
+        key_field, keys = "id", lookup_in.ids
+    key_column = getattr(Bacteria, key_field)
+
+    selected_fields = _parse_fields(fields)
+    if selected_fields and key_field not in selected_fields:
+        selected_fields.append(key_field)
+
+    found: Dict[Any, Any] = {}
+    try:
+        for criterion in _match_any(db, key_column, list(dict.fromkeys(keys))):
+            if selected_fields:
+                for row in _select_fields(db, selected_fields).filter(criterion):
+                    data = _serialize_projected_row(row, selected_fields)
+                    found[data[key_field]] = data
+            else:
+                for bacteria in db.query(Bacteria).filter(criterion):
+                    found[getattr(bacteria, key_field)] = bacteria
+    except Exception as e:
+        logger.error(f"Error resolving bacteria lookup: {e}", exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Error processing request during lookup",
+        )
+
+    results = [
+        {"key": key, "found": key in found, "bacteria": found.get(key)} for key in keys
+    ]
+    found_count = sum(1 for result in results if result["found"])
+    lookup_data = {
+        "results": results,
+        "found_count": found_count,
+        "missing_count": len(results) - found_count,
+    }
+    message = f"Resolved {found_count} of {len(results)} requested bacteria."
+
+    if selected_fields:
+        return _projected_response(success_response(data=lookup_data, message=message))
+    return success_response(
+        data=BacteriaLookupResponseDataSchema.model_validate(lookup_data),
+        message=message,
+    )
+
+
 @router.get(
     "/{bacteria_obj_id}", response_model=StandardResponse[BacteriaResponseSchema]
 )
 def get_bacteria_by_db_id(
-    bacteria_obj_id: int, db: SQLAlchemySession = Depends(get_db)
+    bacteria_obj_id: int,
+    db: SQLAlchemySession = Depends(get_db),
+    fields: Optional[str] = Query(None, description=FIELDS_QUERY_DESCRIPTION),
 ):
-    bacteria = db.query(Bacteria).filter(Bacteria.id == bacteria_obj_id).first()
-    if not bacteria:
+    selected_fields = _parse_fields(fields)
+    bacteria = _get_bacteria(
+        db,
+        bacteria_cache_keys(obj_id=bacteria_obj_id)[0],
+        Bacteria.id == bacteria_obj_id,
+        selected_fields,
+    )
+    if bacteria is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Bacteria (by DB ID) not found",
         )
-    return success_response(
+    response = success_response(
         data=bacteria, message="Bacteria (by DB ID) retrieved successfully."
     )
+    return _projected_response(response) if selected_fields else response
 
 
 @router.get(
@@ -83,40 +262,47 @@ def get_bacteria_by_db_id(
     response_model=StandardResponse[BacteriaResponseSchema],
 )
 def get_bacteria_by_unique_id(
-    bacteria_unique_id: str, db: SQLAlchemySession = Depends(get_db)
+    bacteria_unique_id: str,
+    db: SQLAlchemySession = Depends(get_db),
+    fields: Optional[str] = Query(None, description=FIELDS_QUERY_DESCRIPTION),
 ):
-    bacteria = (
-        db.query(Bacteria).filter(Bacteria.bacteria_id == bacteria_unique_id).first()
+    selected_fields = _parse_fields(fields)
+    bacteria = _get_bacteria(
+        db,
+        bacteria_cache_keys(bacteria_id=bacteria_unique_id)[0],
+        Bacteria.bacteria_id == bacteria_unique_id,
+        selected_fields,
     )
-    if not bacteria:
+    if bacteria is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Bacteria (by unique bacteria_id) not found",
         )
-    return success_response(
+    response = success_response(
         data=bacteria,
         message="Bacteria (by unique bacteria_id) retrieved successfully.",
     )
+    return _projected_response(response) if selected_fields else response
 
 
-@router.get("", response_model=PaginatedResponseStructure[BacteriaResponseSchema])
-def list_bacteria(
-    db: SQLAlchemySession = Depends(get_db),
-    page: int = Query(1, ge=1, description="Page number"),
-    page_size: int = Query(20, ge=1, le=100, description="Items per page"),
-    search: Optional[str] = Query(
-        None,
-        min_length=2,
-        description="Search term (min 2 chars) for name, species, genus, or bacteria_id",
-    ),
-    is_pathogen: Optional[bool] = Query(
-        None, description="Filter by pathogenicity status"
-    ),
-    gram_stain: Optional[str] = Query(
-        None, description="Filter by Gram stain (e.g., 'Positive', 'Negative')"
-    ),
-):
-    query = db.query(Bacteria)
+def _query_bacteria_page(
+    db: SQLAlchemySession,
+    page: int,
+    page_size: int,
+    search: Optional[str],
+    is_pathogen: Optional[bool],
+    gram_stain: Optional[str],
+    selected_fields: Optional[List[str]],
+) -> Tuple[int, List[Dict[str, Any]]]:
+    """
+    Runs the count and page queries for list_bacteria. Rows are returned as
+    plain dicts so a coalesced result can be shared across requests without
+    touching the leader's session.
+    """
+    if selected_fields:
+        query = _select_fields(db, selected_fields)
+    else:
+        query = db.query(Bacteria)
 
     if search:
         search_term = f"%{search}%"
@@ -153,13 +339,61 @@ def list_bacteria(
             status_code=500, detail="Error processing request during fetch"
         )
 
-    return paginated_response(
-        data=bacteria_list_orm,
+    if selected_fields:
+        return total_items, [
+            _serialize_projected_row(row, selected_fields) for row in bacteria_list_orm
+        ]
+    return total_items, [
+        BacteriaResponseSchema.model_validate(bacteria).model_dump()
+        for bacteria in bacteria_list_orm
+    ]
+
+
+@router.get("", response_model=PaginatedResponseStructure[BacteriaResponseSchema])
+def list_bacteria(
+    db: SQLAlchemySession = Depends(get_db),
+    page: int = Query(1, ge=1, description="Page number"),
+    page_size: int = Query(20, ge=1, le=100, description="Items per page"),
+    search: Optional[str] = Query(
+        None,
+        min_length=2,
+        description="Search term (min 2 chars) for name, species, genus, or bacteria_id",
+    ),
+    is_pathogen: Optional[bool] = Query(
+        None, description="Filter by pathogenicity status"
+    ),
+    gram_stain: Optional[str] = Query(
+        None, description="Filter by Gram stain (e.g., 'Positive', 'Negative')"
+    ),
+    fields: Optional[str] = Query(None, description=FIELDS_QUERY_DESCRIPTION),
+):
+    selected_fields = _parse_fields(fields)
+    coalesce_key = make_key(
+        "list_bacteria",
+        {
+            "page": page,
+            "page_size": page_size,
+            "search": search,
+            "is_pathogen": is_pathogen,
+            "gram_stain": gram_stain,
+            "fields": selected_fields,
+        },
+    )
+    total_items, bacteria_list = request_coalescer.do(
+        coalesce_key,
+        lambda: _query_bacteria_page(
+            db, page, page_size, search, is_pathogen, gram_stain, selected_fields
+        ),
+    )
+
+    response = paginated_response(
+        data=bacteria_list,
         total_items=total_items,
         page=page,
         page_size=page_size,
         message="Bacteria retrieved successfully",
     )
+    return _projected_response(response) if selected_fields else response
 
 
 @router.put(
@@ -183,6 +417,7 @@ def update_bacteria_entry(
             status_code=status.HTTP_400_BAD_REQUEST, detail="No update data provided"
         )
 
+    old_taxonomy_path = taxonomy_path(db_bacteria)
     for field, value in update_data.items():
         setattr(db_bacteria, field, value)
 
@@ -199,6 +434,10 @@ def update_bacteria_entry(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Database error on update: {str(e)}",
         )
+    _invalidate_bacteria(bacteria_obj_id, db_bacteria.bacteria_id)
+    taxonomy_index.replace(
+        old_taxonomy_path, taxonomy_path(db_bacteria), db_bacteria.updated_at
+    )
     return success_response(
         data=db_bacteria, message="Bacteria entry updated successfully."
     )
@@ -214,6 +453,8 @@ def delete_bacteria_entry(
             status_code=status.HTTP_404_NOT_FOUND, detail="Bacteria not found"
         )
 
+    old_taxonomy_path = taxonomy_path(db_bacteria)
+    old_bacteria_id = db_bacteria.bacteria_id
     try:
         db.delete(db_bacteria)
         db.commit()
@@ -226,4 +467,6 @@ def delete_bacteria_entry(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Database error on delete: {str(e)}",
         )
+    _invalidate_bacteria(bacteria_obj_id, old_bacteria_id)
+    taxonomy_index.remove(old_taxonomy_path)
     return None
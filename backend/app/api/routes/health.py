@@ -1,7 +1,10 @@
 from typing import Any, Dict
 
 from app.api.deps import get_db
+from app.core.cache import entity_cache
 from app.core.response import StandardResponse, success_response
+from app.core.singleflight import request_coalescer
+from app.ml.model_service import model_service
 from fastapi import APIRouter, Depends
 from sqlalchemy.orm import Session as SQLAlchemySession
 
@@ -29,6 +32,25 @@ def health_check_detailed(db: SQLAlchemySession = Depends(get_db)):
         message="Detailed health check",
         data={
             "overall_status": "UP" if db_status == "UP" else "DEGRADED",
-            "components": {"database": {"status": db_status, "error": db_error}},
+            "components": {
+                "database": {"status": db_status, "error": db_error},
+                "entity_cache": entity_cache.stats(),
+                "request_coalescing": request_coalescer.stats(),
+                "model": model_service.stats(),
+            },
         },
     )
+
+
+@router.get("/model", response_model=StandardResponse[Dict[str, Any]])
+def health_check_model():
+    return success_response(
+        message="Model cascade statistics", data=model_service.stats()
+    )
+
+
+@router.get("/cache", response_model=StandardResponse[Dict[str, Any]])
+def health_check_cache():
+    return success_response(
+        message="Entity cache statistics", data=entity_cache.stats()
+    )
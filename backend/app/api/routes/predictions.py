@@ -23,8 +23,8 @@ def predict_bacteria_pathogenicity(
     bacteria_input: BacteriaPredictionInputSchema,
 ):
     try:
-        prediction_label, probability = model_service.predict_pathogenicity(
-            bacteria_input.model_dump()
+        prediction_label, probability, model_stage = (
+            model_service.predict_pathogenicity_with_stage(bacteria_input.model_dump())
         )
     except ValueError as e:
         raise HTTPException(
@@ -64,6 +64,7 @@ def predict_bacteria_pathogenicity(
         input_bacteria=bacteria_input,
         is_pathogen_prediction=bool(prediction_label),
         pathogen_probability=float(probability),
+        model_stage=model_stage,
         similar_bacteria=similar_bacteria_response,
     )
     return success_response(
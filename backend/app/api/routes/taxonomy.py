@@ -0,0 +1,67 @@
+from typing import List, Optional
+
+from app.api.deps import get_db
+from app.core.response import StandardResponse, success_response
+from app.schemas.taxonomy import TaxonomyNodeSchema
+from app.services.taxonomy import TAXONOMY_RANKS, taxonomy_index
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.orm import Session as SQLAlchemySession
+
+router = APIRouter()
+
+
+@router.get("", response_model=StandardResponse[TaxonomyNodeSchema])
+def get_taxonomy_roots(db: SQLAlchemySession = Depends(get_db)):
+    taxonomy_index.ensure_built(db)
+    node = taxonomy_index.get_node(())
+    return success_response(data=node, message="Taxonomy roots retrieved successfully.")
+
+
+@router.get(
+    "/{rank}/{value}/children", response_model=StandardResponse[TaxonomyNodeSchema]
+)
+def get_taxonomy_children(
+    rank: str,
+    value: str,
+    lineage: Optional[List[str]] = Query(
+        None,
+        description="Values of the ranks above `rank`, from superkingdom down "
+        "(repeat the parameter), as returned in each child's `lineage`. "
+        "Needed when the value occurs under more than one parent.",
+    ),
+    db: SQLAlchemySession = Depends(get_db),
+):
+    if rank not in TAXONOMY_RANKS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown taxonomy rank '{rank}'. Valid ranks: {', '.join(TAXONOMY_RANKS)}",
+        )
+    ancestors = TAXONOMY_RANKS[: TAXONOMY_RANKS.index(rank)]
+    if lineage is not None and len(lineage) != len(ancestors):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"lineage must give {len(ancestors)} values "
+            f"({', '.join(ancestors)}) for rank '{rank}'",
+        )
+
+    taxonomy_index.ensure_built(db)
+    if lineage is not None:
+        paths = [(*lineage, value)]
+    else:
+        paths = taxonomy_index.find_paths(rank, value)
+        if len(paths) > 1:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail=f"{rank}='{value}' occurs under {len(paths)} parents; pass "
+                "the lineage of one of: "
+                + "; ".join(" > ".join(path[:-1]) for path in paths),
+            )
+    node = taxonomy_index.get_node(paths[0]) if paths else None
+    if node is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Taxonomy node {rank}='{value}' not found",
+        )
+    return success_response(
+        data=node, message="Taxonomy children retrieved successfully."
+    )
@@ -0,0 +1,304 @@
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, Optional
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class CacheBackend:
+    """
+    Minimal key/value interface shared by the entity cache backends.
+
+    Every delete/clear bumps a generation counter. A read-through fill takes
+    the generation before reading the database and passes it to set_many,
+    which drops the fill if an invalidation happened in between; otherwise
+    a row read just before a write could be cached after the write's
+    invalidation and served stale until it expired.
+    """
+
+    name = "base"
+
+    def get(self, key: str) -> Optional[Any]:
+        raise NotImplementedError
+
+    def generation(self) -> int:
+        return 0
+
+    def set_many(self, items: Dict[str, Any], generation: Optional[int] = None) -> None:
+        """Stores ``items``, unless ``generation`` is given and no longer current."""
+        raise NotImplementedError
+
+    def delete(self, *keys: str) -> None:
+        raise NotImplementedError
+
+    def clear(self) -> None:
+        raise NotImplementedError
+
+    def size(self) -> Optional[int]:
+        return None
+
+
+class LRUCacheBackend(CacheBackend):
+    """Bounded in-process LRU with per-entry TTL. Not shared between workers."""
+
+    name = "memory"
+
+    def __init__(self, max_items: int = 10000, ttl_seconds: Optional[float] = None):
+        self.max_items = max_items
+        self.ttl_seconds = ttl_seconds
+        self._data: "OrderedDict[str, tuple]" = OrderedDict()
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at is not None and expires_at < time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def generation(self) -> int:
+        with self._lock:
+            return self._generation
+
+    def set_many(self, items: Dict[str, Any], generation: Optional[int] = None) -> None:
+        expires_at = time.monotonic() + self.ttl_seconds if self.ttl_seconds else None
+        with self._lock:
+            if generation is not None and generation != self._generation:
+                return
+            for key, value in items.items():
+                self._data[key] = (expires_at, value)
+                self._data.move_to_end(key)
+            while len(self._data) > self.max_items:
+                self._data.popitem(last=False)
+
+    def delete(self, *keys: str) -> None:
+        with self._lock:
+            self._generation += 1
+            for key in keys:
+                self._data.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._generation += 1
+            self._data.clear()
+
+    def size(self) -> Optional[int]:
+        with self._lock:
+            return len(self._data)
+
+
+class RedisCacheBackend(CacheBackend):
+    """
+    Stores JSON-encoded values in any client speaking the Redis protocol
+    (redis-py, fakeredis, ...), so all workers see the same entries and the
+    same invalidations. The generation is a shared counter key; fills WATCH
+    it, so an invalidation from any worker aborts them.
+    """
+
+    name = "redis"
+
+    def __init__(
+        self,
+        client: Any,
+        prefix: str = "kds:",
+        ttl_seconds: Optional[float] = None,
+    ):
+        self.client = client
+        self.prefix = prefix
+        self.ttl_seconds = int(ttl_seconds) if ttl_seconds else None
+        self.generation_key = f"{prefix}generation"
+
+    def get(self, key: str) -> Optional[Any]:
+        raw = self.client.get(self.prefix + key)
+        if raw is None:
+            return None
+        if isinstance(raw, bytes):
+            raw = raw.decode("utf-8")
+        return json.loads(raw)
+
+    def generation(self) -> int:
+        return int(self.client.get(self.generation_key) or 0)
+
+    def set_many(self, items: Dict[str, Any], generation: Optional[int] = None) -> None:
+        from redis.exceptions import WatchError
+
+        with self.client.pipeline() as pipe:
+            try:
+                if generation is not None:
+                    pipe.watch(self.generation_key)
+                    if int(pipe.get(self.generation_key) or 0) != generation:
+                        return
+                    pipe.multi()
+                for key, value in items.items():
+                    pipe.set(
+                        self.prefix + key,
+                        json.dumps(value, default=str),
+                        ex=self.ttl_seconds,
+                    )
+                pipe.execute()
+            except WatchError:
+                # Invalidated between the check and the write.
+                pass
+
+    def delete(self, *keys: str) -> None:
+        pipe = self.client.pipeline()
+        pipe.incr(self.generation_key)
+        if keys:
+            pipe.delete(*[self.prefix + key for key in keys])
+        pipe.execute()
+
+    def clear(self) -> None:
+        keys = [
+            key
+            for key in self.client.scan_iter(match=f"{self.prefix}*")
+            if key not in (self.generation_key, self.generation_key.encode("utf-8"))
+        ]
+        pipe = self.client.pipeline()
+        pipe.incr(self.generation_key)
+        if keys:
+            pipe.delete(*keys)
+        pipe.execute()
+
+
+class NullCacheBackend(CacheBackend):
+    name = "none"
+
+    def get(self, key: str) -> Optional[Any]:
+        return None
+
+    def set_many(self, items: Dict[str, Any], generation: Optional[int] = None) -> None:
+        pass
+
+    def delete(self, *keys: str) -> None:
+        pass
+
+    def clear(self) -> None:
+        pass
+
+
+class ReadThroughCache:
+    """Wraps a backend with hit/miss accounting. Backend errors count as misses."""
+
+    def __init__(self, backend: CacheBackend):
+        self.backend = backend
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Any]:
+        try:
+            value = self.backend.get(key)
+        except Exception as e:
+            logger.warning(f"Cache get failed for key '{key}': {e}")
+            value = None
+            with self._lock:
+                self.errors += 1
+        with self._lock:
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return value
+
+    def generation(self) -> Optional[int]:
+        """Read before loading from the database; None if the backend failed."""
+        try:
+            return self.backend.generation()
+        except Exception as e:
+            logger.warning(f"Cache generation read failed: {e}")
+            with self._lock:
+                self.errors += 1
+            return None
+
+    def set_many(self, items: Dict[str, Any], generation: Optional[int]) -> None:
+        """Fills ``items`` unless the cache was invalidated since ``generation``."""
+        if generation is None:
+            return
+        try:
+            self.backend.set_many(items, generation)
+        except Exception as e:
+            logger.warning(f"Cache set failed for keys {list(items)}: {e}")
+            with self._lock:
+                self.errors += 1
+
+    def invalidate(self, keys: Iterable[str]) -> None:
+        keys = [key for key in keys if key]
+        if not keys:
+            return
+        try:
+            self.backend.delete(*keys)
+        except Exception as e:
+            logger.warning(f"Cache invalidation failed for keys {keys}: {e}")
+            with self._lock:
+                self.errors += 1
+
+    def clear(self) -> None:
+        self.backend.clear()
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            self.hits = self.misses = self.errors = 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "backend": self.backend.name,
+                "hits": self.hits,
+                "misses": self.misses,
+                "errors": self.errors,
+                "hit_rate": (self.hits / lookups) if lookups else 0.0,
+                "size": self.backend.size(),
+            }
+
+
+def build_cache_backend() -> CacheBackend:
+    backend_name = settings.ENTITY_CACHE_BACKEND.lower()
+    ttl = settings.ENTITY_CACHE_TTL_SECONDS or None
+
+    if backend_name == "none":
+        return NullCacheBackend()
+
+    if backend_name == "redis":
+        if not settings.REDIS_URL:
+            logger.warning(
+                "ENTITY_CACHE_BACKEND=redis but REDIS_URL is not set. Falling back to in-process LRU."
+            )
+        else:
+            try:
+                import redis
+
+                client = redis.Redis.from_url(settings.REDIS_URL)
+                return RedisCacheBackend(client, ttl_seconds=ttl)
+            except ImportError:
+                logger.warning(
+                    "redis package not installed. Falling back to in-process LRU cache."
+                )
+
+    return LRUCacheBackend(max_items=settings.ENTITY_CACHE_MAX_ITEMS, ttl_seconds=ttl)
+
+
+def bacteria_cache_keys(
+    obj_id: Optional[int] = None, bacteria_id: Optional[str] = None
+) -> list:
+    keys = []
+    if obj_id is not None:
+        keys.append(f"bacteria:id:{obj_id}")
+    if bacteria_id:
+        keys.append(f"bacteria:bid:{bacteria_id}")
+    return keys
+
+
+entity_cache = ReadThroughCache(build_cache_backend())
@@ -66,8 +66,25 @@ class Settings(BaseSettings):
 
     ML_MODEL_PATH: str = "ml_models/bacteria_classifier_xgboost_with_smote_tuned.pkl"
     ML_MODEL_PRELOAD: bool = True
+    # Optional cheaper model tried before ML_MODEL_PATH; rows it scores inside
+    # [LOW, HIGH] are escalated to ML_MODEL_PATH.
+    ML_CASCADE_FIRST_STAGE_PATH: Optional[str] = None
+    ML_CASCADE_UNCERTAINTY_LOW: float = 0.1
+    ML_CASCADE_UNCERTAINTY_HIGH: float = 0.9
+    CATALOG_SNAPSHOT_PATH: str = "/app/data/bacteria_snapshot.arrow"
     LOG_LEVEL: str = "INFO"
 
+    ENTITY_CACHE_BACKEND: str = "memory"
+    ENTITY_CACHE_MAX_ITEMS: int = 10000
+    ENTITY_CACHE_TTL_SECONDS: int = 300
+    REDIS_URL: Optional[str] = None
+
+    REQUEST_COALESCING_ENABLED: bool = True
+
+    # How often the taxonomy index checks the bacteria table for writes made
+    # outside the API (bulk loads, --sync, the scraper).
+    TAXONOMY_INDEX_CHECK_SECONDS: float = 5.0
+
     model_config = SettingsConfigDict(
         env_file=".env",
         env_file_encoding="utf-8",
@@ -0,0 +1,116 @@
+import argparse
+import logging
+import math
+import os
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+from app.db.init_db import CSV_FILE_PATH, clean_csv_dataframe, clean_csv_rows
+
+logger = logging.getLogger(__name__)
+
+MESSY_VALUES = ["NULL", "", " n/a ", "Not Available", "#N/A", "<NA>", "nan"]
+
+
+def make_synthetic_csv(source_path: str, rows: int, output_path: str, seed: int = 0):
+    """
+    Writes a MiMeDB-shaped CSV by resampling rows of the bundled file, giving
+    each a unique microbe_id and sprinkling in NA tokens, padded values and
+    duplicate/missing IDs so every cleaning branch is exercised.
+    """
+    rng = np.random.default_rng(seed)
+    source = pd.read_csv(source_path, dtype=str, keep_default_na=False)
+    df = source.iloc[rng.integers(0, len(source), size=rows)].reset_index(drop=True)
+
+    df["microbe_id"] = [f"MMDBm{i:09d}" for i in range(rows)]
+    duplicate_rows = rng.random(rows) < 0.001
+    df.loc[duplicate_rows, "microbe_id"] = "MMDBm000000000"
+    missing_rows = rng.random(rows) < 0.001
+    df.loc[missing_rows, "microbe_id"] = "NULL"
+
+    for column in ["gram", "optimal_temperature", "mobility", "habitat", "shape"]:
+        messy = rng.random(rows) < 0.05
+        df.loc[messy, column] = rng.choice(MESSY_VALUES, size=int(messy.sum()))
+    padded = rng.random(rows) < 0.05
+    df.loc[padded, "optimal_temperature"] = "  approx. 37.5 C "
+    df.loc[padded, "human_pathogen"] = " Yes "
+
+    df.to_csv(output_path, index=False)
+
+
+def _records_equal(left, right) -> bool:
+    if len(left) != len(right):
+        return False
+    for a, b in zip(left, right):
+        if a.keys() != b.keys():
+            return False
+        for key in a:
+            x, y = a[key], b[key]
+            if type(x) is not type(y):
+                return False
+            if isinstance(x, float) and math.isnan(x) and math.isnan(y):
+                continue
+            if x != y:
+                return False
+    return True
+
+
+def run_benchmark(rows: int, check_rows: int, source_path: str):
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        csv_path = os.path.join(tmp_dir, "synthetic_mimedb.csv")
+        started = time.perf_counter()
+        make_synthetic_csv(source_path, rows, csv_path)
+        logger.info(
+            f"Generated {rows} synthetic rows in {time.perf_counter() - started:.2f}s"
+        )
+
+        started = time.perf_counter()
+        df = pd.read_csv(csv_path, low_memory=False, dtype=str, keep_default_na=False)
+        read_seconds = time.perf_counter() - started
+
+        started = time.perf_counter()
+        records, stats = clean_csv_dataframe(df)
+        vectorized_seconds = time.perf_counter() - started
+
+        sample = df.head(check_rows)
+        started = time.perf_counter()
+        reference_records, reference_stats = clean_csv_rows(sample)
+        per_row_seconds = time.perf_counter() - started
+        sample_records, sample_stats = clean_csv_dataframe(sample)
+
+    equivalent = (
+        _records_equal(reference_records, sample_records)
+        and reference_stats == sample_stats
+    )
+    projected_per_row = per_row_seconds / max(len(sample), 1) * rows
+
+    logger.info(
+        f"Ingestion benchmark ({rows} rows): \n"
+        f"  read_csv: {read_seconds:.2f}s\n"
+        f"  vectorized cleaning: {vectorized_seconds:.2f}s "
+        f"({rows / vectorized_seconds:,.0f} rows/s), {len(records)} records, stats={stats}\n"
+        f"  per-row cleaning on {len(sample)} rows: {per_row_seconds:.2f}s "
+        f"(projected {projected_per_row:.0f}s for {rows} rows)\n"
+        f"  speedup: {projected_per_row / vectorized_seconds:.1f}x\n"
+        f"  equivalent to per-row path on sample: {equivalent}"
+    )
+    return equivalent
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    parser = argparse.ArgumentParser(description="CSV ingestion cleaning benchmark")
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument(
+        "--check-rows",
+        type=int,
+        default=20_000,
+        help="Rows cleaned by both paths to verify identical output.",
+    )
+    parser.add_argument("--source", default=CSV_FILE_PATH)
+    args = parser.parse_args()
+
+    if not run_benchmark(args.rows, args.check_rows, args.source):
+        raise SystemExit("Vectorized output differs from the per-row path.")
@@ -0,0 +1,314 @@
+import csv
+import io
+import json
+import logging
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from app.models.bacteria import Bacteria
+from app.services.taxonomy import taxonomy_index
+from sqlalchemy import String, column, literal, select, table, text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.exc import DataError, DBAPIError, IntegrityError
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BATCH_SIZE = 500
+STAGING_TABLE = "bacteria_staging"
+LOADERS = ("auto", "copy", "executemany")
+
+
+def supports_copy(db: Session) -> bool:
+    return db.get_bind().dialect.name == "postgresql"
+
+
+def dialect_insert(db: Session, target: Any):
+    """Returns an INSERT supporting ``on_conflict_do_*`` for the session's dialect."""
+    dialect_name = db.get_bind().dialect.name
+    if dialect_name == "postgresql":
+        return pg_insert(target)
+    if dialect_name == "sqlite":
+        return sqlite_insert(target)
+    raise ValueError(f"Upserts are not supported for dialect '{dialect_name}'.")
+
+
+def _records_to_csv(
+    records: Sequence[Dict[str, Any]], columns: List[str]
+) -> io.StringIO:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for record in records:
+        # None becomes an unquoted empty field, which COPY ... CSV reads as NULL.
+        writer.writerow([record.get(name) for name in columns])
+    buffer.seek(0)
+    return buffer
+
+
+def _conflicting_records(
+    db: Session, staging: Any, records: List[Dict[str, Any]]
+) -> List[Tuple[Dict[str, Any], str]]:
+    """
+    The staged records the merge will skip: those whose bacteria_id is
+    already in bacteria, and repeats of an id earlier in the load (the merge
+    reads the staging table in COPY order, so the first one wins).
+    """
+    bacteria = Bacteria.__table__
+    existing = {
+        bacteria_id
+        for (bacteria_id,) in db.execute(
+            select(staging.c.bacteria_id).select_from(
+                staging.join(bacteria, bacteria.c.bacteria_id == staging.c.bacteria_id)
+            )
+        )
+    }
+    conflicts: List[Tuple[Dict[str, Any], str]] = []
+    seen = set()
+    for record in records:
+        bacteria_id = record.get("bacteria_id")
+        if bacteria_id in existing:
+            conflicts.append((record, "bacteria_id already exists"))
+        elif bacteria_id in seen:
+            conflicts.append((record, "bacteria_id repeated earlier in the load"))
+        else:
+            seen.add(bacteria_id)
+    return conflicts
+
+
+def copy_load(
+    db: Session, records: List[Dict[str, Any]], batch_size: int = DEFAULT_BATCH_SIZE
+) -> Tuple[int, List[Tuple[Dict[str, Any], str]]]:
+    """
+    Streams records into a temporary staging table with COPY FROM STDIN, one
+    buffer per batch, then merges the staging rows into bacteria in a single
+    INSERT ... SELECT. Everything runs in one transaction; rows whose
+    bacteria_id already exists are left untouched. Returns the inserted
+    count and the skipped records with the reason each was skipped.
+    """
+    if not records:
+        return 0, []
+    columns = list(records[0].keys())
+    preparer = db.get_bind().dialect.identifier_preparer
+    quoted_columns = ", ".join(preparer.quote(name) for name in columns)
+
+    db.execute(text(f"DROP TABLE IF EXISTS {STAGING_TABLE}"))
+    db.execute(
+        text(
+            f"CREATE TEMP TABLE {STAGING_TABLE} ON COMMIT DROP AS "
+            f"SELECT {quoted_columns} FROM {Bacteria.__tablename__} WITH NO DATA"
+        )
+    )
+
+    cursor = db.connection().connection.cursor()
+    try:
+        copy_sql = (
+            f"COPY {STAGING_TABLE} ({quoted_columns}) FROM STDIN WITH (FORMAT csv)"
+        )
+        for batch_start in range(0, len(records), batch_size):
+            batch = records[batch_start : batch_start + batch_size]
+            cursor.copy_expert(copy_sql, _records_to_csv(batch, columns))
+        logger.info(f"Copied {len(records)} rows into {STAGING_TABLE}.")
+    finally:
+        cursor.close()
+
+    now = datetime.utcnow()
+    staging = table(STAGING_TABLE, *[column(name) for name in columns])
+    conflicts = _conflicting_records(db, staging, records)
+    merge = (
+        pg_insert(Bacteria.__table__)
+        .from_select(
+            columns + ["created_at", "updated_at"],
+            select(
+                *[staging.c[name] for name in columns],
+                literal(now),
+                literal(now),
+            ),
+        )
+        .on_conflict_do_nothing(index_elements=["bacteria_id"])
+    )
+    inserted = db.execute(merge).rowcount
+    db.commit()
+
+    dropped = len(records) - inserted
+    if dropped != len(conflicts):
+        # Another writer inserted some of these ids after the conflict check.
+        logger.warning(
+            f"The merge skipped {dropped} staged rows; {len(conflicts)} of them "
+            f"are identified in the rejects."
+        )
+    return inserted, conflicts
+
+
+def _reject_reason(error: DBAPIError) -> str:
+    reason = str(getattr(error, "orig", None) or error).strip()
+    return reason.splitlines()[0] if reason else type(error).__name__
+
+
+def write_rejects(path: str, rejects: List[Tuple[Dict[str, Any], str]]) -> None:
+    """Appends rejected records as JSON lines: {"bacteria_id", "reason", "record"}."""
+    if not rejects:
+        return
+    with open(path, "a", encoding="utf-8") as rejects_file:
+        for record, reason in rejects:
+            rejects_file.write(
+                json.dumps(
+                    {
+                        "bacteria_id": record.get("bacteria_id"),
+                        "reason": reason,
+                        "record": record,
+                    },
+                    default=str,
+                )
+                + "\n"
+            )
+
+
+def split_oversized(
+    records: List[Dict[str, Any]],
+) -> Tuple[List[Dict[str, Any]], List[Tuple[Dict[str, Any], str]]]:
+    """
+    Separates records with a value longer than its String(n) column. COPY
+    aborts the whole stream on the first such row, so screening them out
+    up front keeps the rest of the load on the COPY path.
+    """
+    limits = [
+        (column.name, column.type.length)
+        for column in Bacteria.__table__.columns
+        if isinstance(column.type, String) and column.type.length
+    ]
+    good: List[Dict[str, Any]] = []
+    rejects: List[Tuple[Dict[str, Any], str]] = []
+    for record in records:
+        for name, length in limits:
+            value = record.get(name)
+            if isinstance(value, str) and len(value) > length:
+                rejects.append(
+                    (record, f"value too long for bacteria.{name} (max {length})")
+                )
+                break
+        else:
+            good.append(record)
+    return good, rejects
+
+
+def _log_rejects(
+    rejects: List[Tuple[Dict[str, Any], str]], rejects_path: Optional[str]
+) -> None:
+    for record, reason in rejects:
+        logger.error(f"Rejected bacteria_id={record.get('bacteria_id')}: {reason}")
+    if rejects_path:
+        write_rejects(rejects_path, rejects)
+
+
+def _insert_bisecting(
+    db: Session,
+    batch: List[Dict[str, Any]],
+    rejects: List[Tuple[Dict[str, Any], str]],
+    failed: List[Dict[str, Any]],
+) -> int:
+    """
+    Inserts a batch in one transaction; if the database rejects it, splits it
+    in half and retries each half, down to single rows. Good rows are always
+    committed as part of the largest clean sub-batch, so a batch with k bad
+    rows costs about k * log2(len(batch)) extra round trips. A sub-batch
+    failing for any other reason is rolled back and added to ``failed``
+    whole, without stopping its siblings. Returns inserted.
+    """
+    try:
+        db.execute(Bacteria.__table__.insert(), batch)
+        db.commit()
+        return len(batch)
+    except (IntegrityError, DataError) as e:
+        db.rollback()
+        if len(batch) == 1:
+            rejects.append((batch[0], _reject_reason(e)))
+            return 0
+    except Exception as e:
+        db.rollback()
+        logger.error(
+            f"Unexpected error committing {len(batch)} rows: {e}", exc_info=True
+        )
+        failed.extend(batch)
+        return 0
+    middle = len(batch) // 2
+    return _insert_bisecting(db, batch[:middle], rejects, failed) + _insert_bisecting(
+        db, batch[middle:], rejects, failed
+    )
+
+
+def executemany_load(
+    db: Session,
+    records: List[Dict[str, Any]],
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    rejects_path: Optional[str] = None,
+) -> Tuple[int, int]:
+    """
+    Batched executemany inserts, one transaction per batch. Batches hitting a
+    constraint or data error are bisected until the bad rows are isolated;
+    those are logged and, if ``rejects_path`` is set, appended to it with the
+    database's reason. Returns (inserted, errors).
+    """
+    inserted = 0
+    errors = 0
+    for batch_start in range(0, len(records), batch_size):
+        bacteria_to_insert = records[batch_start : batch_start + batch_size]
+        logger.info(
+            f"Attempting to commit batch of {len(bacteria_to_insert)} records..."
+        )
+        rejects: List[Tuple[Dict[str, Any], str]] = []
+        failed: List[Dict[str, Any]] = []
+        inserted += _insert_bisecting(db, bacteria_to_insert, rejects, failed)
+        # Only the rows of the sub-batches that failed; the rest are committed.
+        errors += len(failed)
+
+        if rejects:
+            errors += len(rejects)
+            _log_rejects(rejects, rejects_path)
+        logger.info(f"Committed batch. Total inserted so far: {inserted}")
+    return inserted, errors
+
+
+def bulk_load(
+    db: Session,
+    records: List[Dict[str, Any]],
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    loader: Optional[str] = "auto",
+    rejects_path: Optional[str] = None,
+) -> Tuple[int, int]:
+    """
+    Loads cleaned records into bacteria. ``auto`` uses COPY on Postgres and
+    executemany elsewhere (e.g. SQLite in tests). If the COPY path fails the
+    whole load is rolled back and retried with executemany, which bisects
+    failing batches down to the offending rows. Rejected rows are logged and
+    appended to ``rejects_path`` when given. Returns (inserted, errors).
+    """
+    if loader not in LOADERS:
+        raise ValueError(f"Unknown loader '{loader}'. Expected one of {LOADERS}.")
+
+    use_copy = loader == "copy" or (loader == "auto" and supports_copy(db))
+    if use_copy:
+        if not supports_copy(db):
+            raise ValueError("COPY loader requires a PostgreSQL database.")
+        copy_records, rejects = split_oversized(records)
+        try:
+            inserted, conflicts = copy_load(db, copy_records, batch_size)
+            logger.info(
+                f"COPY load merged {inserted} new rows into bacteria; "
+                f"{len(copy_records) - inserted} skipped on an existing bacteria_id."
+            )
+            _log_rejects(rejects + conflicts, rejects_path)
+            taxonomy_index.invalidate()
+            return inserted, len(records) - inserted
+        except Exception as e:
+            db.rollback()
+            logger.error(
+                f"COPY load failed ({e}). Falling back to batched executemany inserts.",
+                exc_info=True,
+            )
+
+    result = executemany_load(db, records, batch_size, rejects_path=rejects_path)
+    # Readers in this process rebuild the index on next use; other processes
+    # notice the new rows through the index's table fingerprint.
+    taxonomy_index.invalidate()
+    return result
@@ -1,16 +1,22 @@
+import argparse
 import logging
 import math
 import os
 import re
 import sys
+import time
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
 
+import numpy as np
 import pandas as pd
+from app.db.bulk_load import DEFAULT_BATCH_SIZE, LOADERS, bulk_load
+from app.db.fingerprints import IdFingerprintSet, fingerprint
 from app.db.session import Base, SessionLocal, engine
+from app.db.sync import content_hash, record_content_hashes, sync_records
 from app.models.bacteria import (
     Bacteria,
 )
 from sqlalchemy import func
-from sqlalchemy.exc import DataError, IntegrityError
 from sqlalchemy.orm import Session
 
 logging.basicConfig(
@@ -35,43 +41,83 @@ def create_tables(db_engine):
         raise
 
 
+NA_TOKENS = [
+    "not available",
+    "na",
+    "n/a",
+    "",
+    "#n/a",
+    "nan",
+    "<na>",
+    "null",
+]
+TRUE_TOKENS = [
+    "true",
+    "yes",
+    "1",
+    "present",
+    "positive",
+    "y",
+    "pathogenic",
+    # sporulation; app.ml.features maps the boolean back to these words.
+    "sporulating",
+]
+FALSE_TOKENS = [
+    "false",
+    "no",
+    "0",
+    "absent",
+    "negative",
+    "n",
+    "non-pathogenic",
+    "nonsporulating",
+]
+FLOAT_PATTERN = r"([-+]?\d*\.?\d+([eE][-+]?\d+)?)"
+
+COLUMN_MAPPING = {
+    "microbe_id": "bacteria_id",
+    "name": "name",
+    "superkingdom": "superkingdom",
+    "kingdom": "kingdom",
+    "phylum": "phylum",
+    "klass": "class_name",
+    "order": "order",
+    "family": "family",
+    "genus": "genus",
+    "species": "species",
+    "strain": "strain",
+    "gram": "gram_stain",
+    "shape": "shape",
+    "mobility": "mobility",
+    "flagella_presence": "flagellar_presence",
+    "number_of_membranes": "number_of_membranes",
+    "oxygen_requirement": "oxygen_preference",
+    "optimal_temperature": "optimal_temperature",
+    "temperature_range": "temperature_range",
+    "habitat": "habitat",
+    "biotic_relationship": "biotic_relationship",
+    "cell_arrangement": "cell_arrangement",
+    "sporulation": "sporulation",
+    "metabolism": "metabolism",
+    "energy_source": "energy_source",
+    "human_pathogen": "is_pathogen",
+}
+BOOLEAN_FIELDS = ["mobility", "flagellar_presence", "sporulation", "is_pathogen"]
+FLOAT_FIELDS = ["optimal_temperature"]
+
+
 def clean_value(value_from_csv_cell):
     str_value = str(value_from_csv_cell).strip()
-    if pd.isna(value_from_csv_cell) or str_value.lower() in [
-        "not available",
-        "na",
-        "n/a",
-        "",
-        "#n/a",
-        "nan",
-        "<na>",
-        "null",
-    ]:
+    if pd.isna(value_from_csv_cell) or str_value.lower() in NA_TOKENS:
         return None
     return str_value
 
 
 def clean_boolean(value_from_csv_cell):
     val_str = str(value_from_csv_cell).strip().lower()
-    if val_str in [
-        "true",
-        "yes",
-        "1",
-        "present",
-        "positive",
-        "y",
-        "pathogenic",
-    ]:
+    if val_str in TRUE_TOKENS:
         return True
-    if val_str in [
-        "false",
-        "no",
-        "0",
-        "absent",
-        "negative",
-        "n",
-        "non-pathogenic",
-    ]:
+    if val_str in FALSE_TOKENS:
         return False
     if clean_value(value_from_csv_cell) is None:
         return None
@@ -85,7 +131,7 @@ def clean_float(value_from_csv_cell):
         return None
     try:
         f_value = None
-        match = re.search(r"([-+]?\d*\.?\d+([eE][-+]?\d+)?)", val_str)
+        match = re.search(FLOAT_PATTERN, val_str)
         if match:
             f_value = float(match.group(1))
         else:
@@ -105,209 +151,391 @@ def clean_float(value_from_csv_cell):
         return None
 
 
-def populate_from_csv(db: Session):
-    logger.info(f"Attempting to populate database from CSV: {CSV_FILE_PATH}")
-    if not os.path.exists(CSV_FILE_PATH):
-        logger.error(f"CSV file not found at {CSV_FILE_PATH}. Skipping population.")
-        return
-
-    try:
-        df = pd.read_csv(
-            CSV_FILE_PATH, low_memory=False, dtype=str, keep_default_na=False
-        )
-        logger.info(f"Loaded CSV with {len(df)} rows.")
-    except Exception as e:
-        logger.error(f"Error reading CSV file {CSV_FILE_PATH}: {e}", exc_info=True)
-        return
-
-    column_mapping = {
-        "microbe_id": "bacteria_id",
-        "name": "name",
-        "superkingdom": "superkingdom",
-        "kingdom": "kingdom",
-        "phylum": "phylum",
-        "klass": "class_name",
-        "order": "order",
-        "family": "family",
-        "genus": "genus",
-        "species": "species",
-        "strain": "strain",
-        "gram": "gram_stain",
-        "shape": "shape",
-        "mobility": "mobility",
-        "flagella_presence": "flagellar_presence",
-        "number_of_membranes": "number_of_membranes",
-        "oxygen_requirement": "oxygen_preference",
-        "optimal_temperature": "optimal_temperature",
-        "temperature_range": "temperature_range",
-        "habitat": "habitat",
-        "biotic_relationship": "biotic_relationship",
-        "cell_arrangement": "cell_arrangement",
-        "sporulation": "sporulation",
-        "metabolism": "metabolism",
-        "energy_source": "energy_source",
-        "human_pathogen": "is_pathogen",
-    }
-
-    bacteria_to_insert = []
-    processed_rows_count = 0
-    skipped_duplicates_in_csv_count = 0
-    successfully_inserted_count = 0
-    error_during_insert_count = 0
+def normalize_gram_stain(cleaned_val):
+    if not cleaned_val:
+        return None
+    if "positive" in cleaned_val.lower():
+        return "Positive"
+    if "negative" in cleaned_val.lower():
+        return "Negative"
+    if "variable" in cleaned_val.lower():
+        return "Variable"
+    return cleaned_val
+
+
+def clean_csv_rows(df: pd.DataFrame) -> Tuple[List[Dict[str, Any]], Dict[str, int]]:
+    """
+    Reference per-row cleaning path. Kept for equivalence checks against
+    clean_csv_dataframe; populate_from_csv uses the vectorized version.
+    """
+    records = []
+    stats = {"processed": 0, "missing_id": 0, "duplicates": 0}
     seen_bacteria_ids_in_csv = set()
 
-    logger.debug(f"Original DataFrame columns from CSV: {df.columns.tolist()}")
-    valid_model_keys = {column.name for column in Bacteria.__table__.columns}
-    logger.debug(f"Valid Bacteria model attribute names: {valid_model_keys}")
-
     for index, row_series in df.iterrows():
-        processed_rows_count += 1
-
-        raw_bacteria_id_from_csv = row_series.get("microbe_id", "")
-        bacteria_id = clean_value(raw_bacteria_id_from_csv)
+        stats["processed"] += 1
 
+        bacteria_id = clean_value(row_series.get("microbe_id", ""))
         if not bacteria_id:
-            if processed_rows_count < 20:
-                logger.warning(
-                    f"Skipping CSV row {index + 2} due to missing/invalid bacteria_id (from CSV 'microbe_id', raw: '{raw_bacteria_id_from_csv}')."
-                )
-            elif processed_rows_count == 20:
-                logger.warning(
-                    "Further 'missing bacteria_id' warnings will be suppressed for this run."
-                )
+            stats["missing_id"] += 1
             continue
 
         if bacteria_id in seen_bacteria_ids_in_csv:
-            logger.warning(
-                f"Skipping CSV row {index + 2} - duplicate bacteria_id '{bacteria_id}' within CSV file."
-            )
-            skipped_duplicates_in_csv_count += 1
+            stats["duplicates"] += 1
             continue
         seen_bacteria_ids_in_csv.add(bacteria_id)
 
         current_bacteria_data = {"bacteria_id": bacteria_id}
-
-        for csv_col_name, model_attr_key in column_mapping.items():
+        for csv_col_name, model_attr_key in COLUMN_MAPPING.items():
             if model_attr_key == "bacteria_id":
                 continue
-
             if csv_col_name not in df.columns:
-                if index < 5:
-                    logger.debug(
-                        f"Row {index + 2}, bacteria_id {bacteria_id}: CSV column '{csv_col_name}' for model attribute '{model_attr_key}' not found. Will be None."
-                    )
                 current_bacteria_data[model_attr_key] = None
                 continue
 
             raw_value_from_csv = row_series.get(csv_col_name, "")
-
-            if model_attr_key in [
-                "mobility",
-                "flagellar_presence",
-                "sporulation",
-                "is_pathogen",
-            ]:
+            if model_attr_key in BOOLEAN_FIELDS:
                 current_bacteria_data[model_attr_key] = clean_boolean(
                     raw_value_from_csv
                 )
-            elif model_attr_key == "optimal_temperature":
+            elif model_attr_key in FLOAT_FIELDS:
                 current_bacteria_data[model_attr_key] = clean_float(raw_value_from_csv)
             elif model_attr_key == "gram_stain":
-                cleaned_val = clean_value(raw_value_from_csv)
-                if cleaned_val:
-                    if "positive" in cleaned_val.lower():
-                        current_bacteria_data[model_attr_key] = "Positive"
-                    elif "negative" in cleaned_val.lower():
-                        current_bacteria_data[model_attr_key] = "Negative"
-                    elif "variable" in cleaned_val.lower():
-                        current_bacteria_data[model_attr_key] = "Variable"
-                    else:
-                        current_bacteria_data[model_attr_key] = cleaned_val
-                else:
-                    current_bacteria_data[model_attr_key] = None
+                current_bacteria_data[model_attr_key] = normalize_gram_stain(
+                    clean_value(raw_value_from_csv)
+                )
             else:
                 current_bacteria_data[model_attr_key] = clean_value(raw_value_from_csv)
 
-        filtered_data_for_model = {
-            k: v for k, v in current_bacteria_data.items() if k in valid_model_keys
-        }
+        records.append(current_bacteria_data)
+
+    return records, stats
+
+
+def _clean_column(column: pd.Series, clean_fn: Callable[[Any], Any]) -> np.ndarray:
+    """
+    Applies a scalar cleaner once per distinct value and broadcasts the result
+    back with the factorized codes. Catalog columns are highly repetitive, so
+    this does a few thousand calls instead of one per cell, and reusing the
+    scalar cleaner keeps the output identical to the per-row path.
+    """
+    codes, uniques = pd.factorize(column, use_na_sentinel=True)
+    cleaned = np.empty(len(uniques) + 1, dtype=object)
+    cleaned[:-1] = [clean_fn(value) for value in uniques]
+    cleaned[-1] = clean_fn(np.nan)  # code -1 (missing cell) indexes the last slot
+    return cleaned[codes]
+
+
+def _clean_gram_stain(value_from_csv_cell):
+    return normalize_gram_stain(clean_value(value_from_csv_cell))
+
+
+def clean_csv_dataframe(
+    df: pd.DataFrame,
+    seen_ids: Optional[IdFingerprintSet] = None,
+) -> Tuple[List[Dict[str, Any]], Dict[str, int]]:
+    """
+    Column-wise equivalent of clean_csv_rows: applies the COLUMN_MAPPING rules
+    (NA tokens, boolean mapping, float extraction, Gram stain normalization)
+    per column over distinct values and returns the same records and counts.
+
+    When reading in chunks, pass the same ``seen_ids`` for every chunk so IDs
+    already kept from earlier chunks are counted as duplicates too.
+    """
+    stats = {"processed": len(df), "missing_id": 0, "duplicates": 0}
+    empty_column = np.full(len(df), None, dtype=object)
+
+    if "microbe_id" in df.columns:
+        bacteria_ids = pd.Series(_clean_column(df["microbe_id"], clean_value))
+    else:
+        bacteria_ids = pd.Series(empty_column)
+    has_id = bacteria_ids.notna().to_numpy()
+    stats["missing_id"] = int((~has_id).sum())
+
+    duplicated = bacteria_ids.duplicated(keep="first").to_numpy() & has_id
+    if seen_ids is not None:
+        candidates = np.flatnonzero(has_id & ~duplicated)
+        hashes = fingerprint(bacteria_ids.to_numpy()[candidates])
+        already_seen = seen_ids.contains(hashes)
+        duplicated[candidates[already_seen]] = True
+        seen_ids.add(hashes[~already_seen])
+    stats["duplicates"] = int(duplicated.sum())
+    keep = has_id & ~duplicated
+
+    columns = {"bacteria_id": bacteria_ids.to_numpy()[keep]}
+    for csv_col_name, model_attr_key in COLUMN_MAPPING.items():
+        if model_attr_key == "bacteria_id":
+            continue
+        if csv_col_name not in df.columns:
+            cleaned = empty_column
+        elif model_attr_key in BOOLEAN_FIELDS:
+            cleaned = _clean_column(df[csv_col_name], clean_boolean)
+        elif model_attr_key in FLOAT_FIELDS:
+            cleaned = _clean_column(df[csv_col_name], clean_float)
+        elif model_attr_key == "gram_stain":
+            cleaned = _clean_column(df[csv_col_name], _clean_gram_stain)
+        else:
+            cleaned = _clean_column(df[csv_col_name], clean_value)
+        columns[model_attr_key] = cleaned[keep]
 
-        if successfully_inserted_count == 0 and index < 5:
-            logger.debug(
-                f"Row {index + 2} (bacteria_id: {bacteria_id}): Prepared data for DB: {filtered_data_for_model}"
-            )
+    keys = list(columns)
+    records = [
+        dict(zip(keys, values)) for values in zip(*(columns[key] for key in keys))
+    ]
+    return records, stats
 
-        bacteria_to_insert.append(filtered_data_for_model)
 
-        if len(bacteria_to_insert) >= 500:
-            logger.info(
-                f"Attempting to commit batch of {len(bacteria_to_insert)} records..."
-            )
-            try:
-                db.execute(Bacteria.__table__.insert(), bacteria_to_insert)
-                db.commit()
-                successfully_inserted_count += len(bacteria_to_insert)
-                logger.info(
-                    f"Committed batch. Total inserted so far: {successfully_inserted_count}"
-                )
-            except (IntegrityError, DataError) as e:
-                db.rollback()
-                logger.error(
-                    f"Error during batch insert: {e}. This batch of {len(bacteria_to_insert)} records will be skipped."
-                )
-                error_during_insert_count += len(bacteria_to_insert)
-            except Exception as e:
-                db.rollback()
-                logger.error(f"Unexpected error committing batch: {e}", exc_info=True)
-                error_during_insert_count += len(bacteria_to_insert)
-            bacteria_to_insert = []
-
-    if bacteria_to_insert:
-        logger.info(
-            f"Attempting to commit final batch of {len(bacteria_to_insert)} records..."
+def _warn_missing_columns(columns: List[str]) -> None:
+    missing_columns = [c for c in COLUMN_MAPPING if c not in columns]
+    if missing_columns:
+        logger.warning(
+            f"CSV columns {missing_columns} not found. Their model attributes will be None."
         )
-        try:
-            db.execute(Bacteria.__table__.insert(), bacteria_to_insert)
-            db.commit()
-            successfully_inserted_count += len(bacteria_to_insert)
-            logger.info(
-                f"Committed final batch. Total inserted: {successfully_inserted_count}"
+
+
+def _log_skipped_rows(stats: Dict[str, int]) -> None:
+    if stats["missing_id"]:
+        logger.warning(
+            f"Skipping {stats['missing_id']} CSV rows due to missing/invalid bacteria_id (from CSV 'microbe_id')."
+        )
+    if stats["duplicates"]:
+        logger.warning(
+            f"Skipping {stats['duplicates']} CSV rows with a duplicate bacteria_id within the CSV file."
+        )
+
+
+def _model_records(records: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    valid_model_keys = {column.name for column in Bacteria.__table__.columns}
+    return [
+        {k: v for k, v in record.items() if k in valid_model_keys} for record in records
+    ]
+
+
+def load_csv_records(
+    csv_path: str,
+) -> Optional[Tuple[List[Dict[str, Any]], Dict[str, int]]]:
+    """Reads and cleans the CSV into model-ready records. Returns None on failure."""
+    if not os.path.exists(csv_path):
+        logger.error(f"CSV file not found at {csv_path}. Skipping population.")
+        return None
+
+    try:
+        df = pd.read_csv(csv_path, low_memory=False, dtype=str, keep_default_na=False)
+        logger.info(f"Loaded CSV with {len(df)} rows.")
+    except Exception as e:
+        logger.error(f"Error reading CSV file {csv_path}: {e}", exc_info=True)
+        return None
+
+    logger.debug(f"Original DataFrame columns from CSV: {df.columns.tolist()}")
+    _warn_missing_columns(df.columns.tolist())
+
+    records, stats = clean_csv_dataframe(df)
+    _log_skipped_rows(stats)
+    records = _model_records(records)
+    if records:
+        logger.debug(f"Prepared data for DB (first row): {records[0]}")
+    return records, stats
+
+
+def iter_csv_record_chunks(
+    csv_path: str, chunk_size: int
+) -> Iterator[Tuple[List[Dict[str, Any]], Dict[str, int], float]]:
+    """
+    Streams the CSV ``chunk_size`` rows at a time, yielding each chunk's
+    model-ready records, its cleaning stats and the fraction of the file read
+    so far. Only one chunk is held in memory; duplicates across chunks are
+    tracked with an IdFingerprintSet (8 bytes per kept ID).
+    """
+    seen_ids = IdFingerprintSet()
+    file_size = os.path.getsize(csv_path) or 1
+    with open(csv_path, "rb") as csv_file:
+        reader = pd.read_csv(
+            csv_file, dtype=str, keep_default_na=False, chunksize=chunk_size
+        )
+        for chunk_index, df in enumerate(reader):
+            if chunk_index == 0:
+                _warn_missing_columns(df.columns.tolist())
+            records, stats = clean_csv_dataframe(df, seen_ids=seen_ids)
+            # tell() runs ahead of the parser by its read buffer; close enough for progress.
+            yield _model_records(records), stats, min(csv_file.tell() / file_size, 1.0)
+
+
+def populate_from_csv(
+    db: Session,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    loader: str = "auto",
+    chunk_size: Optional[int] = None,
+    rejects_path: Optional[str] = None,
+):
+    if chunk_size:
+        return populate_from_csv_chunked(
+            db, chunk_size, batch_size, loader, rejects_path=rejects_path
+        )
+
+    logger.info(f"Attempting to populate database from CSV: {CSV_FILE_PATH}")
+    loaded = load_csv_records(CSV_FILE_PATH)
+    if loaded is None:
+        return
+    records, stats = loaded
+
+    successfully_inserted_count, error_during_insert_count = bulk_load(
+        db, records, batch_size=batch_size, loader=loader, rejects_path=rejects_path
+    )
+    # Baseline hashes let a later --sync tell changed rows from unchanged ones.
+    record_content_hashes(
+        db,
+        {record["bacteria_id"]: content_hash(record) for record in records},
+        batch_size,
+    )
+
+    logger.info(
+        f"CSV Population Summary: \n"
+        f"  Total CSV rows processed: {stats['processed']}\n"
+        f"  Successfully inserted into DB: {successfully_inserted_count}\n"
+        f"  Skipped (duplicates within CSV file): {stats['duplicates']}\n"
+        f"  Rejected (DB insert errors/data issues): {error_during_insert_count}"
+    )
+
+
+def populate_from_csv_chunked(
+    db: Session,
+    chunk_size: int,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    loader: str = "auto",
+    rejects_path: Optional[str] = None,
+):
+    """
+    Constant-memory variant of populate_from_csv for catalogs larger than RAM:
+    each chunk is read, cleaned, loaded and committed before the next one is
+    parsed, and progress is logged per chunk.
+    """
+    logger.info(
+        f"Attempting chunked population from CSV: {CSV_FILE_PATH} "
+        f"({chunk_size} rows per chunk)"
+    )
+    if not os.path.exists(CSV_FILE_PATH):
+        logger.error(f"CSV file not found at {CSV_FILE_PATH}. Skipping population.")
+        return
+
+    totals = {"processed": 0, "missing_id": 0, "duplicates": 0}
+    inserted_total = 0
+    errors_total = 0
+    started = time.perf_counter()
+    try:
+        for records, stats, progress in iter_csv_record_chunks(
+            CSV_FILE_PATH, chunk_size
+        ):
+            for key in totals:
+                totals[key] += stats[key]
+            inserted, errors = bulk_load(
+                db,
+                records,
+                batch_size=batch_size,
+                loader=loader,
+                rejects_path=rejects_path,
             )
-        except (IntegrityError, DataError) as e:
-            db.rollback()
-            logger.error(
-                f"Error during final batch insert: {e}. This batch of {len(bacteria_to_insert)} records will be skipped."
+            record_content_hashes(
+                db,
+                {record["bacteria_id"]: content_hash(record) for record in records},
+                batch_size,
             )
-            error_during_insert_count += len(bacteria_to_insert)
-        except Exception as e:
-            db.rollback()
-            logger.error(f"Unexpected error committing final batch: {e}", exc_info=True)
-            error_during_insert_count += len(bacteria_to_insert)
+            inserted_total += inserted
+            errors_total += errors
 
+            elapsed = time.perf_counter() - started
+            logger.info(
+                f"Progress: {progress:.1%} of file, {totals['processed']} rows read, "
+                f"{inserted_total} inserted, {errors_total} errors "
+                f"({totals['processed'] / elapsed:,.0f} rows/s)"
+            )
+    except Exception as e:
+        logger.error(
+            f"Chunked population stopped after {totals['processed']} rows: {e}",
+            exc_info=True,
+        )
+
+    _log_skipped_rows(totals)
     logger.info(
         f"CSV Population Summary: \n"
-        f"  Total CSV rows processed: {processed_rows_count}\n"
-        f"  Successfully inserted into DB: {successfully_inserted_count}\n"
-        f"  Skipped (duplicates within CSV file): {skipped_duplicates_in_csv_count}\n"
-        f"  Skipped (DB insert errors/data issues for batches): {error_during_insert_count}"
+        f"  Total CSV rows processed: {totals['processed']}\n"
+        f"  Successfully inserted into DB: {inserted_total}\n"
+        f"  Skipped (duplicates within CSV file): {totals['duplicates']}\n"
+        f"  Rejected (DB insert errors/data issues): {errors_total}\n"
+        f"  Elapsed: {time.perf_counter() - started:.1f}s"
+    )
+
+
+def sync_from_csv(
+    db: Session,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    delete_missing: bool = True,
+    dry_run: bool = False,
+):
+    logger.info(f"Attempting delta sync from CSV: {CSV_FILE_PATH}")
+    loaded = load_csv_records(CSV_FILE_PATH)
+    if loaded is None:
+        return
+    records, stats = loaded
+
+    counts = sync_records(
+        db,
+        records,
+        batch_size=batch_size,
+        delete_missing=delete_missing,
+        dry_run=dry_run,
+    )
+
+    logger.info(
+        f"CSV Delta Sync Summary{' (dry run)' if dry_run else ''}: \n"
+        f"  Total CSV rows processed: {stats['processed']}\n"
+        f"  Inserted: {counts['inserted']}\n"
+        f"  Updated: {counts['updated']}\n"
+        f"  Deleted: {counts['deleted']}\n"
+        f"  Unchanged: {counts['unchanged']}\n"
+        f"  Kept (not loaded from CSV): {counts['untracked_kept']}\n"
+        f"  Skipped (duplicates within CSV file): {stats['duplicates']}\n"
+        f"  Errors: {counts['errors']}"
     )
 
 
-def init_initial_data():
+def init_initial_data(
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    loader: str = "auto",
+    chunk_size: Optional[int] = None,
+    rejects_path: Optional[str] = None,
+    sync: bool = False,
+    delete_missing: bool = True,
+    dry_run: bool = False,
+):
     db: Session = SessionLocal()
     try:
         create_tables(engine)
 
+        if sync:
+            sync_from_csv(
+                db,
+                batch_size=batch_size,
+                delete_missing=delete_missing,
+                dry_run=dry_run,
+            )
+            return
+
         bacteria_count = db.query(func.count(Bacteria.id)).scalar()
         if bacteria_count == 0:
             logger.info("Bacteria table is empty. Proceeding with CSV population.")
-            populate_from_csv(db)
+            populate_from_csv(
+                db,
+                batch_size=batch_size,
+                loader=loader,
+                chunk_size=chunk_size,
+                rejects_path=rejects_path,
+            )
         else:
             logger.info(
                 f"Bacteria table already contains {bacteria_count} records. CSV population skipped."
             )
             logger.info(
-                "To re-populate from CSV, ensure the 'bacteria' table is empty (e.g., by running `make clean` which removes volumes, then `make up` and `make init-db`)."
+                "To pick up a new CSV release, run with --sync (e.g. `make init-db OPTS=--sync`)."
             )
 
     except Exception as e:
@@ -317,6 +545,55 @@ def init_initial_data():
 
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Initialize the bacteria database")
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=DEFAULT_BATCH_SIZE,
+        help="Rows per COPY buffer / executemany batch.",
+    )
+    parser.add_argument(
+        "--loader",
+        choices=LOADERS,
+        default="auto",
+        help="'auto' uses COPY on PostgreSQL and executemany elsewhere.",
+    )
+    parser.add_argument(
+        "--chunk-size",
+        type=int,
+        default=None,
+        help="Stream the CSV this many rows at a time to bound memory on large files.",
+    )
+    parser.add_argument(
+        "--rejects-file",
+        default=None,
+        help="Append rows the database rejected (with the reason) to this JSON lines file.",
+    )
+    parser.add_argument(
+        "--sync",
+        action="store_true",
+        help="Delta-sync an already populated table with the CSV instead of skipping.",
+    )
+    parser.add_argument(
+        "--keep-missing",
+        action="store_true",
+        help="With --sync, keep rows that are no longer in the CSV.",
+    )
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="With --sync, only report what would change.",
+    )
+    args = parser.parse_args()
+
     logger.info("Starting database initialization process (from app.db.init_db)...")
-    init_initial_data()
+    init_initial_data(
+        batch_size=args.batch_size,
+        loader=args.loader,
+        chunk_size=args.chunk_size,
+        rejects_path=args.rejects_file,
+        sync=args.sync,
+        delete_missing=not args.keep_missing,
+        dry_run=args.dry_run,
+    )
     logger.info("Database initialization process completed.")
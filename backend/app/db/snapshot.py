@@ -0,0 +1,176 @@
+import argparse
+import json
+import logging
+import os
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.feather as feather
+import pyarrow.parquet as pq
+from app.core.config import settings
+from app.db.init_db import CSV_FILE_PATH, iter_csv_record_chunks
+from app.db.session import SessionLocal
+from app.models.bacteria import Bacteria
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_FORMAT_VERSION = 1
+SNAPSHOT_METADATA_KEY = b"kds.snapshot"
+SNAPSHOT_COLUMNS = [
+    column.name
+    for column in Bacteria.__table__.columns
+    if column.name not in ("created_at", "updated_at")
+]
+# Free-text columns stay plain strings; everything else with a String type
+# has a small vocabulary and is stored dictionary-encoded (pandas categorical).
+STRING_COLUMNS = ["bacteria_id", "name", "species", "strain"]
+BOOLEAN_COLUMNS = [
+    column.name
+    for column in Bacteria.__table__.columns
+    if column.name in SNAPSHOT_COLUMNS and column.type.python_type is bool
+]
+FLOAT_COLUMNS = ["optimal_temperature"]
+CATEGORICAL_COLUMNS = [
+    name
+    for name in SNAPSHOT_COLUMNS
+    if name not in STRING_COLUMNS + BOOLEAN_COLUMNS + FLOAT_COLUMNS + ["id"]
+]
+
+
+def typed_frame(columns: Dict[str, Any]) -> pd.DataFrame:
+    """Builds the snapshot DataFrame with its canonical dtypes from column data."""
+    length = len(next(iter(columns.values()), []))
+    df = pd.DataFrame(index=pd.RangeIndex(length))
+    for name in SNAPSHOT_COLUMNS:
+        values = columns.get(name, [None] * length)
+        if name == "id":
+            df[name] = pd.array(values, dtype="Int64")
+        elif name in BOOLEAN_COLUMNS:
+            df[name] = pd.array(values, dtype="boolean")
+        elif name in FLOAT_COLUMNS:
+            df[name] = pd.to_numeric(pd.Series(values, dtype=object), errors="coerce")
+        elif name in CATEGORICAL_COLUMNS:
+            df[name] = pd.Series(values, dtype="string").astype("category")
+        else:
+            df[name] = pd.Series(values, dtype="string")
+    return df
+
+
+def snapshot_from_db(db: Session, batch_size: int = 50_000) -> pd.DataFrame:
+    """Reads the bacteria table column-wise, bypassing ORM object construction."""
+    columns: Dict[str, List[Any]] = {name: [] for name in SNAPSHOT_COLUMNS}
+    statement = select(*[Bacteria.__table__.c[name] for name in SNAPSHOT_COLUMNS])
+    result = db.execute(statement.order_by(Bacteria.id))
+    while True:
+        rows = result.fetchmany(batch_size)
+        if not rows:
+            break
+        for name, values in zip(SNAPSHOT_COLUMNS, zip(*rows)):
+            columns[name].extend(values)
+    return typed_frame(columns)
+
+
+def snapshot_from_csv(csv_path: str, chunk_size: int = 100_000) -> pd.DataFrame:
+    """Cleans the CSV with the init_db rules; the snapshot has no database ids."""
+    columns: Dict[str, List[Any]] = {name: [] for name in SNAPSHOT_COLUMNS}
+    for records, _, _ in iter_csv_record_chunks(csv_path, chunk_size):
+        for name in SNAPSHOT_COLUMNS:
+            columns[name].extend(record.get(name) for record in records)
+    return typed_frame(columns)
+
+
+def write_snapshot(df: pd.DataFrame, path: str, source: str) -> None:
+    """
+    Writes the snapshot as uncompressed Arrow IPC (``.arrow``/``.feather``),
+    which loads by memory-mapping the file, or as Parquet (``.parquet``) for
+    a smaller file that has to be decoded on read.
+    """
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    metadata = {
+        "version": SNAPSHOT_FORMAT_VERSION,
+        "source": source,
+        "created_at": datetime.utcnow().isoformat(),
+        "rows": len(df),
+    }
+    table = table.replace_schema_metadata(
+        {
+            **(table.schema.metadata or {}),
+            SNAPSHOT_METADATA_KEY: json.dumps(metadata).encode("utf-8"),
+        }
+    )
+
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    if path.endswith(".parquet"):
+        pq.write_table(table, tmp_path)
+    else:
+        feather.write_feather(table, tmp_path, compression="uncompressed")
+    # Readers may have the old file mapped; rename swaps it atomically.
+    os.replace(tmp_path, path)
+
+
+def read_snapshot_table(path: str, columns: Optional[List[str]] = None) -> pa.Table:
+    if path.endswith(".parquet"):
+        return pq.read_table(path, columns=columns, memory_map=True)
+    return feather.read_table(path, columns=columns, memory_map=True)
+
+
+_PANDAS_TYPES = {
+    pa.bool_(): pd.BooleanDtype(),
+    pa.string(): pd.StringDtype(),
+    pa.large_string(): pd.StringDtype(),
+}
+
+
+def load_snapshot(path: str, columns: Optional[List[str]] = None) -> pd.DataFrame:
+    """
+    Loads a snapshot written by write_snapshot. Dictionary columns come back
+    as pandas categoricals, strings and booleans as the nullable ``string``
+    and ``boolean`` dtypes, so consumers get the same types whichever source
+    the snapshot was built from.
+    """
+    table = read_snapshot_table(path, columns=columns)
+    return table.to_pandas(types_mapper=_PANDAS_TYPES.get)
+
+
+def snapshot_info(path: str) -> Dict[str, Any]:
+    if path.endswith(".parquet"):
+        schema = pq.read_schema(path)
+    else:
+        with pa.memory_map(path) as source:
+            schema = pa.ipc.open_file(source).schema
+    raw = (schema.metadata or {}).get(SNAPSHOT_METADATA_KEY)
+    return json.loads(raw) if raw else {}
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    parser = argparse.ArgumentParser(
+        description="Write a typed columnar snapshot of the bacteria catalog"
+    )
+    parser.add_argument("--source", choices=("db", "csv"), default="db")
+    parser.add_argument("--csv", default=CSV_FILE_PATH)
+    parser.add_argument("--output", default=settings.CATALOG_SNAPSHOT_PATH)
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    if args.source == "db":
+        db = SessionLocal()
+        try:
+            snapshot = snapshot_from_db(db)
+        finally:
+            db.close()
+        source = "db"
+    else:
+        snapshot = snapshot_from_csv(args.csv)
+        source = f"csv:{os.path.basename(args.csv)}"
+    write_snapshot(snapshot, args.output, source)
+    logger.info(
+        f"Wrote {len(snapshot)} rows to {args.output} "
+        f"({os.path.getsize(args.output) / 1e6:.1f} MB) in {time.perf_counter() - started:.2f}s"
+    )
@@ -0,0 +1,217 @@
+import hashlib
+import json
+import logging
+from datetime import datetime
+from typing import Any, Dict, Iterable, List
+
+from app.core.cache import bacteria_cache_keys, entity_cache
+from app.db.bulk_load import DEFAULT_BATCH_SIZE, dialect_insert
+from app.models.bacteria import Bacteria, BacteriaSyncState
+from app.services.taxonomy import taxonomy_index
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+SYNC_COLUMNS = [
+    column.name
+    for column in Bacteria.__table__.columns
+    if column.name not in ("id", "created_at", "updated_at")
+]
+
+
+def content_hash(record: Dict[str, Any]) -> str:
+    payload = json.dumps(
+        [record.get(name) for name in SYNC_COLUMNS], default=str, separators=(",", ":")
+    )
+    return hashlib.blake2b(payload.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def _chunks(items: List[Any], size: int) -> Iterable[List[Any]]:
+    for start in range(0, len(items), size):
+        yield items[start : start + size]
+
+
+def record_content_hashes(
+    db: Session, hashes: Dict[str, str], batch_size: int = DEFAULT_BATCH_SIZE
+) -> None:
+    if not hashes:
+        return
+    now = datetime.utcnow()
+    rows = [
+        {"bacteria_id": bacteria_id, "content_hash": digest, "synced_at": now}
+        for bacteria_id, digest in hashes.items()
+    ]
+    table = BacteriaSyncState.__table__
+    for batch in _chunks(rows, batch_size):
+        stmt = dialect_insert(db, table)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["bacteria_id"],
+            set_={
+                "content_hash": stmt.excluded.content_hash,
+                "synced_at": stmt.excluded.synced_at,
+            },
+        )
+        db.execute(stmt, batch)
+        db.commit()
+
+
+def _invalidate_cached(db: Session, bacteria_ids: List[str]) -> None:
+    keys = []
+    for obj_id, bacteria_id in db.query(Bacteria.id, Bacteria.bacteria_id).filter(
+        Bacteria.bacteria_id.in_(bacteria_ids)
+    ):
+        keys.extend(bacteria_cache_keys(obj_id=obj_id, bacteria_id=bacteria_id))
+    entity_cache.invalidate(keys)
+
+
+def sync_records(
+    db: Session,
+    records: List[Dict[str, Any]],
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    delete_missing: bool = True,
+    dry_run: bool = False,
+) -> Dict[str, int]:
+    """
+    Brings bacteria in line with a cleaned CSV release, touching only rows
+    whose content hash changed since the last load.
+
+    Rows never loaded from the CSV (created through the API or the scraper)
+    are adopted when their bacteria_id shows up in the CSV and are otherwise
+    left alone; only previously synced rows are deleted when they disappear
+    from the release. Each batch commits on its own, so the table stays
+    readable throughout.
+    """
+    counts = {
+        "inserted": 0,
+        "updated": 0,
+        "unchanged": 0,
+        "deleted": 0,
+        "untracked_kept": 0,
+        "errors": 0,
+    }
+
+    incoming = {record["bacteria_id"]: record for record in records}
+    incoming_hashes = {
+        bacteria_id: content_hash(record) for bacteria_id, record in incoming.items()
+    }
+    stored_hashes = dict(
+        db.query(BacteriaSyncState.bacteria_id, BacteriaSyncState.content_hash)
+    )
+    existing_ids = {bacteria_id for (bacteria_id,) in db.query(Bacteria.bacteria_id)}
+
+    inserts: List[str] = []
+    updates: List[str] = []
+    adopted: Dict[str, str] = {}
+    untracked: List[str] = []
+    for bacteria_id, digest in incoming_hashes.items():
+        if bacteria_id not in existing_ids:
+            inserts.append(bacteria_id)
+        elif bacteria_id not in stored_hashes:
+            untracked.append(bacteria_id)
+        elif stored_hashes[bacteria_id] == digest:
+            counts["unchanged"] += 1
+        else:
+            updates.append(bacteria_id)
+
+    columns = [getattr(Bacteria, name) for name in SYNC_COLUMNS]
+    for batch in _chunks(untracked, batch_size):
+        for row in db.query(*columns).filter(Bacteria.bacteria_id.in_(batch)):
+            current = dict(zip(SYNC_COLUMNS, row))
+            bacteria_id = current["bacteria_id"]
+            if content_hash(current) == incoming_hashes[bacteria_id]:
+                adopted[bacteria_id] = incoming_hashes[bacteria_id]
+                counts["unchanged"] += 1
+            else:
+                updates.append(bacteria_id)
+
+    missing = [
+        bacteria_id for bacteria_id in stored_hashes if bacteria_id not in incoming
+    ]
+    deletes = [bacteria_id for bacteria_id in missing if bacteria_id in existing_ids]
+    stale_hashes = [
+        bacteria_id for bacteria_id in missing if bacteria_id not in existing_ids
+    ]
+    if not delete_missing:
+        deletes = []
+    counts["untracked_kept"] = sum(
+        1
+        for bacteria_id in existing_ids
+        if bacteria_id not in incoming and bacteria_id not in stored_hashes
+    )
+
+    logger.info(
+        f"Delta sync plan: {len(inserts)} inserts, {len(updates)} updates, "
+        f"{counts['unchanged']} unchanged, {len(deletes)} deletes."
+    )
+    if dry_run:
+        counts.update(
+            {"inserted": len(inserts), "updated": len(updates), "deleted": len(deletes)}
+        )
+        return counts
+
+    now = datetime.utcnow()
+    update_set = set(updates)
+    for batch in _chunks(inserts + updates, batch_size):
+        rows = [
+            {**incoming[bacteria_id], "created_at": now, "updated_at": now}
+            for bacteria_id in batch
+        ]
+        stmt = dialect_insert(db, Bacteria.__table__)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["bacteria_id"],
+            set_={
+                **{
+                    name: stmt.excluded[name]
+                    for name in SYNC_COLUMNS
+                    if name != "bacteria_id"
+                },
+                "updated_at": stmt.excluded.updated_at,
+            },
+        )
+        try:
+            db.execute(stmt, rows)
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            logger.error(f"Error upserting batch of {len(batch)} rows: {e}")
+            counts["errors"] += len(batch)
+            continue
+        record_content_hashes(
+            db, {bacteria_id: incoming_hashes[bacteria_id] for bacteria_id in batch}
+        )
+        batch_updates = [
+            bacteria_id for bacteria_id in batch if bacteria_id in update_set
+        ]
+        counts["updated"] += len(batch_updates)
+        counts["inserted"] += len(batch) - len(batch_updates)
+        if batch_updates:
+            _invalidate_cached(db, batch_updates)
+
+    record_content_hashes(db, adopted, batch_size)
+
+    for batch in _chunks(deletes, batch_size):
+        try:
+            _invalidate_cached(db, batch)
+            deleted = (
+                db.query(Bacteria)
+                .filter(Bacteria.bacteria_id.in_(batch))
+                .delete(synchronize_session=False)
+            )
+            db.query(BacteriaSyncState).filter(
+                BacteriaSyncState.bacteria_id.in_(batch)
+            ).delete(synchronize_session=False)
+            db.commit()
+            counts["deleted"] += deleted
+        except Exception as e:
+            db.rollback()
+            logger.error(f"Error deleting batch of {len(batch)} rows: {e}")
+            counts["errors"] += len(batch)
+
+    for batch in _chunks(stale_hashes, batch_size):
+        db.query(BacteriaSyncState).filter(
+            BacteriaSyncState.bacteria_id.in_(batch)
+        ).delete(synchronize_session=False)
+        db.commit()
+
+    taxonomy_index.invalidate()
+    return counts
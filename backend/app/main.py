@@ -3,6 +3,7 @@ import logging
 from app.api.routes.bacteria import router as bacteria_router
 from app.api.routes.health import router as health_router
 from app.api.routes.predictions import router as predictions_router
+from app.api.routes.taxonomy import router as taxonomy_router
 from app.core.config import settings
 from app.ml.model_service import model_service
 from fastapi import APIRouter, FastAPI
@@ -55,7 +56,9 @@ async def startup_event():
                 "ML model preloading seems to have failed. "
                 "The 'model' or 'preprocessor' attribute on the model_service instance is not set. "
                 "This is LIKELY DUE TO AN INCOMPATIBLE PICKLE FILE (see _RemainderColsList error). "
-                "PLEASE RE-PICKLE THE MODEL with compatible scikit-learn/numpy versions."
+                "Export it to the portable format next to the pickle with "
+                "'python -m app.ml.artifacts <model>.pkl', or re-pickle it with "
+                "compatible scikit-learn/numpy versions."
             )
     else:
         logger.info(
@@ -73,6 +76,7 @@ api_router.include_router(
     predictions_router, prefix="/predictions", tags=["Predictions"]
 )
 api_router.include_router(bacteria_router, prefix="/bacteria", tags=["Bacteria"])
+api_router.include_router(taxonomy_router, prefix="/taxonomy", tags=["Taxonomy"])
 
 app.include_router(api_router)
 
@@ -0,0 +1,475 @@
+import argparse
+import json
+import logging
+import os
+import time
+from collections import UserList
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+ARTIFACT_FORMAT = "bacteria-model"
+# 2: categorical blocks store one fill value per column (``fill_values``).
+ARTIFACT_FORMAT_VERSION = 2
+MANIFEST_FILE = "manifest.json"
+BOOSTER_FILE = "booster.ubj"
+FOREST_FILE = "forest.npz"
+
+
+# --- Loading (numpy/pandas/xgboost only; nothing from scikit-learn) ---------
+
+
+class PortablePreprocessor:
+    """
+    Replays the fitted ColumnTransformer from plain parameters: numeric
+    columns are median-imputed and standardised, categorical columns are
+    filled and one-hot encoded against the stored vocabularies (unknown
+    values encode as all zeros, like ``handle_unknown="ignore"``).
+
+    The input is converted to one object array up front and categories are
+    looked up in dicts, so a single row costs microseconds rather than a
+    pandas call per column.
+    """
+
+    def __init__(self, features: List[str], blocks: List[Dict[str, Any]]):
+        self.feature_names_in_ = np.array(features, dtype=object)
+        # Two preprocessors with the same encoding produce the same matrix.
+        self.encoding = json.dumps(
+            {"features": features, "blocks": blocks}, sort_keys=True
+        )
+        self.blocks = blocks
+        self.n_features_out = 0
+        positions = {feature: i for i, feature in enumerate(features)}
+        for block in blocks:
+            block["_positions"] = [positions[c] for c in block["columns"]]
+            if block["kind"] == "numeric":
+                block["_fill"] = np.array(block["fill"], dtype=np.float64)
+                block["_mean"] = np.array(block["mean"], dtype=np.float64)
+                block["_scale"] = np.array(block["scale"], dtype=np.float64)
+                self.n_features_out += len(block["columns"])
+            else:
+                # Version 1 manifests had a single constant fill per block.
+                block["_fills"] = block.get("fill_values") or [
+                    block["fill_value"]
+                ] * len(block["columns"])
+                block["_codes"] = [
+                    {category: code for code, category in enumerate(categories)}
+                    for categories in block["categories"]
+                ]
+                self.n_features_out += sum(len(c) for c in block["categories"])
+
+    def transform(self, df: pd.DataFrame) -> np.ndarray:
+        features = list(self.feature_names_in_)
+        if list(df.columns) != features:
+            df = df.reindex(columns=features)
+        values = df.to_numpy(dtype=object)
+        missing = pd.isna(values)
+
+        out = np.zeros((len(df), self.n_features_out), dtype=np.float64)
+        offset = 0
+        for block in self.blocks:
+            positions = block["_positions"]
+            if block["kind"] == "numeric":
+                width = len(positions)
+                numbers = _to_float(values[:, positions])
+                numbers = np.where(np.isnan(numbers), block["_fill"], numbers)
+                out[:, offset : offset + width] = (numbers - block["_mean"]) / block[
+                    "_scale"
+                ]
+                offset += width
+                continue
+            for position, codes, fill_value in zip(
+                positions, block["_codes"], block["_fills"]
+            ):
+                column = values[:, position]
+                column_missing = missing[:, position]
+                for row in range(len(column)):
+                    key = fill_value if column_missing[row] else str(column[row])
+                    code = codes.get(key)
+                    if code is not None:
+                        out[row, offset + code] = 1.0
+                offset += len(codes)
+        return out
+
+
+def _to_float(values: np.ndarray) -> np.ndarray:
+    """Object array to float64, with unparseable values as NaN."""
+    try:
+        return values.astype(np.float64)
+    except (TypeError, ValueError):
+        return np.column_stack(
+            [
+                pd.to_numeric(pd.Series(values[:, i]), errors="coerce").to_numpy(
+                    dtype=np.float64, na_value=np.nan
+                )
+                for i in range(values.shape[1])
+            ]
+        ).reshape(values.shape)
+
+
+class PortableXGBoost:
+    """Binary XGBoost classifier from a native booster file."""
+
+    def __init__(self, booster_path: str, classes: List[int]):
+        import xgboost as xgb
+
+        self.booster = xgb.Booster()
+        self.booster.load_model(booster_path)
+        self.classes_ = np.array(classes)
+
+    def predict_proba(self, X: np.ndarray) -> np.ndarray:
+        positive = np.asarray(self.booster.inplace_predict(X), dtype=np.float64)
+        if positive.ndim == 2:
+            return positive
+        return np.column_stack([1.0 - positive, positive])
+
+    def predict(self, X: np.ndarray) -> np.ndarray:
+        return self.classes_[np.argmax(self.predict_proba(X), axis=1)]
+
+
+class PortableForest:
+    """
+    A random forest (or balanced random forest) stored as flat node arrays.
+    Leaves point to themselves, so every tree is walked for a fixed
+    ``max_depth`` steps with one vectorised lookup per level.
+    """
+
+    def __init__(self, forest_path: str, classes: List[int]):
+        with np.load(forest_path, allow_pickle=False) as arrays:
+            self.roots = arrays["roots"]
+            self.feature = arrays["feature"]
+            self.threshold = arrays["threshold"]
+            self.left = arrays["left"]
+            self.right = arrays["right"]
+            self.proba = arrays["proba"]
+            self.max_depth = int(arrays["max_depth"])
+        self.classes_ = np.array(classes)
+
+    def predict_proba(self, X: np.ndarray) -> np.ndarray:
+        # scikit-learn trees compare float32 features against float64 thresholds.
+        X = np.asarray(X, dtype=np.float32)
+        rows = np.arange(X.shape[0])[:, None]
+        node = np.broadcast_to(self.roots, (X.shape[0], len(self.roots)))
+        for _ in range(self.max_depth):
+            go_left = X[rows, self.feature[node]] <= self.threshold[node]
+            node = np.where(go_left, self.left[node], self.right[node])
+        return self.proba[node].mean(axis=1)
+
+    def predict(self, X: np.ndarray) -> np.ndarray:
+        return self.classes_[np.argmax(self.predict_proba(X), axis=1)]
+
+
+def is_artifact_dir(path: str) -> bool:
+    return os.path.isfile(os.path.join(path, MANIFEST_FILE))
+
+
+def artifact_dir_for(model_path: str) -> Optional[str]:
+    """
+    The exported artifact for ``model_path``: the path itself if it is an
+    artifact directory, or the directory named after a pickle's stem.
+    """
+    if is_artifact_dir(model_path):
+        return model_path
+    stem, ext = os.path.splitext(model_path)
+    if ext == ".pkl" and is_artifact_dir(stem):
+        return stem
+    return None
+
+
+def read_manifest(directory: str) -> Dict[str, Any]:
+    with open(os.path.join(directory, MANIFEST_FILE), "r", encoding="utf-8") as f:
+        manifest = json.load(f)
+    if manifest.get("format") != ARTIFACT_FORMAT:
+        raise ValueError(f"{directory} is not a {ARTIFACT_FORMAT} artifact")
+    if manifest.get("format_version", 0) > ARTIFACT_FORMAT_VERSION:
+        raise ValueError(
+            f"{directory} uses artifact format {manifest['format_version']}; "
+            f"this code reads up to {ARTIFACT_FORMAT_VERSION}"
+        )
+    return manifest
+
+
+def load_artifact(directory: str) -> Tuple[PortablePreprocessor, Any]:
+    """(preprocessor, classifier) with the transform/predict API of the pipeline steps."""
+    manifest = read_manifest(directory)
+    preprocessor = PortablePreprocessor(
+        manifest["features"], manifest["preprocessor"]["blocks"]
+    )
+    classifier_spec = manifest["classifier"]
+    path = os.path.join(directory, classifier_spec["file"])
+    if classifier_spec["type"] == "xgboost":
+        classifier = PortableXGBoost(path, classifier_spec["classes"])
+    elif classifier_spec["type"] == "forest":
+        classifier = PortableForest(path, classifier_spec["classes"])
+    else:
+        raise ValueError(f"Unknown classifier type '{classifier_spec['type']}'")
+    return preprocessor, classifier
+
+
+# --- Export (reads the fitted pickle once, with scikit-learn installed) -----
+
+
+class _RemainderColsList(UserList):
+    """Stand-in for the scikit-learn 1.5/1.6 class pickled with ColumnTransformers."""
+
+
+def load_pickle(path: str) -> Any:
+    """
+    joblib.load that also reads ColumnTransformers pickled by scikit-learn
+    1.5/1.6, whose ``_RemainderColsList`` no longer exists. Only the fitted
+    parameters read by export_artifact are relied on afterwards; such a
+    pipeline may not be able to predict under the installed version.
+    """
+    import joblib
+    import sklearn.compose._column_transformer as column_transformer
+
+    if not hasattr(column_transformer, "_RemainderColsList"):
+        column_transformer._RemainderColsList = _RemainderColsList
+    return joblib.load(path)
+
+
+def pipeline_steps(pipeline: Any) -> Tuple[Any, Any]:
+    if isinstance(pipeline, tuple) and len(pipeline) == 2:
+        return pipeline
+    steps = dict(pipeline.steps)
+    return steps["preprocessor"], steps["classifier"]
+
+
+MODEL_FORMATS = ("auto", "portable", "pickle")
+
+
+def load_model(model_path: str, model_format: str = "auto") -> Tuple[Any, Any, str]:
+    """
+    (preprocessor, classifier, format loaded) for a ``.pkl`` path or an
+    artifact directory. "auto" prefers the exported artifact, like
+    model_service; "portable" and "pickle" insist on one format.
+    """
+    if model_format not in MODEL_FORMATS:
+        raise ValueError(f"model_format must be one of {MODEL_FORMATS}")
+    directory = artifact_dir_for(model_path)
+    if model_format != "pickle" and directory:
+        return (*load_artifact(directory), "portable")
+    if model_format == "portable":
+        raise FileNotFoundError(f"No exported artifact for {model_path}")
+    return (*pipeline_steps(load_pickle(model_path)), "pickle")
+
+
+def _imputed_columns(imputer: Any, columns: List[str]) -> Tuple[List[str], List[Any]]:
+    """
+    The columns a fitted SimpleImputer passes on, with the value it fills
+    each one with (``statistics_``, whatever the strategy). Columns that were
+    entirely empty when fitted have a NaN statistic and are dropped, unless
+    the imputer was built with ``keep_empty_features=True``.
+    """
+    if imputer is None:
+        return columns, [np.nan] * len(columns)
+    kept = [
+        (column, statistic)
+        for column, statistic in zip(columns, imputer.statistics_)
+        if not pd.isna(statistic)
+    ]
+    return [column for column, _ in kept], [statistic for _, statistic in kept]
+
+
+def _export_preprocessor(preprocessor: Any) -> List[Dict[str, Any]]:
+    blocks = []
+    for name, transformer, columns in preprocessor.transformers_:
+        if transformer == "drop" or len(columns) == 0:
+            continue
+        steps = dict(getattr(transformer, "steps", [(name, transformer)]))
+        columns, fills = _imputed_columns(steps.get("imputer"), list(columns))
+        if not columns:
+            continue
+        if "onehot" in steps:
+            encoder = steps["onehot"]
+            if getattr(encoder, "drop", None) is not None:
+                raise ValueError(f"'{name}': OneHotEncoder(drop=...) is not supported")
+            if len(encoder.categories_) != len(columns):
+                raise ValueError(
+                    f"'{name}': {len(columns)} columns but "
+                    f"{len(encoder.categories_)} category lists"
+                )
+            blocks.append(
+                {
+                    "kind": "categorical",
+                    "columns": columns,
+                    "fill_values": [str(fill) for fill in fills],
+                    "categories": [
+                        [str(c) for c in cats] for cats in encoder.categories_
+                    ],
+                }
+            )
+            continue
+        scaler = steps.get("scaler")
+        fill = np.asarray(fills, dtype=np.float64)
+        if scaler is not None and scaler.n_features_in_ != len(columns):
+            raise ValueError(
+                f"'{name}': {len(columns)} columns but the scaler saw "
+                f"{scaler.n_features_in_}"
+            )
+        mean = np.zeros(len(columns))
+        scale = np.ones(len(columns))
+        if scaler is not None:
+            if scaler.with_mean:
+                mean = np.asarray(scaler.mean_, dtype=np.float64)
+            if scaler.with_std:
+                scale = np.asarray(scaler.scale_, dtype=np.float64)
+        blocks.append(
+            {
+                "kind": "numeric",
+                "columns": columns,
+                "fill": fill.tolist(),
+                "mean": mean.tolist(),
+                "scale": scale.tolist(),
+            }
+        )
+    return blocks
+
+
+def _export_forest(classifier: Any, path: str) -> int:
+    roots, feature, threshold, left, right, proba = [], [], [], [], [], []
+    offset = 0
+    max_depth = 0
+    for estimator in classifier.estimators_:
+        tree = estimator.tree_
+        nodes = np.arange(tree.node_count)
+        is_leaf = tree.children_left < 0
+        roots.append(offset)
+        # Leaves loop back to themselves and compare feature 0 against +inf.
+        feature.append(np.where(is_leaf, 0, tree.feature))
+        threshold.append(np.where(is_leaf, np.inf, tree.threshold))
+        left.append(np.where(is_leaf, nodes, tree.children_left) + offset)
+        right.append(np.where(is_leaf, nodes, tree.children_right) + offset)
+        values = tree.value[:, 0, :].astype(np.float64)
+        proba.append(values / values.sum(axis=1, keepdims=True))
+        max_depth = max(max_depth, tree.max_depth)
+        offset += tree.node_count
+    np.savez(
+        path,
+        roots=np.array(roots, dtype=np.int64),
+        feature=np.concatenate(feature).astype(np.int64),
+        threshold=np.concatenate(threshold).astype(np.float64),
+        left=np.concatenate(left).astype(np.int64),
+        right=np.concatenate(right).astype(np.int64),
+        proba=np.concatenate(proba),
+        max_depth=np.array(max_depth),
+    )
+    return len(roots)
+
+
+def export_artifact(pipeline: Any, directory: str, source: str = "") -> Dict:
+    """
+    Writes ``pipeline`` (preprocessor + XGBoost or random-forest classifier)
+    to ``directory``: manifest.json with the feature order, imputation,
+    scaling and one-hot vocabularies, plus booster.ubj (native XGBoost) or
+    forest.npz (tree node arrays). Returns the manifest.
+    """
+    preprocessor, classifier = pipeline_steps(pipeline)
+    os.makedirs(directory, exist_ok=True)
+    classes = [int(c) for c in classifier.classes_]
+
+    kind = type(classifier).__name__
+    if kind == "XGBClassifier":
+        classifier.get_booster().save_model(os.path.join(directory, BOOSTER_FILE))
+        classifier_spec = {"type": "xgboost", "file": BOOSTER_FILE, "classes": classes}
+    elif hasattr(classifier, "estimators_") and all(
+        hasattr(estimator, "tree_") for estimator in classifier.estimators_
+    ):
+        trees = _export_forest(classifier, os.path.join(directory, FOREST_FILE))
+        classifier_spec = {
+            "type": "forest",
+            "file": FOREST_FILE,
+            "classes": classes,
+            "trees": trees,
+        }
+    else:
+        raise ValueError(f"Exporting a {kind} classifier is not supported")
+    classifier_spec["estimator"] = kind
+
+    manifest = {
+        "format": ARTIFACT_FORMAT,
+        "format_version": ARTIFACT_FORMAT_VERSION,
+        "source": source,
+        "created_at": datetime.utcnow().isoformat(),
+        "features": [str(f) for f in preprocessor.feature_names_in_],
+        "preprocessor": {"blocks": _export_preprocessor(preprocessor)},
+        "classifier": classifier_spec,
+        "versions": _library_versions(),
+    }
+    tmp_path = os.path.join(directory, f"{MANIFEST_FILE}.tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+    # Written last, so a directory with a manifest is always complete.
+    os.replace(tmp_path, os.path.join(directory, MANIFEST_FILE))
+    return manifest
+
+
+def _library_versions() -> Dict[str, str]:
+    versions = {"numpy": np.__version__, "pandas": pd.__version__}
+    for module in ("sklearn", "xgboost"):
+        try:
+            versions[module] = __import__(module).__version__
+        except ImportError:
+            pass
+    return versions
+
+
+def verify_artifact(pipeline: Any, directory: str, X: pd.DataFrame) -> float:
+    """Max absolute difference in P(pathogen) between the pipeline and its export."""
+    preprocessor, classifier = pipeline_steps(pipeline)
+    expected = classifier.predict_proba(preprocessor.transform(X))[:, 1]
+    portable_preprocessor, portable_classifier = load_artifact(directory)
+    actual = portable_classifier.predict_proba(portable_preprocessor.transform(X))[:, 1]
+    return float(np.max(np.abs(expected - actual))) if len(X) else 0.0
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    parser = argparse.ArgumentParser(
+        description="Export a pickled model pipeline to the portable artifact format"
+    )
+    parser.add_argument("pickles", nargs="+", help="Pipeline .pkl files to export.")
+    parser.add_argument(
+        "--output",
+        default=None,
+        help="Artifact directory (default: next to the pickle, named after it). "
+        "Only valid with a single pickle.",
+    )
+    parser.add_argument(
+        "--verify-csv",
+        default=None,
+        help="Compare the export's probabilities with the pipeline's on this CSV.",
+    )
+    args = parser.parse_args()
+    if args.output and len(args.pickles) > 1:
+        parser.error("--output needs exactly one pickle")
+
+    for pickle_path in args.pickles:
+        directory = args.output or os.path.splitext(pickle_path)[0]
+        pipeline = load_pickle(pickle_path)
+        export_artifact(pipeline, directory, source=os.path.basename(pickle_path))
+
+        started = time.perf_counter()
+        load_artifact(directory)
+        load_ms = (time.perf_counter() - started) * 1000
+        logger.info(
+            f"Exported {pickle_path} -> {directory} (loads in {load_ms:.1f} ms)"
+        )
+
+        if args.verify_csv:
+            features = list(pipeline_steps(pipeline)[0].feature_names_in_)
+            X = pd.read_csv(args.verify_csv).reindex(columns=features)
+            try:
+                difference = verify_artifact(pipeline, directory, X)
+            except Exception as e:
+                logger.warning(
+                    f"  Could not run the pickled pipeline for comparison: {e!r}"
+                )
+            else:
+                logger.info(
+                    f"  max |P(pathogen) difference| over {len(X)} rows: {difference:.2e}"
+                )
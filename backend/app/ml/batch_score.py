@@ -0,0 +1,51 @@
+import argparse
+import logging
+import time
+
+import pandas as pd
+from app.core.config import settings
+from app.db.snapshot import load_snapshot, write_snapshot
+from app.ml.model_service import model_service
+
+logger = logging.getLogger(__name__)
+
+
+def score_snapshot(snapshot_path: str, batch_size: int = 50_000) -> pd.DataFrame:
+    """Scores every row of a catalog snapshot. Returns bacteria_id with the predictions."""
+    df = load_snapshot(snapshot_path)
+    scored = []
+    for start in range(0, len(df), batch_size):
+        batch = df.iloc[start : start + batch_size]
+        labels, probabilities = model_service.predict_batch(batch)
+        scored.append(
+            pd.DataFrame(
+                {
+                    "bacteria_id": batch["bacteria_id"].to_numpy(),
+                    "is_pathogen_prediction": labels.astype(bool),
+                    "pathogen_probability": probabilities,
+                }
+            )
+        )
+    if not scored:
+        return pd.DataFrame(
+            columns=["bacteria_id", "is_pathogen_prediction", "pathogen_probability"]
+        )
+    return pd.concat(scored, ignore_index=True)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    parser = argparse.ArgumentParser(
+        description="Score the catalog snapshot with the pathogenicity model"
+    )
+    parser.add_argument("--snapshot", default=settings.CATALOG_SNAPSHOT_PATH)
+    parser.add_argument("--output", required=True)
+    parser.add_argument("--batch-size", type=int, default=50_000)
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    scores = score_snapshot(args.snapshot, args.batch_size)
+    write_snapshot(scores, args.output, source=f"scores:{args.snapshot}")
+    logger.info(
+        f"Scored {len(scores)} rows into {args.output} in {time.perf_counter() - started:.2f}s"
+    )
@@ -0,0 +1,367 @@
+import argparse
+import glob
+import json
+import logging
+import os
+import platform
+import resource
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from multiprocessing import get_context
+from typing import Any, Dict, List
+
+import numpy as np
+import pandas as pd
+from app.ml.artifacts import MODEL_FORMATS, artifact_dir_for, load_model
+
+logger = logging.getLogger(__name__)
+
+# init_db.CSV_FILE_PATH, without importing the database layer.
+DEFAULT_CSV_PATH = "/app/data/mimedb_microbes_v1.csv"
+# Where docker-compose mounts ml/models, as in `make export-models`; not
+# derived from ML_MODEL_PATH, which need not point into that directory.
+MODELS_DIR = "/app/ml_models"
+DEFAULT_RESULTS_PATH = os.path.join(MODELS_DIR, "benchmarks", "inference_latest.json")
+DEFAULT_BASELINE_PATH = os.path.join(
+    MODELS_DIR, "benchmarks", "inference_baseline.json"
+)
+BATCH_SIZES = (1, 10, 100, 1000, 10000)
+
+# A metric regresses when it is worse than the baseline by more than the
+# relative tolerance *and* by more than this absolute slack, so timer noise
+# on sub-millisecond batches is not reported.
+ABSOLUTE_SLACK = {"seconds": 0.0002, "mb": 2.0}
+
+
+def _rss_mb() -> float:
+    """Current resident set size; the peak where /proc is unavailable."""
+    try:
+        with open("/proc/self/statm", "r") as f:
+            pages = int(f.read().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE") / 2**20
+    except (OSError, ValueError):
+        return _peak_rss_mb()
+
+
+def _peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Kilobytes on Linux, bytes on macOS.
+    return peak / 2**20 if sys.platform == "darwin" else peak / 2**10
+
+
+def sample_inputs(csv_path: str, rows: int, seed: int) -> pd.DataFrame:
+    """``rows`` rows drawn with replacement from the CSV."""
+    df = pd.read_csv(csv_path)
+    return df.sample(n=rows, replace=True, random_state=seed).reset_index(drop=True)
+
+
+def _summarise(samples: List[float]) -> Dict[str, float]:
+    values = np.array(samples)
+    return {
+        "p50_seconds": float(np.percentile(values, 50)),
+        "p95_seconds": float(np.percentile(values, 95)),
+        "min_seconds": float(values.min()),
+    }
+
+
+def time_batch(
+    preprocessor: Any,
+    classifier: Any,
+    batch: pd.DataFrame,
+    min_time: float,
+    min_repeats: int,
+    max_repeats: int,
+) -> Dict[str, Any]:
+    """
+    Repeats transform + predict_proba on ``batch`` (after one warm-up) until
+    ``min_time`` seconds and ``min_repeats`` runs have passed.
+    """
+    classifier.predict_proba(preprocessor.transform(batch))
+    preprocess, predict, total = [], [], []
+    started = time.perf_counter()
+    while len(total) < max_repeats and (
+        len(total) < min_repeats or time.perf_counter() - started < min_time
+    ):
+        t0 = time.perf_counter()
+        X = preprocessor.transform(batch)
+        t1 = time.perf_counter()
+        classifier.predict_proba(X)
+        t2 = time.perf_counter()
+        preprocess.append(t1 - t0)
+        predict.append(t2 - t1)
+        total.append(t2 - t0)
+    totals = _summarise(total)
+    return {
+        "repeats": len(total),
+        "preprocess": _summarise(preprocess),
+        "predict": _summarise(predict),
+        "total": totals,
+        "rows_per_second": len(batch) / totals["p50_seconds"],
+    }
+
+
+def benchmark_model(
+    model_path: str,
+    model_format: str,
+    csv_path: str,
+    batch_sizes: List[int],
+    seed: int,
+    min_time: float,
+    min_repeats: int,
+    max_repeats: int,
+) -> Dict[str, Any]:
+    """Loads and times one model. Meant to run in a fresh process."""
+    inputs = sample_inputs(csv_path, max(batch_sizes), seed)
+    rss_before = _rss_mb()
+    started = time.perf_counter()
+    preprocessor, classifier, loaded_format = load_model(model_path, model_format)
+    load_seconds = time.perf_counter() - started
+    rss_loaded = _rss_mb()
+
+    inputs = inputs.reindex(columns=list(preprocessor.feature_names_in_))
+    batches = {}
+    for size in batch_sizes:
+        batches[str(size)] = time_batch(
+            preprocessor,
+            classifier,
+            inputs.iloc[:size],
+            min_time,
+            min_repeats,
+            max_repeats,
+        )
+    return {
+        "format": loaded_format,
+        "classifier": type(classifier).__name__,
+        "load_seconds": load_seconds,
+        "rss_before_load_mb": rss_before,
+        "model_rss_mb": rss_loaded - rss_before,
+        "peak_rss_mb": _peak_rss_mb(),
+        "batches": batches,
+    }
+
+
+def _run_isolated(kwargs: Dict[str, Any]) -> Dict[str, Any]:
+    # Spawned, so each model pays its own imports and starts from a clean heap.
+    with ProcessPoolExecutor(max_workers=1, mp_context=get_context("spawn")) as pool:
+        return pool.submit(benchmark_model, **kwargs).result()
+
+
+def run_benchmark(
+    model_paths: List[str],
+    model_formats: List[str],
+    csv_path: str,
+    batch_sizes: List[int],
+    seed: int = 0,
+    min_time: float = 1.0,
+    min_repeats: int = 5,
+    max_repeats: int = 1000,
+) -> Dict[str, Any]:
+    results: Dict[str, Any] = {}
+    for model_path in model_paths:
+        name = os.path.splitext(os.path.basename(model_path.rstrip("/")))[0]
+        if any(key.startswith(f"{name}:") for key in results):
+            parent = os.path.basename(os.path.dirname(os.path.abspath(model_path)))
+            name = f"{parent}/{name}"
+        for model_format in model_formats:
+            if model_format == "portable" and not artifact_dir_for(model_path):
+                logger.info(f"{name}: no exported artifact, skipping 'portable'")
+                continue
+            key = f"{name}:{model_format}"
+            logger.info(f"Benchmarking {key}...")
+            try:
+                results[key] = _run_isolated(
+                    {
+                        "model_path": model_path,
+                        "model_format": model_format,
+                        "csv_path": csv_path,
+                        "batch_sizes": batch_sizes,
+                        "seed": seed,
+                        "min_time": min_time,
+                        "min_repeats": min_repeats,
+                        "max_repeats": max_repeats,
+                    }
+                )
+            except Exception as e:
+                logger.warning(f"  {key} failed: {e!r}")
+                results[key] = {"error": repr(e)}
+    return {
+        "created_at": datetime.utcnow().isoformat(),
+        "settings": {
+            "csv": os.path.abspath(csv_path),
+            "batch_sizes": batch_sizes,
+            "seed": seed,
+            "min_time": min_time,
+            "min_repeats": min_repeats,
+        },
+        "environment": {
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "cpus": os.cpu_count(),
+        },
+        "results": results,
+    }
+
+
+def _metrics(result: Dict[str, Any]) -> Dict[str, float]:
+    """The flat (name -> value) view compared against the baseline; lower is better."""
+    metrics = {
+        "load_seconds": result["load_seconds"],
+        "model_rss_mb": result["model_rss_mb"],
+    }
+    for size, batch in result["batches"].items():
+        metrics[f"batch_{size}.p50_seconds"] = batch["total"]["p50_seconds"]
+    return metrics
+
+
+def find_regressions(
+    current: Dict[str, Any], baseline: Dict[str, Any], tolerance: float
+) -> List[Dict[str, Any]]:
+    regressions = []
+    for key, result in current["results"].items():
+        previous = baseline.get("results", {}).get(key)
+        if not previous or "error" in previous:
+            continue
+        if "error" in result:
+            regressions.append(
+                {"model": key, "metric": "error", "baseline": None, "current": None}
+            )
+            continue
+        before = _metrics(previous)
+        for metric, value in _metrics(result).items():
+            if metric not in before:
+                continue
+            slack = ABSOLUTE_SLACK["mb" if metric.endswith("_mb") else "seconds"]
+            limit = max(before[metric] * (1 + tolerance), before[metric] + slack)
+            if value > limit:
+                regressions.append(
+                    {
+                        "model": key,
+                        "metric": metric,
+                        "baseline": before[metric],
+                        "current": value,
+                    }
+                )
+    return regressions
+
+
+def format_report(report: Dict[str, Any]) -> str:
+    width = max([len(key) for key in report["results"]] + [5])
+    lines = [
+        f"{'model':<{width}} {'load ms':>8} {'MB':>6} {'batch':>6} "
+        f"{'prep ms':>9} {'pred ms':>9} {'p95 ms':>9} {'rows/s':>10}"
+    ]
+    for key, result in report["results"].items():
+        if "error" in result:
+            lines.append(f"{key:<{width}} {result['error']}")
+            continue
+        for i, (size, batch) in enumerate(result["batches"].items()):
+            head = (
+                f"{key:<{width}} {result['load_seconds'] * 1000:>8.1f} "
+                f"{result['model_rss_mb']:>6.1f}"
+                if i == 0
+                else f"{'':<{width}} {'':>8} {'':>6}"
+            )
+            lines.append(
+                f"{head} {size:>6} "
+                f"{batch['preprocess']['p50_seconds'] * 1000:>9.3f} "
+                f"{batch['predict']['p50_seconds'] * 1000:>9.3f} "
+                f"{batch['total']['p95_seconds'] * 1000:>9.3f} "
+                f"{batch['rows_per_second']:>10,.0f}"
+            )
+    return "\n".join(lines)
+
+
+def _write_json(path: str, data: Dict[str, Any]) -> None:
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    parser = argparse.ArgumentParser(
+        description="Measure load time, memory and inference latency of the model artifacts"
+    )
+    parser.add_argument(
+        "models",
+        nargs="*",
+        help=f"Model .pkl files or artifact directories (default: every .pkl in {MODELS_DIR}).",
+    )
+    parser.add_argument(
+        "--format",
+        dest="formats",
+        action="append",
+        choices=MODEL_FORMATS,
+        default=None,
+        help="How to load each model (repeatable; default: auto, as the backend does).",
+    )
+    parser.add_argument("--csv", default=DEFAULT_CSV_PATH)
+    parser.add_argument(
+        "--batch-sizes",
+        type=int,
+        nargs="+",
+        default=list(BATCH_SIZES),
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--min-time",
+        type=float,
+        default=1.0,
+        help="Seconds to keep repeating each batch size.",
+    )
+    parser.add_argument("--min-repeats", type=int, default=5)
+    parser.add_argument("--output", default=DEFAULT_RESULTS_PATH)
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE_PATH)
+    parser.add_argument(
+        "--save-baseline",
+        action="store_true",
+        help="Store these results as the new baseline instead of comparing.",
+    )
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.25,
+        help="Allowed relative slowdown/growth over the baseline.",
+    )
+    args = parser.parse_args()
+
+    model_paths = args.models or sorted(glob.glob(os.path.join(MODELS_DIR, "*.pkl")))
+    if not model_paths:
+        raise SystemExit(f"No models found in {MODELS_DIR}")
+    report = run_benchmark(
+        model_paths,
+        args.formats or ["auto"],
+        args.csv,
+        sorted(args.batch_sizes),
+        seed=args.seed,
+        min_time=args.min_time,
+        min_repeats=args.min_repeats,
+    )
+    logger.info(format_report(report))
+
+    if args.save_baseline:
+        _write_json(args.baseline, report)
+        logger.info(f"Saved baseline to {args.baseline}")
+    elif os.path.exists(args.baseline):
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        report["regressions"] = find_regressions(report, baseline, args.tolerance)
+        for regression in report["regressions"]:
+            logger.warning(
+                f"REGRESSION {regression['model']} {regression['metric']}: "
+                f"{regression['baseline']} -> {regression['current']}"
+            )
+    else:
+        logger.info(
+            f"No baseline at {args.baseline}; run with --save-baseline to store one."
+        )
+
+    _write_json(args.output, report)
+    logger.info(f"Wrote {args.output}")
+    if report.get("regressions"):
+        raise SystemExit(
+            f"{len(report['regressions'])} regression(s) beyond {args.tolerance:.0%} "
+            f"of {args.baseline}"
+        )
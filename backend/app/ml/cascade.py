@@ -0,0 +1,131 @@
+import logging
+import threading
+import time
+from typing import Any, Dict, NamedTuple, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+
+class CascadeStage(NamedTuple):
+    name: str
+    preprocessor: Any
+    model: Any
+
+
+def positive_probability(model: Any, probabilities: np.ndarray) -> np.ndarray:
+    """The pathogen (class 1) column of ``predict_proba`` output."""
+    if probabilities.shape[1] > 1 and int(model.classes_[1]) == 1:
+        return probabilities[:, 1]
+    return probabilities[:, 0]
+
+
+class ModelCascade:
+    """
+    Scores rows with the cheapest stage first. A row whose pathogen
+    probability lies inside the uncertainty band ``[low, high]`` is passed
+    on to the next stage; the last stage answers whatever is left. Stages
+    whose preprocessors share an encoding reuse the matrix already built.
+
+    With a single stage this is just the model, plus the counters.
+    """
+
+    def __init__(self, stages: Sequence[CascadeStage], low: float, high: float):
+        if not stages:
+            raise ValueError("A cascade needs at least one stage")
+        if not 0.0 <= low <= high <= 1.0:
+            raise ValueError(f"Invalid uncertainty band [{low}, {high}]")
+        self.stages = list(stages)
+        self.low = low
+        self.high = high
+        self._lock = threading.Lock()
+        self.rows = 0
+        self.answered = [0] * len(self.stages)
+        self.scored = [0] * len(self.stages)
+        self.seconds = [0.0] * len(self.stages)
+
+    def predict(self, df: pd.DataFrame) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """(labels, pathogen probabilities, index of the stage that answered) per row."""
+        n_rows = len(df)
+        labels = np.zeros(n_rows, dtype=int)
+        probabilities = np.zeros(n_rows, dtype=float)
+        answered_by = np.zeros(n_rows, dtype=int)
+        encoded: Dict[Any, Tuple[np.ndarray, np.ndarray]] = {}
+        remaining = np.arange(n_rows)
+        answered = [0] * len(self.stages)
+        scored = [0] * len(self.stages)
+        seconds = [0.0] * len(self.stages)
+
+        for index, stage in enumerate(self.stages):
+            if not len(remaining):
+                break
+            started = time.perf_counter()
+            X = self._encode(stage.preprocessor, df, remaining, encoded)
+            stage_probabilities = stage.model.predict_proba(X)
+            positive = positive_probability(stage.model, stage_probabilities)
+            stage_labels = stage.model.classes_[np.argmax(stage_probabilities, axis=1)]
+            seconds[index] = time.perf_counter() - started
+            scored[index] = len(remaining)
+
+            if index == len(self.stages) - 1:
+                done = np.ones(len(remaining), dtype=bool)
+            else:
+                done = (positive < self.low) | (positive > self.high)
+            rows = remaining[done]
+            labels[rows] = stage_labels[done]
+            probabilities[rows] = positive[done]
+            answered_by[rows] = index
+            answered[index] = len(rows)
+            remaining = remaining[~done]
+
+        with self._lock:
+            self.rows += n_rows
+            for index in range(len(self.stages)):
+                self.answered[index] += answered[index]
+                self.scored[index] += scored[index]
+                self.seconds[index] += seconds[index]
+        return labels, probabilities, answered_by
+
+    @staticmethod
+    def _encode(
+        preprocessor: Any,
+        df: pd.DataFrame,
+        rows: np.ndarray,
+        encoded: Dict[Any, Tuple[np.ndarray, np.ndarray]],
+    ) -> np.ndarray:
+        key = getattr(preprocessor, "encoding", None) or id(preprocessor)
+        if key in encoded:
+            # ``rows`` only ever shrinks, so it is a subset of the encoded rows.
+            encoded_rows, X = encoded[key]
+            return X[np.searchsorted(encoded_rows, rows)]
+        X = preprocessor.transform(df.iloc[rows] if len(rows) < len(df) else df)
+        encoded[key] = (rows, X)
+        return X
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            rows = self.rows
+            stages = [
+                {
+                    "name": stage.name,
+                    "answered": self.answered[index],
+                    "scored": self.scored[index],
+                    "answered_rate": self.answered[index] / rows if rows else None,
+                    "ms_per_row": (
+                        self.seconds[index] * 1000 / self.scored[index]
+                        if self.scored[index]
+                        else None
+                    ),
+                }
+                for index, stage in enumerate(self.stages)
+            ]
+        escalated = rows - stages[0]["answered"]
+        return {
+            "stages": stages,
+            "uncertainty_band": [self.low, self.high],
+            "rows": rows,
+            "escalated": escalated,
+            "escalation_rate": escalated / rows if rows else None,
+        }
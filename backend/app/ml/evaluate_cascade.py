@@ -0,0 +1,119 @@
+import argparse
+import logging
+import os
+import time
+from typing import Any, Dict, List, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+from app.ml.artifacts import load_model
+from app.ml.cascade import CascadeStage, ModelCascade
+from app.ml.train import DEFAULT_SNAPSHOT_PATH, TARGET, load_training_data
+
+logger = logging.getLogger(__name__)
+
+
+def _predict_in_batches(
+    cascade: ModelCascade, df: pd.DataFrame, batch_size: int
+) -> Tuple[np.ndarray, float]:
+    labels = []
+    started = time.perf_counter()
+    for start in range(0, len(df), batch_size):
+        labels.append(cascade.predict(df.iloc[start : start + batch_size])[0])
+    return np.concatenate(labels), time.perf_counter() - started
+
+
+def evaluate_bands(
+    stages: Sequence[CascadeStage],
+    df: pd.DataFrame,
+    target: np.ndarray,
+    bands: List[Tuple[float, float]],
+    batch_size: int = 1,
+) -> List[Dict[str, Any]]:
+    """
+    For each band: the escalation rate, agreement with the last stage on
+    its own, accuracy/recall against ``target`` and CPU time relative to
+    the last stage alone, scoring ``batch_size`` rows per call.
+    """
+    reference, reference_seconds = _predict_in_batches(
+        ModelCascade(stages[-1:], 0.0, 1.0), df, batch_size
+    )
+    positives = target == 1
+    results = []
+    for low, high in bands:
+        cascade = ModelCascade(stages, low, high)
+        labels, seconds = _predict_in_batches(cascade, df, batch_size)
+        results.append(
+            {
+                "band": [low, high],
+                "escalation_rate": cascade.stats()["escalation_rate"],
+                "agreement": float(np.mean(labels == reference)),
+                "accuracy": float(np.mean(labels == target)),
+                "recall": (
+                    float(np.mean(labels[positives] == 1)) if positives.any() else None
+                ),
+                "cpu_ratio": seconds / reference_seconds,
+            }
+        )
+    return results
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    parser = argparse.ArgumentParser(
+        description="Show how a model cascade trades escalations for agreement with its last stage"
+    )
+    parser.add_argument(
+        "models",
+        nargs="+",
+        help="Model .pkl files or artifact directories, cheapest first.",
+    )
+    parser.add_argument("--snapshot", default=DEFAULT_SNAPSHOT_PATH)
+    parser.add_argument(
+        "--band",
+        dest="bands",
+        type=float,
+        nargs=2,
+        action="append",
+        metavar=("LOW", "HIGH"),
+        default=None,
+        help="Uncertainty band to evaluate (repeatable).",
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=1,
+        help="Rows per call; 1 matches the single-prediction endpoint.",
+    )
+    args = parser.parse_args()
+
+    stages = []
+    for path in args.models:
+        preprocessor, model, _ = load_model(path)
+        name = os.path.splitext(os.path.basename(path.rstrip("/")))[0]
+        stages.append(CascadeStage(name, preprocessor, model))
+    df = load_training_data(args.snapshot)
+    bands = [tuple(band) for band in args.bands or []] or [
+        (0.05, 0.95),
+        (0.1, 0.9),
+        (0.2, 0.8),
+        (0.3, 0.7),
+    ]
+
+    results = evaluate_bands(
+        stages, df, df[TARGET].to_numpy(), bands, batch_size=args.batch_size
+    )
+    logger.info(
+        f"{len(df)} rows, {args.batch_size} per call, last stage {stages[-1].name}:"
+    )
+    logger.info(
+        f"{'band':<12} {'escalated':>9} {'agree':>7} {'accuracy':>8} {'recall':>7} {'CPU':>6}"
+    )
+    for result in results:
+        low, high = result["band"]
+        recall = "-" if result["recall"] is None else f"{result['recall']:.3f}"
+        logger.info(
+            f"{f'{low:g}-{high:g}':<12} {result['escalation_rate']:>9.1%} "
+            f"{result['agreement']:>7.3f} {result['accuracy']:>8.3f} {recall:>7} "
+            f"{result['cpu_ratio']:>5.2f}x"
+        )
@@ -0,0 +1,77 @@
+from typing import Any, Dict
+
+import numpy as np
+import pandas as pd
+
+# The models were trained on the MiMeDB CSV, so their features carry the
+# CSV's column names and wording. The catalog (database, snapshots, API
+# payloads) stores the same fields under init_db.COLUMN_MAPPING's names,
+# with the yes/no columns cleaned to booleans.
+CATALOG_TO_FEATURE = {
+    "class_name": "klass",
+    "gram_stain": "gram",
+    "flagellar_presence": "flagella_presence",
+    "oxygen_preference": "oxygen_requirement",
+}
+# (True, False) as the CSV spells them.
+BOOLEAN_FEATURE_VALUES = {
+    "mobility": ("Yes", "No"),
+    "flagellar_presence": ("Yes", "No"),
+    "sporulation": ("Sporulating", "Nonsporulating"),
+}
+# Stored as strings in the catalog, numeric in the CSV.
+NUMERIC_FEATURES = ["number_of_membranes", "optimal_temperature"]
+
+
+def feature_value(catalog_column: str, value: Any) -> Any:
+    """One catalog value as the model saw it in the CSV; missing becomes NaN."""
+    if (
+        value is None
+        or value is pd.NA
+        or (isinstance(value, float) and np.isnan(value))
+    ):
+        return np.nan
+    if catalog_column in BOOLEAN_FEATURE_VALUES and isinstance(value, (bool, np.bool_)):
+        yes, no = BOOLEAN_FEATURE_VALUES[catalog_column]
+        return yes if value else no
+    if catalog_column in NUMERIC_FEATURES:
+        try:
+            return float(value)
+        except (TypeError, ValueError):
+            return np.nan
+    return value
+
+
+def catalog_record_to_features(record: Dict[str, Any]) -> Dict[str, Any]:
+    """A catalog record (e.g. an API payload) keyed and valued like a CSV row."""
+    return {
+        CATALOG_TO_FEATURE.get(name, name): feature_value(name, value)
+        for name, value in record.items()
+    }
+
+
+def catalog_frame_to_features(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    A catalog frame (e.g. a typed snapshot) renamed and re-encoded into the
+    model's feature space, as plain object/float columns with NaN for missing
+    values. Columns already in feature space pass through unchanged.
+    """
+    features = pd.DataFrame(index=df.index)
+    for name in df.columns:
+        column = df[name]
+        if name in BOOLEAN_FEATURE_VALUES:
+            values = (
+                column.astype(object)
+                .map(lambda value: feature_value(name, value))
+                .astype(object)
+            )
+        elif name in NUMERIC_FEATURES:
+            values = pd.to_numeric(column.astype(object), errors="coerce")
+        elif pd.api.types.is_extension_array_dtype(column.dtype):
+            values = column.astype(object)
+        else:
+            values = column
+        features[CATALOG_TO_FEATURE.get(name, name)] = values.where(
+            values.notna(), np.nan
+        )
+    return features
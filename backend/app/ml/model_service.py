@@ -6,6 +6,10 @@ import joblib
 import numpy as np
 import pandas as pd
 from app.core.config import settings
+from app.core.singleflight import make_key, request_coalescer
+from app.ml.artifacts import artifact_dir_for, load_artifact, load_model
+from app.ml.cascade import CascadeStage, ModelCascade
+from app.ml.features import catalog_frame_to_features, catalog_record_to_features
 from sklearn.metrics.pairwise import cosine_similarity
 
 logger = logging.getLogger(__name__)
@@ -16,6 +20,7 @@ class BacteriaModelServiceSingleton:
     model: Any = None
     preprocessor: Any = None
     feature_names_in_: Optional[List[str]] = None
+    cascade: Optional[ModelCascade] = None
 
     def __new__(cls):
         if cls._instance is None:
@@ -27,6 +32,7 @@ class BacteriaModelServiceSingleton:
     def __init__(self):
         if not hasattr(self, "_initialized") or not self._initialized:
             self._load_model_and_preprocessor()
+            self._build_cascade()
             self._initialized = True
 
     def _load_model_and_preprocessor(self):
@@ -40,6 +46,22 @@ class BacteriaModelServiceSingleton:
         logger.info(f"Attempting to load model from paths: {model_paths_to_try}")
 
         for path_attempt in model_paths_to_try:
+            artifact_dir = artifact_dir_for(path_attempt)
+            if artifact_dir:
+                # Exported artifacts load without unpickling scikit-learn objects,
+                # so they survive library upgrades that break the .pkl.
+                try:
+                    logger.info(f"Loading model artifact from: {artifact_dir}")
+                    self.preprocessor, self.model = load_artifact(artifact_dir)
+                    self.feature_names_in_ = list(self.preprocessor.feature_names_in_)
+                    logger.info("Model and preprocessor loaded successfully.")
+                    return
+                except Exception as e:
+                    logger.error(
+                        f"Error loading model artifact from {artifact_dir}: {e}",
+                        exc_info=True,
+                    )
+
             if os.path.exists(path_attempt):
                 try:
                     logger.info(f"Loading model from: {path_attempt}")
@@ -83,15 +105,95 @@ class BacteriaModelServiceSingleton:
 
         logger.error("Failed to load model from any specified path.")
 
+    def _build_cascade(self):
+        """
+        Serves the model through a ModelCascade. With ML_CASCADE_FIRST_STAGE_PATH
+        set, that (cheaper) model answers first and only rows whose pathogen
+        probability falls inside the uncertainty band reach the main model.
+        """
+        if not self.model or not self.preprocessor:
+            return
+        main_stage = CascadeStage(
+            _stage_name(settings.ML_MODEL_PATH), self.preprocessor, self.model
+        )
+        first_stage_path = settings.ML_CASCADE_FIRST_STAGE_PATH
+        if first_stage_path:
+            try:
+                preprocessor, model, model_format = load_model(
+                    os.path.join("/app", first_stage_path)
+                )
+                self.cascade = ModelCascade(
+                    [
+                        CascadeStage(
+                            _stage_name(first_stage_path), preprocessor, model
+                        ),
+                        main_stage,
+                    ],
+                    settings.ML_CASCADE_UNCERTAINTY_LOW,
+                    settings.ML_CASCADE_UNCERTAINTY_HIGH,
+                )
+                logger.info(
+                    f"Cascade: {first_stage_path} ({model_format}) answers outside "
+                    f"[{self.cascade.low}, {self.cascade.high}], "
+                    f"{settings.ML_MODEL_PATH} answers the rest."
+                )
+                return
+            except Exception as e:
+                logger.error(
+                    f"Could not set up the cascade with {first_stage_path}; "
+                    f"serving {settings.ML_MODEL_PATH} alone: {e}",
+                    exc_info=True,
+                )
+        self.cascade = ModelCascade([main_stage], 0.0, 1.0)
+
+    def stats(self) -> Dict[str, Any]:
+        """Which stage answered how many rows, and how often rows escalated."""
+        if self.cascade is None:
+            return {"loaded": False}
+        return {"loaded": True, **self.cascade.stats()}
+
     def _prepare_input_data(self, bacteria_data: Dict[str, Any]) -> pd.DataFrame:
         """Converts input dict to a DataFrame, ensuring correct column order if feature_names_in_ is set."""
-        df = pd.DataFrame([bacteria_data])
-        if self.feature_names_in_:
-            for col in self.feature_names_in_:
-                if col not in df.columns:
-                    df[col] = np.nan
-            df = df[self.feature_names_in_]
-        return df
+        features = catalog_record_to_features(bacteria_data)
+        if not self.feature_names_in_:
+            return pd.DataFrame([features])
+        # Built straight from the model's columns: constructing the frame from
+        # every input field and then selecting costs more than the prediction.
+        return pd.DataFrame(
+            [[features.get(col, np.nan) for col in self.feature_names_in_]],
+            columns=self.feature_names_in_,
+        )
+
+    def _prepare_input_frame(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Maps a typed catalog frame (e.g. a snapshot) into the model's feature
+        space and aligns it to feature_names_in_, giving the object columns
+        with NaN that the preprocessor sees for single-row input. Raises if a
+        feature is missing rather than scoring it as unknown for every row.
+        """
+        features = catalog_frame_to_features(df)
+        if not self.feature_names_in_:
+            return features
+        missing = [col for col in self.feature_names_in_ if col not in features]
+        if missing:
+            raise ValueError(f"Input is missing model features: {', '.join(missing)}")
+        return features[self.feature_names_in_]
+
+    def predict_batch(self, df: pd.DataFrame) -> Tuple[np.ndarray, np.ndarray]:
+        """Scores every row of ``df`` in one transform/predict call. Returns (labels, pathogen probabilities)."""
+        if not self.cascade:
+            logger.error("Model not loaded. Cannot make predictions.")
+            raise ValueError("Model not loaded")
+
+        try:
+            labels, probabilities, _ = self.cascade.predict(
+                self._prepare_input_frame(df)
+            )
+        except Exception as e:
+            logger.error(f"Error during batch prediction: {e}", exc_info=True)
+            raise ValueError(f"Error making batch prediction: {e}")
+
+        return labels.astype(int), probabilities.astype(float)
 
     def preprocess_data(self, bacteria_data: Dict[str, Any]) -> np.ndarray:
         if not self.preprocessor:
@@ -109,27 +211,40 @@ class BacteriaModelServiceSingleton:
             raise ValueError(f"Error preprocessing data: {e}")
 
     def predict_pathogenicity(self, bacteria_data: Dict[str, Any]) -> Tuple[int, float]:
-        if not self.model:
+        label, probability, _ = self.predict_pathogenicity_with_stage(bacteria_data)
+        return label, probability
+
+    def predict_pathogenicity_with_stage(
+        self, bacteria_data: Dict[str, Any]
+    ) -> Tuple[int, float, str]:
+        """
+        (label, pathogen probability, name of the cascade stage that answered).
+        Identical concurrent payloads share a single model evaluation.
+        """
+        return request_coalescer.do(
+            make_key("predict_pathogenicity", bacteria_data),
+            lambda: self._predict_pathogenicity(bacteria_data),
+        )
+
+    def _predict_pathogenicity(
+        self, bacteria_data: Dict[str, Any]
+    ) -> Tuple[int, float, str]:
+        if not self.cascade:
             logger.error("Model not loaded. Cannot make predictions.")
             raise ValueError("Model not loaded")
 
-        X_processed = self.preprocess_data(bacteria_data)
+        df_input = self._prepare_input_data(bacteria_data)
 
         try:
-            prediction = self.model.predict(X_processed)[0]
-            probability = self.model.predict_proba(X_processed)[0]
-
-            pathogen_prob = (
-                float(probability[1])
-                if len(probability) > 1 and int(self.model.classes_[1]) == 1
-                else float(probability[0])
-            )
-
-            return int(prediction), pathogen_prob
+            labels, probabilities, stages = self.cascade.predict(df_input)
         except Exception as e:
             logger.error(f"Error during prediction: {e}", exc_info=True)
+            logger.error(f"Input data causing error: {bacteria_data}")
             raise ValueError(f"Error making prediction: {e}")
 
+        stage = self.cascade.stages[int(stages[0])]
+        return int(labels[0]), float(probabilities[0]), stage.name
+
     def find_similar_bacteria(
         self,
         input_bacteria_data: Dict[str, Any],
@@ -145,7 +260,9 @@ class BacteriaModelServiceSingleton:
         try:
             X_input_processed = self.preprocess_data(input_bacteria_data)
 
-            all_bacteria_df = pd.DataFrame(all_bacteria_dicts)
+            all_bacteria_df = catalog_frame_to_features(
+                pd.DataFrame(all_bacteria_dicts)
+            )
 
             if self.feature_names_in_:
                 for col in self.feature_names_in_:
@@ -183,4 +300,8 @@ class BacteriaModelServiceSingleton:
             return []
 
 
+def _stage_name(model_path: str) -> str:
+    return os.path.splitext(os.path.basename(model_path.rstrip("/")))[0]
+
+
 model_service = BacteriaModelServiceSingleton()
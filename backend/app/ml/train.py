@@ -0,0 +1,478 @@
+import argparse
+import json
+import logging
+import os
+import platform
+import shutil
+import tempfile
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, List, NamedTuple, Optional
+
+import joblib
+import numpy as np
+import pandas as pd
+import sklearn
+import xgboost as xgb
+from app.core.config import settings
+from app.db.snapshot import load_snapshot
+from app.ml.artifacts import export_artifact, verify_artifact
+from app.ml.features import catalog_frame_to_features
+from imblearn.ensemble import BalancedRandomForestClassifier
+from imblearn.over_sampling import SMOTE
+from imblearn.pipeline import Pipeline as ImbPipeline
+from sklearn.compose import ColumnTransformer
+from sklearn.ensemble import (
+    AdaBoostClassifier,
+    GradientBoostingClassifier,
+    RandomForestClassifier,
+    StackingClassifier,
+    VotingClassifier,
+)
+from sklearn.impute import SimpleImputer
+from sklearn.metrics import (
+    accuracy_score,
+    average_precision_score,
+    f1_score,
+    precision_score,
+    recall_score,
+    roc_auc_score,
+)
+from sklearn.model_selection import GridSearchCV, train_test_split
+from sklearn.naive_bayes import GaussianNB
+from sklearn.neural_network import MLPClassifier
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import OneHotEncoder, StandardScaler
+
+logger = logging.getLogger(__name__)
+
+# Same feature set and target as ml/train.ipynb, in the CSV's column names
+# (app.ml.features maps the catalog's columns onto them).
+FEATURES = [
+    "phylum",
+    "superkingdom",
+    "gram",
+    "oxygen_requirement",
+    "shape",
+    "number_of_membranes",
+    "optimal_temperature",
+    "klass",
+    "order",
+    "family",
+    "genus",
+    "mobility",
+    "flagella_presence",
+    "temperature_range",
+    "habitat",
+    "biotic_relationship",
+    "cell_arrangement",
+    "sporulation",
+    "metabolism",
+    "energy_source",
+]
+TARGET = "human_pathogen"
+DEFAULT_SNAPSHOT_PATH = settings.CATALOG_SNAPSHOT_PATH
+# Where docker-compose mounts ml/models (see `make export-models`).
+DEFAULT_OUTPUT_DIR = "/app/ml_models"
+JOBLIB_BACKENDS = ("loky", "threading", "multiprocessing")
+# Largest P(pathogen) difference allowed between a saved pipeline and its
+# portable export on the test split.
+ARTIFACT_TOLERANCE = 1e-6
+# evaluate()'s higher-is-better metrics, with the scikit-learn scorer that
+# grid search uses for each.
+SCORERS = {
+    "accuracy": "accuracy",
+    "precision": "precision",
+    "recall": "recall",
+    "f1": "f1",
+    "roc_auc": "roc_auc",
+    "pr_auc": "average_precision",
+}
+
+
+class ModelSpec(NamedTuple):
+    build: Callable[[int], Any]
+    smote: bool = True
+    param_grid: Optional[Dict[str, List[Any]]] = None
+
+
+def _xgboost(seed: int, n_estimators: int = 100) -> xgb.XGBClassifier:
+    # One thread per model: parallelism comes from the jobs running the models.
+    return xgb.XGBClassifier(n_estimators=n_estimators, random_state=seed, n_jobs=1)
+
+
+FOREST_GRID = {
+    "classifier__n_estimators": [50, 100, 200],
+    "classifier__max_depth": [None, 10, 20],
+    "classifier__min_samples_split": [2, 5],
+}
+
+MODELS: Dict[str, ModelSpec] = {
+    "random_forest": ModelSpec(
+        lambda seed: RandomForestClassifier(n_estimators=100, random_state=seed),
+        param_grid=FOREST_GRID,
+    ),
+    "balanced_random_forest": ModelSpec(
+        lambda seed: BalancedRandomForestClassifier(
+            n_estimators=100, random_state=seed
+        ),
+        smote=False,
+        param_grid=FOREST_GRID,
+    ),
+    "adaboost": ModelSpec(
+        lambda seed: AdaBoostClassifier(n_estimators=100, random_state=seed),
+        param_grid={
+            "classifier__n_estimators": [50, 100, 200],
+            "classifier__learning_rate": [0.01, 0.1, 1.0],
+        },
+    ),
+    "gradient_boosting": ModelSpec(
+        lambda seed: GradientBoostingClassifier(n_estimators=100, random_state=seed),
+        param_grid={
+            "classifier__n_estimators": [50, 100, 200],
+            "classifier__learning_rate": [0.01, 0.1],
+            "classifier__max_depth": [3, 5],
+        },
+    ),
+    "xgboost": ModelSpec(
+        _xgboost,
+        param_grid={
+            "classifier__n_estimators": [50, 100, 200],
+            "classifier__learning_rate": [0.01, 0.1],
+            "classifier__max_depth": [3, 5, 7],
+        },
+    ),
+    "naive_bayes": ModelSpec(lambda seed: GaussianNB()),
+    "neural_network": ModelSpec(
+        lambda seed: MLPClassifier(
+            hidden_layer_sizes=(100, 50),
+            activation="relu",
+            solver="adam",
+            max_iter=1000,
+            random_state=seed,
+        ),
+        param_grid={
+            "classifier__hidden_layer_sizes": [(50,), (100,), (100, 50)],
+            "classifier__alpha": [0.0001, 0.001, 0.01],
+        },
+    ),
+    "voting_ensemble": ModelSpec(
+        lambda seed: VotingClassifier(
+            estimators=[
+                ("rf", RandomForestClassifier(n_estimators=100, random_state=seed)),
+                (
+                    "gb",
+                    GradientBoostingClassifier(n_estimators=100, random_state=seed),
+                ),
+                ("xgb", _xgboost(seed)),
+            ],
+            voting="soft",
+        )
+    ),
+    "stacking_ensemble": ModelSpec(
+        lambda seed: StackingClassifier(
+            estimators=[
+                ("rf", RandomForestClassifier(n_estimators=50, random_state=seed)),
+                ("gb", GradientBoostingClassifier(n_estimators=50, random_state=seed)),
+                ("xgb", _xgboost(seed, n_estimators=50)),
+            ],
+            final_estimator=RandomForestClassifier(n_estimators=100, random_state=seed),
+            cv=5,
+        )
+    ),
+}
+
+
+def load_training_data(snapshot_path: str) -> pd.DataFrame:
+    """
+    The bacteria rows of a catalog snapshot (``make snapshot``) in the
+    model's feature space, with a missing target read as 0. Training,
+    evaluation and batch scoring all read the catalog through the same
+    snapshot and mapping.
+    """
+    df = load_snapshot(snapshot_path)
+    df = df[df["superkingdom"] == "Bacteria"].reset_index(drop=True)
+    features = catalog_frame_to_features(df.drop(columns=["is_pathogen"]))
+    features[TARGET] = df["is_pathogen"].fillna(False).astype(int)
+    return features
+
+
+def build_preprocessor(X: pd.DataFrame) -> ColumnTransformer:
+    categorical_features = X.select_dtypes(
+        include=["object", "string"]
+    ).columns.tolist()
+    numerical_features = X.select_dtypes(include=["int64", "float64"]).columns.tolist()
+    categorical_transformer = Pipeline(
+        steps=[
+            ("imputer", SimpleImputer(strategy="constant", fill_value="unknown")),
+            ("onehot", OneHotEncoder(handle_unknown="ignore", sparse_output=False)),
+        ]
+    )
+    numerical_transformer = Pipeline(
+        steps=[
+            ("imputer", SimpleImputer(strategy="median")),
+            ("scaler", StandardScaler()),
+        ]
+    )
+    return ColumnTransformer(
+        transformers=[
+            ("num", numerical_transformer, numerical_features),
+            ("cat", categorical_transformer, categorical_features),
+        ],
+        remainder="drop",
+    )
+
+
+def build_pipeline(
+    name: str,
+    preprocessor: ColumnTransformer,
+    seed: int,
+    memory: Optional[joblib.Memory] = None,
+) -> ImbPipeline:
+    """
+    The notebook's pipeline for ``name``. With ``memory``, the fitted
+    preprocessor (and SMOTE resample) is cached on disk, so models and grid
+    candidates trained on the same rows reuse one transform.
+    """
+    spec = MODELS[name]
+    steps = [("preprocessor", sklearn.clone(preprocessor))]
+    if spec.smote:
+        steps.append(("smote", SMOTE(random_state=seed)))
+    steps.append(("classifier", spec.build(seed)))
+    return ImbPipeline(steps, memory=memory)
+
+
+def evaluate(pipeline, X_test: pd.DataFrame, y_test: pd.Series) -> Dict[str, float]:
+    started = time.perf_counter()
+    y_pred = pipeline.predict(X_test)
+    y_prob = pipeline.predict_proba(X_test)[:, 1]
+    predict_seconds = time.perf_counter() - started
+    return {
+        "accuracy": accuracy_score(y_test, y_pred),
+        "precision": precision_score(y_test, y_pred, zero_division=0),
+        "recall": recall_score(y_test, y_pred, zero_division=0),
+        "f1": f1_score(y_test, y_pred, zero_division=0),
+        "roc_auc": roc_auc_score(y_test, y_prob),
+        "pr_auc": average_precision_score(y_test, y_prob),
+        "predict_seconds": predict_seconds,
+    }
+
+
+def fit_and_evaluate(
+    name: str,
+    preprocessor: ColumnTransformer,
+    X_train: pd.DataFrame,
+    y_train: pd.Series,
+    X_test: pd.DataFrame,
+    y_test: pd.Series,
+    seed: int,
+    memory: Optional[joblib.Memory],
+) -> Dict[str, Any]:
+    pipeline = build_pipeline(name, preprocessor, seed, memory)
+    started = time.perf_counter()
+    pipeline.fit(X_train, y_train)
+    fit_seconds = time.perf_counter() - started
+    return {
+        "model": name,
+        "fit_seconds": fit_seconds,
+        **evaluate(pipeline, X_test, y_test),
+    }
+
+
+def train(
+    snapshot_path: str,
+    output_dir: str,
+    models: List[str],
+    n_jobs: int = -1,
+    backend: str = "loky",
+    cache_dir: Optional[str] = None,
+    seed: int = 42,
+    test_size: float = 0.2,
+    cv: int = 3,
+    scoring: str = "recall",
+    tune: Optional[str] = "best",
+) -> Dict[str, Any]:
+    """
+    Compares ``models`` on a stratified hold-out split, grid-searches the
+    best one by ``scoring`` (or the model named by ``tune``; None skips it)
+    on the training split, and writes the final pipeline plus a JSON report
+    of metrics and timings to ``output_dir``. Model fits and grid candidates
+    run as ``n_jobs`` joblib jobs on ``backend``.
+    """
+    if scoring not in SCORERS:
+        raise ValueError(
+            f"Unknown scoring '{scoring}'. Expected one of {tuple(SCORERS)}."
+        )
+    started = time.perf_counter()
+    df = load_training_data(snapshot_path)
+    X = df[[f for f in FEATURES if f in df.columns]].copy()
+    y = df[TARGET]
+    X_train, X_test, y_train, y_test = train_test_split(
+        X, y, test_size=test_size, random_state=seed, stratify=y
+    )
+    preprocessor = build_preprocessor(X)
+    logger.info(
+        f"Training on {len(X_train)} rows, testing on {len(X_test)} "
+        f"({int(y.sum())} pathogens overall); n_jobs={n_jobs}, backend={backend}"
+    )
+
+    memory = joblib.Memory(cache_dir, verbose=0) if cache_dir else None
+    timings: Dict[str, float] = {"load_seconds": time.perf_counter() - started}
+
+    with joblib.parallel_config(backend=backend, n_jobs=n_jobs):
+        phase = time.perf_counter()
+        results = joblib.Parallel()(
+            joblib.delayed(fit_and_evaluate)(
+                name, preprocessor, X_train, y_train, X_test, y_test, seed, memory
+            )
+            for name in models
+        )
+        timings["compare_seconds"] = time.perf_counter() - phase
+        results.sort(key=lambda result: result[scoring], reverse=True)
+        for result in results:
+            logger.info(
+                f"  {result['model']:<24} {scoring}={result[scoring]:.4f} "
+                f"roc_auc={result['roc_auc']:.4f} fit={result['fit_seconds']:.2f}s"
+            )
+
+        final_name = results[0]["model"] if tune in ("best", None) else tune
+        param_grid = MODELS[final_name].param_grid if tune is not None else None
+        best_params: Dict[str, Any] = {}
+        phase = time.perf_counter()
+        if param_grid:
+            logger.info(f"Grid-searching {final_name} ({scoring}, cv={cv})...")
+            search = GridSearchCV(
+                build_pipeline(final_name, preprocessor, seed, memory),
+                param_grid,
+                cv=cv,
+                scoring=SCORERS[scoring],
+            )
+            search.fit(X_train, y_train)
+            pipeline = search.best_estimator_
+            best_params = search.best_params_
+            logger.info(f"Best parameters: {best_params} ({search.best_score_:.4f})")
+        else:
+            pipeline = build_pipeline(final_name, preprocessor, seed, memory)
+            pipeline.fit(X_train, y_train)
+        timings["tune_seconds"] = time.perf_counter() - phase
+
+    # The saved pipeline must not point at the (possibly temporary) cache.
+    pipeline.set_params(memory=None)
+    final_metrics = evaluate(pipeline, X_test, y_test)
+    timings["total_seconds"] = time.perf_counter() - started
+
+    suffix = "_tuned" if param_grid else ""
+    stem = os.path.join(output_dir, f"bacteria_classifier_{final_name}{suffix}")
+    os.makedirs(output_dir, exist_ok=True)
+    joblib.dump(pipeline, f"{stem}.pkl")
+    try:
+        export_artifact(pipeline, stem, source=os.path.basename(f"{stem}.pkl"))
+        portable_artifact = os.path.basename(stem)
+    except ValueError as e:
+        logger.warning(f"No portable artifact for {final_name}: {e}")
+        portable_artifact = None
+    artifact_difference = None
+    if portable_artifact:
+        artifact_difference = verify_artifact(pipeline, stem, X_test)
+        if artifact_difference > ARTIFACT_TOLERANCE:
+            # The service prefers the artifact over the pickle; don't leave it.
+            shutil.rmtree(stem)
+            raise RuntimeError(
+                f"Portable artifact for {final_name} diverges from the pipeline "
+                f"on the test split (max |dP| = {artifact_difference:.3g})"
+            )
+    report = {
+        "artifact": os.path.basename(f"{stem}.pkl"),
+        "portable_artifact": portable_artifact,
+        "portable_max_difference": artifact_difference,
+        "model": final_name,
+        "best_params": {k: _jsonable(v) for k, v in best_params.items()},
+        "scoring": scoring,
+        "test_metrics": final_metrics,
+        "comparison": results,
+        "timings": timings,
+        "settings": {
+            "snapshot": os.path.abspath(snapshot_path),
+            "rows": len(df),
+            "seed": seed,
+            "test_size": test_size,
+            "cv": cv,
+            "n_jobs": n_jobs,
+            "backend": backend,
+            "cached_transforms": memory is not None,
+        },
+        "versions": {
+            "python": platform.python_version(),
+            "scikit-learn": sklearn.__version__,
+            "xgboost": xgb.__version__,
+            "numpy": np.__version__,
+            "pandas": pd.__version__,
+        },
+        "created_at": datetime.utcnow().isoformat(),
+    }
+    with open(f"{stem}.json", "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    logger.info(
+        f"Saved {stem}.pkl ({scoring}={final_metrics[scoring]:.4f}) "
+        f"in {timings['total_seconds']:.1f}s"
+    )
+    return report
+
+
+def _jsonable(value: Any) -> Any:
+    return list(value) if isinstance(value, tuple) else value
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    parser = argparse.ArgumentParser(
+        description="Compare, tune and save the pathogenicity models from ml/train.ipynb"
+    )
+    parser.add_argument("--snapshot", default=DEFAULT_SNAPSHOT_PATH)
+    parser.add_argument("--output-dir", default=DEFAULT_OUTPUT_DIR)
+    parser.add_argument(
+        "--models",
+        nargs="+",
+        choices=tuple(MODELS),
+        default=list(MODELS),
+        help="Models to compare (default: all).",
+    )
+    parser.add_argument(
+        "--tune",
+        default="best",
+        help="Model to grid-search: 'best' (by --scoring), a model name, or 'none'.",
+    )
+    parser.add_argument(
+        "--n-jobs", type=int, default=-1, help="Parallel joblib jobs (-1 = all cores)."
+    )
+    parser.add_argument("--backend", choices=JOBLIB_BACKENDS, default="loky")
+    parser.add_argument(
+        "--cache-dir",
+        default=os.path.join(tempfile.gettempdir(), "bacteria_train_cache"),
+        help="Pipeline memory for fitted preprocessors, reused across models and runs.",
+    )
+    parser.add_argument(
+        "--no-cache", action="store_true", help="Refit the preprocessor every time."
+    )
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--test-size", type=float, default=0.2)
+    parser.add_argument("--cv", type=int, default=3)
+    parser.add_argument("--scoring", choices=tuple(SCORERS), default="recall")
+    args = parser.parse_args()
+
+    if args.tune not in ("best", "none") and args.tune not in MODELS:
+        parser.error(f"--tune must be 'best', 'none' or one of {', '.join(MODELS)}")
+
+    train(
+        snapshot_path=args.snapshot,
+        output_dir=args.output_dir,
+        models=args.models,
+        n_jobs=args.n_jobs,
+        backend=args.backend,
+        cache_dir=None if args.no_cache else args.cache_dir,
+        seed=args.seed,
+        test_size=args.test_size,
+        cv=args.cv,
+        scoring=args.scoring,
+        tune=None if args.tune == "none" else args.tune,
+    )
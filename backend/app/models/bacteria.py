@@ -1,7 +1,17 @@
 from datetime import datetime
 
 from app.db.session import Base
-from sqlalchemy import Boolean, Column, DateTime, Float, Integer, String, Text
+from sqlalchemy import (
+    Boolean,
+    Column,
+    DateTime,
+    Float,
+    ForeignKey,
+    Integer,
+    String,
+    Text,
+    UniqueConstraint,
+)
 
 
 class Bacteria(Base):
@@ -53,3 +63,56 @@ class ScrapeLog(Base):
     error_message = Column(Text, nullable=True)
     source = Column(String(100), default="mimedb_live")
     created_at = Column(DateTime, default=datetime.utcnow)
+
+
+class ScrapeCheckpoint(Base):
+    """Per-ID outcome journal of a scrape run, used to resume interrupted crawls."""
+
+    __tablename__ = "scrape_checkpoints"
+    __table_args__ = (UniqueConstraint("run_id", "bacteria_id"),)
+
+    id = Column(Integer, primary_key=True, index=True)
+    run_id = Column(
+        Integer, ForeignKey("scrape_logs.id", ondelete="CASCADE"), index=True
+    )
+    bacteria_id = Column(String(50), nullable=False)
+    status = Column(String(20), nullable=False)
+    error_message = Column(Text, nullable=True)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+
+class ScrapeMetric(Base):
+    """
+    A counter or histogram recorded by the scraper for one run. Histograms
+    keep their log-bucket counts (JSON) so sessions of a resumed run merge;
+    p50/p90/p99 are stored alongside for querying.
+    """
+
+    __tablename__ = "scrape_metrics"
+    __table_args__ = (UniqueConstraint("run_id", "name"),)
+
+    id = Column(Integer, primary_key=True, index=True)
+    run_id = Column(
+        Integer, ForeignKey("scrape_logs.id", ondelete="CASCADE"), index=True
+    )
+    name = Column(String(100), nullable=False)
+    kind = Column(String(20), nullable=False)
+    count = Column(Integer, nullable=True)
+    total = Column(Float, nullable=True)
+    min_value = Column(Float, nullable=True)
+    max_value = Column(Float, nullable=True)
+    p50 = Column(Float, nullable=True)
+    p90 = Column(Float, nullable=True)
+    p99 = Column(Float, nullable=True)
+    buckets = Column(Text, nullable=True)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+
+class BacteriaSyncState(Base):
+    """Content hash of each row as last loaded from the CSV, used by delta sync."""
+
+    __tablename__ = "bacteria_sync_state"
+
+    bacteria_id = Column(String(50), primary_key=True)
+    content_hash = Column(String(32), nullable=False)
+    synced_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
@@ -1,8 +1,10 @@
 import math
 from datetime import datetime
-from typing import List, Optional
+from typing import List, Optional, Union
 
-from pydantic import BaseModel, ConfigDict, Field, field_serializer
+from pydantic import BaseModel, ConfigDict, Field, field_serializer, model_validator
+
+MAX_LOOKUP_KEYS = 5000
 
 
 def serialize_float_to_json_safe(value: Optional[float]) -> Optional[float]:
@@ -108,8 +110,32 @@ class BacteriaPredictionResponseDataSchema(BaseModel):
     input_bacteria: BacteriaPredictionInputSchema
     is_pathogen_prediction: bool
     pathogen_probability: float
+    model_stage: Optional[str] = None
     similar_bacteria: List[SimilarBacteriaInfoSchema] = []
 
     @field_serializer("pathogen_probability", when_used="json")
     def serialize_patho_prob(self, value: Optional[float]):
         return serialize_float_to_json_safe(value)
+
+
+class BacteriaLookupRequestSchema(BaseModel):
+    bacteria_ids: List[str] = Field(default_factory=list, max_length=MAX_LOOKUP_KEYS)
+    ids: List[int] = Field(default_factory=list, max_length=MAX_LOOKUP_KEYS)
+
+    @model_validator(mode="after")
+    def check_exactly_one_key_list(self):
+        if bool(self.bacteria_ids) == bool(self.ids):
+            raise ValueError("Provide exactly one of 'bacteria_ids' or 'ids'.")
+        return self
+
+
+class BacteriaLookupResultSchema(BaseModel):
+    key: Union[int, str]
+    found: bool
+    bacteria: Optional[BacteriaResponseSchema] = None
+
+
+class BacteriaLookupResponseDataSchema(BaseModel):
+    results: List[BacteriaLookupResultSchema] = []
+    found_count: int
+    missing_count: int
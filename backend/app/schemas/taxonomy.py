@@ -0,0 +1,22 @@
+from typing import List, Optional
+
+from pydantic import BaseModel
+
+
+class TaxonomyChildSchema(BaseModel):
+    rank: str
+    value: str
+    lineage: List[str] = []
+    count: int
+    pathogen_count: int
+    has_children: bool
+
+
+class TaxonomyNodeSchema(BaseModel):
+    rank: str
+    value: str
+    lineage: List[str] = []
+    count: int
+    pathogen_count: int
+    child_rank: Optional[str] = None
+    children: List[TaxonomyChildSchema] = []
@@ -0,0 +1,263 @@
+import logging
+import threading
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from app.core.config import settings
+from app.models.bacteria import Bacteria
+from sqlalchemy import func
+from sqlalchemy.orm import Session as SQLAlchemySession
+
+logger = logging.getLogger(__name__)
+
+TAXONOMY_RANKS: List[str] = [
+    "superkingdom",
+    "phylum",
+    "class_name",
+    "order",
+    "family",
+    "genus",
+    "species",
+]
+ROOT_RANK = "root"
+ROOT_VALUE = "root"
+UNCLASSIFIED = "Unclassified"
+
+TaxonomyPath = Tuple[Tuple[str, ...], bool]
+# Rank values from superkingdom down to a node, identifying it in the tree.
+Lineage = Tuple[str, ...]
+# (row count, max(updated_at)) of the bacteria table.
+TableFingerprint = Tuple[int, Optional[datetime]]
+
+
+class TaxonomyNode:
+    __slots__ = ("rank", "value", "path", "count", "pathogen_count", "children")
+
+    def __init__(self, rank: str, value: str, path: Lineage):
+        self.rank = rank
+        self.value = value
+        self.path = path
+        self.count = 0
+        self.pathogen_count = 0
+        self.children: Dict[str, "TaxonomyNode"] = {}
+
+
+def taxonomy_path(bacteria: Any) -> TaxonomyPath:
+    """Extracts the rank values and pathogen flag from an ORM row or a dict."""
+    getter = (
+        bacteria.get
+        if isinstance(bacteria, dict)
+        else (lambda key: getattr(bacteria, key, None))
+    )
+    values = []
+    for rank in TAXONOMY_RANKS:
+        value = getter(rank)
+        value = str(value).strip() if value is not None else ""
+        values.append(value or UNCLASSIFIED)
+    return tuple(values), bool(getter("is_pathogen"))
+
+
+class TaxonomyIndex:
+    """
+    In-memory superkingdom -> species tree with per-subtree counts.
+
+    Built from the bacteria table on first use and kept current by the
+    write handlers, so expanding a node costs O(children) instead of a
+    GROUP BY over the whole table. A node is identified by its full path
+    (the values from superkingdom down), so a value that shows up under
+    several parents (e.g. family "Unclassified") is a separate node with its
+    own counts under each; ``find_paths`` lists them for a (rank, value).
+
+    Bulk loads, ``--sync`` and the scraper write the table from other
+    processes, so at most every ``check_interval`` seconds the table's row
+    count and latest ``updated_at`` are compared with those the index was
+    built from (advanced by the handlers' own writes), and the index is
+    rebuilt when they differ.
+    """
+
+    def __init__(self, check_interval: float = 5.0):
+        self.check_interval = check_interval
+        self._lock = threading.RLock()
+        self._built = False
+        self._root = TaxonomyNode(ROOT_RANK, ROOT_VALUE, ())
+        self._paths: Dict[Tuple[str, str], Set[Lineage]] = {}
+        self._fingerprint: Optional[TableFingerprint] = None
+        self._checked_at = 0.0
+
+    @property
+    def is_built(self) -> bool:
+        return self._built
+
+    @staticmethod
+    def table_fingerprint(db: SQLAlchemySession) -> TableFingerprint:
+        count, latest = db.query(
+            func.count(Bacteria.id), func.max(Bacteria.updated_at)
+        ).one()
+        return count, latest
+
+    def _is_fresh(self) -> bool:
+        return self._built and time.monotonic() - self._checked_at < self.check_interval
+
+    def ensure_built(self, db: SQLAlchemySession) -> None:
+        if self._is_fresh():
+            return
+        with self._lock:
+            if self._is_fresh():
+                return
+            fingerprint = self.table_fingerprint(db)
+            self._checked_at = time.monotonic()
+            if self._built and fingerprint == self._fingerprint:
+                return
+            if self._built:
+                logger.info(
+                    "Bacteria table changed outside the API; rebuilding the taxonomy index."
+                )
+            self.rebuild(db, fingerprint)
+
+    def rebuild(
+        self, db: SQLAlchemySession, fingerprint: Optional[TableFingerprint] = None
+    ) -> None:
+        # Taken before the scan: a write landing during it makes the next
+        # check see a difference and rebuild again rather than be missed.
+        if fingerprint is None:
+            fingerprint = self.table_fingerprint(db)
+        columns = [getattr(Bacteria, rank) for rank in TAXONOMY_RANKS]
+        rows = db.query(*columns, Bacteria.is_pathogen).yield_per(5000)
+        with self._lock:
+            self._root = TaxonomyNode(ROOT_RANK, ROOT_VALUE, ())
+            self._paths = {}
+            total = 0
+            for row in rows:
+                values = tuple(
+                    (str(v).strip() if v is not None else "") or UNCLASSIFIED
+                    for v in row[:-1]
+                )
+                self._apply((values, bool(row[-1])), 1)
+                total += 1
+            self._fingerprint = fingerprint
+            self._checked_at = time.monotonic()
+            self._built = True
+        logger.info(
+            f"Taxonomy index built from {total} rows "
+            f"({sum(len(paths) for paths in self._paths.values())} nodes)."
+        )
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._built = False
+            self._fingerprint = None
+            self._root = TaxonomyNode(ROOT_RANK, ROOT_VALUE, ())
+            self._paths = {}
+
+    def _note_write(self, row_delta: int, updated_at: Optional[datetime]) -> None:
+        """Advances the fingerprint by a write the index has already applied."""
+        if self._fingerprint is None:
+            return
+        count, latest = self._fingerprint
+        if updated_at is not None and (latest is None or updated_at > latest):
+            latest = updated_at
+        self._fingerprint = (count + row_delta, latest)
+
+    def add(self, path: TaxonomyPath, updated_at: Optional[datetime] = None) -> None:
+        with self._lock:
+            if self._built:
+                self._apply(path, 1)
+                self._note_write(1, updated_at)
+
+    def remove(self, path: TaxonomyPath) -> None:
+        # Deleting the most recently updated row lowers max(updated_at), which
+        # costs one rebuild at the next check.
+        with self._lock:
+            if self._built:
+                self._apply(path, -1)
+                self._note_write(-1, None)
+
+    def replace(
+        self,
+        old_path: TaxonomyPath,
+        new_path: TaxonomyPath,
+        updated_at: Optional[datetime] = None,
+    ) -> None:
+        with self._lock:
+            if self._built:
+                if old_path != new_path:
+                    self._apply(old_path, -1)
+                    self._apply(new_path, 1)
+                self._note_write(0, updated_at)
+
+    def _apply(self, path: TaxonomyPath, delta: int) -> None:
+        values, is_pathogen = path
+        pathogen_delta = delta if is_pathogen else 0
+
+        parent = self._root
+        parent.count += delta
+        parent.pathogen_count += pathogen_delta
+        for rank, value in zip(TAXONOMY_RANKS, values):
+            node = parent.children.get(value)
+            if node is None:
+                node = parent.children[value] = TaxonomyNode(
+                    rank, value, parent.path + (value,)
+                )
+                self._paths.setdefault((rank, value), set()).add(node.path)
+            node.count += delta
+            node.pathogen_count += pathogen_delta
+            if node.count <= 0:
+                # Its descendants reach zero too as the walk continues.
+                del parent.children[value]
+                paths = self._paths[(rank, value)]
+                paths.discard(node.path)
+                if not paths:
+                    del self._paths[(rank, value)]
+            parent = node
+
+    def find_paths(self, rank: str, value: str) -> List[Lineage]:
+        """Paths of every node with this rank and value, one per parent lineage."""
+        with self._lock:
+            return sorted(self._paths.get((rank, value), ()))
+
+    def get_node(self, path: Lineage) -> Optional[Dict[str, Any]]:
+        """The node at ``path`` (``()`` for the root) with its children."""
+        with self._lock:
+            node = self._root
+            for value in path:
+                node = node.children.get(value)
+                if node is None:
+                    return None
+            return self._describe(node)
+
+    def _describe(self, node: TaxonomyNode) -> Dict[str, Any]:
+        if node.rank == ROOT_RANK:
+            child_rank = TAXONOMY_RANKS[0]
+        else:
+            rank_index = TAXONOMY_RANKS.index(node.rank)
+            child_rank = (
+                TAXONOMY_RANKS[rank_index + 1]
+                if rank_index + 1 < len(TAXONOMY_RANKS)
+                else None
+            )
+
+        children = [
+            {
+                "rank": child.rank,
+                "value": child.value,
+                "lineage": list(node.path),
+                "count": child.count,
+                "pathogen_count": child.pathogen_count,
+                "has_children": bool(child.children),
+            }
+            for _, child in sorted(node.children.items())
+        ]
+
+        return {
+            "rank": node.rank,
+            "value": node.value,
+            "lineage": list(node.path[:-1]),
+            "count": node.count,
+            "pathogen_count": node.pathogen_count,
+            "child_rank": child_rank,
+            "children": children,
+        }
+
+
+taxonomy_index = TaxonomyIndex(check_interval=settings.TAXONOMY_INDEX_CHECK_SECONDS)
@@ -0,0 +1,4 @@
+import os
+
+# app.db.session builds its engine at import time; tests bring their own.
+os.environ.setdefault("DATABASE_URL", "sqlite://")
@@ -0,0 +1,114 @@
+import time
+
+import pytest
+from app.core.cache import (
+    LRUCacheBackend,
+    ReadThroughCache,
+    RedisCacheBackend,
+    bacteria_cache_keys,
+)
+
+fakeredis = pytest.importorskip("fakeredis")
+
+ROW = {"id": 1, "bacteria_id": "MMDBm0000001", "name": "Escherichia coli"}
+
+
+@pytest.fixture
+def server():
+    return fakeredis.FakeServer()
+
+
+def redis_cache(server, ttl_seconds=None) -> ReadThroughCache:
+    client = fakeredis.FakeRedis(server=server)
+    return ReadThroughCache(RedisCacheBackend(client, ttl_seconds=ttl_seconds))
+
+
+def fill(cache: ReadThroughCache, row=ROW, generation=None) -> None:
+    if generation is None:
+        generation = cache.generation()
+    keys = bacteria_cache_keys(obj_id=row["id"], bacteria_id=row["bacteria_id"])
+    cache.set_many({key: row for key in keys}, generation)
+
+
+def test_redis_get_set_invalidate(server):
+    cache = redis_cache(server)
+    assert cache.get("bacteria:id:1") is None
+
+    fill(cache)
+    assert cache.get("bacteria:id:1") == ROW
+    assert cache.get("bacteria:bid:MMDBm0000001") == ROW
+
+    cache.invalidate(bacteria_cache_keys(obj_id=1, bacteria_id="MMDBm0000001"))
+    assert cache.get("bacteria:id:1") is None
+    assert cache.get("bacteria:bid:MMDBm0000001") is None
+    assert cache.stats()["hits"] == 2
+    assert cache.stats()["misses"] == 3
+
+
+def test_redis_entries_expire_after_ttl(server):
+    cache = redis_cache(server, ttl_seconds=1)
+    fill(cache)
+    assert cache.get("bacteria:id:1") == ROW
+    time.sleep(1.1)
+    assert cache.get("bacteria:id:1") is None
+
+
+def test_redis_invalidation_is_seen_by_other_workers(server):
+    worker_a = redis_cache(server)
+    worker_b = redis_cache(server)
+    fill(worker_a)
+    assert worker_b.get("bacteria:id:1") == ROW
+
+    worker_b.invalidate(bacteria_cache_keys(obj_id=1, bacteria_id="MMDBm0000001"))
+    assert worker_a.get("bacteria:id:1") is None
+
+
+def test_redis_fill_after_concurrent_invalidation_is_dropped(server):
+    reader = redis_cache(server)
+    writer = redis_cache(server)
+    # The reader misses and takes the generation before reading the row...
+    generation = reader.generation()
+    # ...a writer commits a change and invalidates in the meantime...
+    writer.invalidate(bacteria_cache_keys(obj_id=1, bacteria_id="MMDBm0000001"))
+    # ...so the reader's (now stale) row must not be cached.
+    fill(reader, generation=generation)
+    assert reader.get("bacteria:id:1") is None
+
+    fill(reader)
+    assert reader.get("bacteria:id:1") == ROW
+
+
+def test_redis_clear_keeps_other_prefixes(server):
+    cache = redis_cache(server)
+    other = fakeredis.FakeRedis(server=server)
+    other.set("unrelated", "1")
+    fill(cache)
+    generation = cache.generation()
+
+    cache.clear()
+    assert cache.get("bacteria:id:1") is None
+    assert other.get("unrelated") == b"1"
+    assert cache.generation() > generation
+
+
+def test_lru_fill_after_concurrent_invalidation_is_dropped():
+    cache = ReadThroughCache(LRUCacheBackend(max_items=10))
+    generation = cache.generation()
+    cache.invalidate(["bacteria:id:1"])
+    fill(cache, generation=generation)
+    assert cache.stats()["size"] == 0
+
+    fill(cache)
+    assert cache.get("bacteria:id:1") == ROW
+    assert cache.stats()["size"] == 2
+
+
+def test_lru_evicts_and_expires():
+    backend = LRUCacheBackend(max_items=2, ttl_seconds=0.05)
+    backend.set_many({"a": 1, "b": 2})
+    assert backend.get("a") == 1
+    backend.set_many({"c": 3})
+    assert backend.get("b") is None
+    assert backend.size() == 2
+    time.sleep(0.06)
+    assert backend.get("a") is None
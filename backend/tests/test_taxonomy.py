@@ -0,0 +1,126 @@
+import pytest
+from app.api.deps import get_db
+from app.api.routes import taxonomy as taxonomy_routes
+from app.db.session import Base
+from app.models.bacteria import Bacteria
+from app.services.taxonomy import TaxonomyIndex, taxonomy_index, taxonomy_path
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+# Family "Unclassified" under two different orders.
+ROWS = [
+    ("B1", "Bacillales", None, "Bacillus", True),
+    ("B2", "Bacillales", None, "Bacillus", False),
+    ("B3", "Bacillales", "Listeriaceae", "Listeria", True),
+    ("B4", "Clostridiales", None, "Clostridium", False),
+]
+
+
+@pytest.fixture
+def db():
+    engine = create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    for bacteria_id, order, family, genus, is_pathogen in ROWS:
+        session.add(
+            Bacteria(
+                bacteria_id=bacteria_id,
+                superkingdom="Bacteria",
+                phylum="Firmicutes",
+                class_name="Bacilli",
+                order=order,
+                family=family,
+                genus=genus,
+                is_pathogen=is_pathogen,
+            )
+        )
+    session.commit()
+    yield session
+    session.close()
+
+
+@pytest.fixture
+def index(db):
+    index = TaxonomyIndex(check_interval=0)
+    index.ensure_built(db)
+    return index
+
+
+BACILLALES = ("Bacteria", "Firmicutes", "Bacilli", "Bacillales")
+CLOSTRIDIALES = ("Bacteria", "Firmicutes", "Bacilli", "Clostridiales")
+
+
+def test_same_value_under_two_parents_stays_separate(index):
+    assert index.find_paths("family", "Unclassified") == [
+        BACILLALES + ("Unclassified",),
+        CLOSTRIDIALES + ("Unclassified",),
+    ]
+
+    node = index.get_node(BACILLALES + ("Unclassified",))
+    assert node["lineage"] == list(BACILLALES)
+    assert (node["count"], node["pathogen_count"]) == (2, 1)
+    assert [child["value"] for child in node["children"]] == ["Bacillus"]
+
+    node = index.get_node(CLOSTRIDIALES + ("Unclassified",))
+    assert (node["count"], node["pathogen_count"]) == (1, 0)
+    assert [child["value"] for child in node["children"]] == ["Clostridium"]
+
+
+def test_incremental_updates_touch_only_their_lineage(db, index):
+    row = db.query(Bacteria).filter(Bacteria.bacteria_id == "B4").one()
+    index.remove(taxonomy_path(row))
+    assert index.find_paths("family", "Unclassified") == [
+        BACILLALES + ("Unclassified",)
+    ]
+    assert index.get_node(CLOSTRIDIALES) is None
+    assert index.get_node(BACILLALES + ("Unclassified",))["count"] == 2
+
+    index.add(taxonomy_path(row))
+    assert index.get_node(CLOSTRIDIALES + ("Unclassified",))["count"] == 1
+    assert index.get_node(())["count"] == len(ROWS)
+
+
+@pytest.fixture
+def client(db, monkeypatch):
+    monkeypatch.setattr(taxonomy_index, "check_interval", 0)
+    taxonomy_index.invalidate()
+    app = FastAPI()
+    app.include_router(taxonomy_routes.router, prefix="/api/taxonomy")
+    app.dependency_overrides[get_db] = lambda: db
+    yield TestClient(app)
+    taxonomy_index.invalidate()
+
+
+def test_children_route_needs_lineage_for_ambiguous_values(client):
+    response = client.get("/api/taxonomy/family/Unclassified/children")
+    assert response.status_code == 409
+    assert "Bacillales" in response.json()["detail"]
+
+    response = client.get(
+        "/api/taxonomy/family/Unclassified/children",
+        params={"lineage": list(CLOSTRIDIALES)},
+    )
+    assert response.status_code == 200
+    data = response.json()["data"]
+    assert data["count"] == 1
+    assert [child["value"] for child in data["children"]] == ["Clostridium"]
+    assert data["children"][0]["lineage"] == list(CLOSTRIDIALES) + ["Unclassified"]
+
+    response = client.get(
+        "/api/taxonomy/family/Unclassified/children", params={"lineage": ["Bacteria"]}
+    )
+    assert response.status_code == 400
+
+
+def test_children_route_resolves_unambiguous_values(client):
+    response = client.get("/api/taxonomy/family/Listeriaceae/children")
+    assert response.status_code == 200
+    assert response.json()["data"]["lineage"] == list(BACILLALES)
+
+    response = client.get("/api/taxonomy/family/Nope/children")
+    assert response.status_code == 404
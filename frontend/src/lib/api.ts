@@ -32,6 +32,7 @@ export interface PaginationParams {
   is_pathogen?: boolean;
   gram_stain?: string;
   phylum?: string;
+  fields?: string;
 }
 
 export interface BacteriaStats {
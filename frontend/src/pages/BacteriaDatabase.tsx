@@ -48,6 +48,7 @@ const BacteriaDatabase = () => {
         is_pathogen: isPathogen,
         gram_stain: filterData.gramStain || undefined,
         phylum: filterData.phylum || undefined,
+        fields: "bacteria_id,name,gram_stain,shape,phylum,is_pathogen",
       };
       const response = await bacteriaService.getBacteriaList(params);
       if (response.success && response.data) {
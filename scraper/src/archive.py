@@ -0,0 +1,88 @@
+import hashlib
+import json
+import logging
+import os
+import time
+from typing import Dict, Iterator, Optional, Tuple
+from urllib.parse import urlsplit
+
+logger = logging.getLogger(__name__)
+
+INDEX_FILE = "index.jsonl"
+
+
+def archive_key(url: str) -> str:
+    """Path and query of a URL, so an archive replays under any base URL."""
+    parts = urlsplit(url)
+    return f"{parts.path}?{parts.query}" if parts.query else parts.path
+
+
+class PageArchive:
+    """
+    Directory of pages captured during a crawl, for replay by the stand-in
+    server. Bodies are stored as ``pages/<sha1>.html`` and ``index.jsonl``
+    gets one line per stored page; the last line for a key wins, so a
+    re-recorded page replaces the old one and an interrupted recording
+    keeps everything written so far.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self.pages_dir = os.path.join(directory, "pages")
+        os.makedirs(self.pages_dir, exist_ok=True)
+        self.index_path = os.path.join(directory, INDEX_FILE)
+        self.stored = 0
+
+    def _body_path(self, key: str) -> str:
+        digest = hashlib.sha1(key.encode("utf-8")).hexdigest()
+        return os.path.join(self.pages_dir, f"{digest}.html")
+
+    def store(self, url: str, body: str) -> None:
+        key = archive_key(url)
+        body_path = self._body_path(key)
+        tmp_path = f"{body_path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(body)
+        os.replace(tmp_path, body_path)
+        entry = {
+            "key": key,
+            "file": os.path.basename(body_path),
+            "recorded_at": time.time(),
+        }
+        with open(self.index_path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(entry) + "\n")
+        self.stored += 1
+
+    def index(self) -> Dict[str, str]:
+        """Archive key -> body file name."""
+        entries: Dict[str, str] = {}
+        try:
+            with open(self.index_path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        logger.warning(f"Skipping corrupt line in {self.index_path}")
+                        continue
+                    entries[entry["key"]] = entry["file"]
+        except FileNotFoundError:
+            pass
+        return entries
+
+    def load(self, key: str, file_name: Optional[str] = None) -> Optional[str]:
+        path = (
+            os.path.join(self.pages_dir, file_name)
+            if file_name
+            else self._body_path(key)
+        )
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def pages(self) -> Iterator[Tuple[str, str]]:
+        for key, file_name in self.index().items():
+            body = self.load(key, file_name)
+            if body is not None:
+                yield key, body
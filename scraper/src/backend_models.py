@@ -0,0 +1,22 @@
+import logging
+import os
+import sys
+
+SCRAPER_SRC_ROOT = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(os.path.dirname(SCRAPER_SRC_ROOT))
+sys.path.insert(0, PROJECT_ROOT)
+try:
+    from backend.app.models.bacteria import (
+        Bacteria,
+        ScrapeCheckpoint,
+        ScrapeLog,
+        ScrapeMetric,
+    )
+except ImportError:
+    logging.error(
+        "Could not import backend.app.models. Scraper save and run tracking will be problematic."
+    )
+    Bacteria = None
+    ScrapeCheckpoint = None
+    ScrapeLog = None
+    ScrapeMetric = None
@@ -0,0 +1,106 @@
+import argparse
+import glob
+import logging
+import os
+import time
+from typing import Dict, List, Tuple
+
+from src.scrapers.extractors import EXTRACTORS, SoupExtractor, get_extractor
+
+logger = logging.getLogger(__name__)
+
+FIXTURES_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "fixtures", "mimedb"
+)
+
+
+def load_pages(directories: List[str]) -> List[Tuple[str, str]]:
+    """
+    (bacteria_id, html) for every ``*.html`` under the directories, e.g. the
+    bundled fixtures or a scraper page cache. The ID is the file name stem.
+    """
+    pages = []
+    for directory in directories:
+        pattern = os.path.join(directory, "**", "*.html")
+        for path in sorted(glob.glob(pattern, recursive=True)):
+            with open(path, "r", encoding="utf-8") as f:
+                pages.append((os.path.splitext(os.path.basename(path))[0], f.read()))
+    return pages
+
+
+def _records_equal(expected: Dict, actual: Dict) -> bool:
+    # Compare types too: True == 1 and 37 == 37.0 would hide a changed column type.
+    return expected.keys() == actual.keys() and all(
+        type(expected[k]) is type(actual[k]) and expected[k] == actual[k]
+        for k in expected
+    )
+
+
+def check_equivalence(pages: List[Tuple[str, str]]) -> Dict[str, List[str]]:
+    """Pages on which each extractor's dict differs from the BeautifulSoup one."""
+    reference = SoupExtractor()
+    mismatches: Dict[str, List[str]] = {}
+    for name in EXTRACTORS:
+        extractor = get_extractor(name)
+        mismatches[name] = []
+        for bacteria_id, html in pages:
+            expected = reference.extract(bacteria_id, html)
+            actual = extractor.extract(bacteria_id, html)
+            if not _records_equal(expected, actual):
+                mismatches[name].append(bacteria_id)
+                logger.warning(
+                    f"{name} differs on {bacteria_id}:\n  expected {expected}\n  got      {actual}"
+                )
+    return mismatches
+
+
+def time_extractor(name: str, pages: List[Tuple[str, str]], repeat: int) -> float:
+    """Pages per second on one core, over ``repeat`` passes through ``pages``."""
+    extractor = get_extractor(name)
+    started = time.perf_counter()
+    for _ in range(repeat):
+        for bacteria_id, html in pages:
+            extractor.extract(bacteria_id, html)
+    return repeat * len(pages) / (time.perf_counter() - started)
+
+
+def run_benchmark(directories: List[str], repeat: int) -> bool:
+    pages = load_pages(directories)
+    if not pages:
+        raise SystemExit(f"No .html pages found in {', '.join(directories)}")
+    total_kb = sum(len(html) for _, html in pages) / 1024
+
+    mismatches = check_equivalence(pages)
+    rates = {name: time_extractor(name, pages, repeat) for name in EXTRACTORS}
+    baseline = rates[SoupExtractor.name]
+
+    lines = [
+        f"Parsing benchmark ({len(pages)} pages, {total_kb:.0f} KB, {repeat} passes):"
+    ]
+    for name, rate in rates.items():
+        lines.append(
+            f"  {name}: {rate:,.0f} pages/s ({rate / baseline:.1f}x), "
+            f"matches soup on {len(pages) - len(mismatches[name])}/{len(pages)} pages"
+        )
+    logger.info("\n".join(lines))
+    return not any(mismatches.values())
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    parser = argparse.ArgumentParser(
+        description="Compare MiMeDB detail-page extractors for speed and identical output"
+    )
+    parser.add_argument(
+        "--pages",
+        action="append",
+        default=None,
+        help="Directory of saved .html pages (repeatable). Defaults to the bundled fixtures.",
+    )
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    if not run_benchmark(args.pages or [FIXTURES_DIR], args.repeat):
+        raise SystemExit(
+            "An extractor's output differs from the BeautifulSoup extractor."
+        )
@@ -0,0 +1,206 @@
+import argparse
+import logging
+import math
+import os
+import signal
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+SCRAPER_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return float("nan")
+    ordered = sorted(values)
+    return ordered[
+        min(len(ordered) - 1, max(0, math.ceil(pct / 100 * len(ordered)) - 1))
+    ]
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _wait_for_port(port: int, process: subprocess.Popen, timeout: float = 30.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise SystemExit("The stand-in server exited during startup.")
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=0.5):
+                return
+        except OSError:
+            time.sleep(0.1)
+    raise SystemExit(f"The stand-in server did not start listening on port {port}.")
+
+
+def start_standin(args, port: int) -> subprocess.Popen:
+    """Runs the stand-in in its own process so it does not share the crawler's GIL."""
+    command = [
+        sys.executable,
+        "-m",
+        "src.standin",
+        "--port",
+        str(port),
+        "--latency",
+        str(args.latency),
+        "--jitter",
+        str(args.jitter),
+        "--error-rate",
+        str(args.error_rate),
+        "--error-status",
+        str(args.error_status),
+        "--capacity",
+        str(args.capacity),
+        "--retry-after",
+        str(args.retry_after),
+        "--seed",
+        "0",
+    ]
+    if args.archive:
+        command += ["--archive", args.archive]
+    else:
+        command += ["--synthetic", str(args.synthetic)]
+    process = subprocess.Popen(command, cwd=SCRAPER_ROOT)
+    _wait_for_port(port, process)
+    return process
+
+
+def report(stats: Dict, wall_seconds: float) -> str:
+    elapsed = stats["elapsed"]
+    records = stats["successful"] + stats["unchanged"]
+    latencies = stats["fetch_latencies"]
+    write_seconds = stats["write_seconds"]
+    lines = [
+        f"Scrape benchmark (run {stats['run_id']}):",
+        f"  IDs discovered: {stats['discovered']}, saved: {stats['successful']}, "
+        f"unchanged: {stats['unchanged']}, failed: {stats['failed']}",
+        f"  crawl time: {elapsed:.2f}s (wall incl. setup {wall_seconds:.2f}s)",
+        f"  throughput: {records / elapsed:,.1f} records/s",
+        f"  HTTP requests: {len(latencies)}, latency p50 {percentile(latencies, 50) * 1000:.1f} ms, "
+        f"p99 {percentile(latencies, 99) * 1000:.1f} ms",
+    ]
+    if stats.get("rates"):
+        lines.append(
+            "  final request rate: "
+            + ", ".join(f"{host} {rate:.1f}/s" for host, rate in stats["rates"].items())
+        )
+    if write_seconds:
+        lines.append(
+            f"  DB writes: {stats['successful'] / write_seconds:,.0f} rows/s while writing, "
+            f"{write_seconds:.2f}s busy ({write_seconds / elapsed:.0%} of crawl time)"
+        )
+    else:
+        lines.append(
+            "  DB writes: inline (use --write-batch-size > 1 to time the writer)"
+        )
+    return "\n".join(lines)
+
+
+def run_benchmark(args) -> Optional[Dict]:
+    # src.db reads DATABASE_URL on import, so it has to be set first.
+    os.environ["DATABASE_URL"] = args.database_url
+    from src.backend_models import Bacteria
+    from src.db import engine
+    from src.main import run_scraper
+
+    if not args.verbose:
+        logging.getLogger("src").setLevel(logging.WARNING)
+        logging.getLogger("httpx").setLevel(logging.WARNING)
+    Bacteria.metadata.create_all(engine)
+
+    port = args.port or _free_port()
+    standin = start_standin(args, port)
+    try:
+        started = time.perf_counter()
+        stats = run_scraper(
+            max_pages=args.max_pages,
+            max_bacteria_per_page=0,
+            delay=args.retry_delay,
+            engine="async",
+            concurrency=args.concurrency,
+            rate=args.rate,
+            base_url=f"http://127.0.0.1:{port}",
+            cache_dir=args.cache_dir,
+            write_batch_size=args.write_batch_size,
+            extractor=args.extractor,
+            parse_workers=args.parse_workers,
+            save_workers=args.save_workers,
+            discovery_workers=args.discovery_workers,
+            adaptive=not args.fixed_rate,
+            min_rate=args.min_rate,
+            max_rate=args.max_rate,
+        )
+        wall_seconds = time.perf_counter() - started
+    finally:
+        standin.send_signal(signal.SIGINT)
+        standin.wait(timeout=10)
+
+    if stats is not None:
+        logger.info(report(stats, wall_seconds))
+    return stats
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    parser = argparse.ArgumentParser(
+        description="Benchmark a full scrape against the local stand-in server"
+    )
+    source = parser.add_argument_group("stand-in server")
+    source.add_argument("--archive", default=None, help="Replay a recorded archive.")
+    source.add_argument(
+        "--synthetic",
+        type=int,
+        default=1000,
+        help="Without --archive, serve this many pages cloned from the fixtures.",
+    )
+    source.add_argument("--latency", type=float, default=0.05)
+    source.add_argument("--jitter", type=float, default=0.02)
+    source.add_argument("--error-rate", type=float, default=0.0)
+    source.add_argument("--error-status", type=int, default=503)
+    source.add_argument(
+        "--capacity",
+        type=float,
+        default=0.0,
+        help="Requests/s the stand-in serves before answering 429 (0 = unlimited).",
+    )
+    source.add_argument("--retry-after", type=int, default=1)
+    source.add_argument("--port", type=int, default=0, help="0 picks a free port.")
+
+    crawl = parser.add_argument_group("scraper")
+    crawl.add_argument("--max-pages", type=int, default=1000)
+    crawl.add_argument("--concurrency", type=int, default=16)
+    crawl.add_argument("--rate", type=float, default=200.0)
+    crawl.add_argument("--min-rate", type=float, default=0.5)
+    crawl.add_argument("--max-rate", type=float, default=None)
+    crawl.add_argument("--fixed-rate", action="store_true")
+    crawl.add_argument("--discovery-workers", type=int, default=4)
+    crawl.add_argument("--parse-workers", type=int, default=1)
+    crawl.add_argument("--save-workers", type=int, default=1)
+    crawl.add_argument("--write-batch-size", type=int, default=200)
+    crawl.add_argument("--extractor", default="lxml")
+    crawl.add_argument("--retry-delay", type=float, default=0.2)
+    crawl.add_argument(
+        "--cache-dir",
+        default=None,
+        help="Use a conditional-GET cache (a second run then measures revalidation).",
+    )
+    crawl.add_argument(
+        "--database-url",
+        default=f"sqlite:///{os.path.join(tempfile.gettempdir(), 'scraper_benchmark.db')}",
+        help="Database the benchmark writes to. Defaults to a throwaway SQLite file.",
+    )
+    parser.add_argument("--verbose", action="store_true")
+    args = parser.parse_args()
+
+    if run_benchmark(args) is None:
+        raise SystemExit("The benchmark scrape failed; see the log above.")
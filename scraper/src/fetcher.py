@@ -0,0 +1,220 @@
+import asyncio
+import logging
+import time
+from typing import Dict, List, Optional
+from urllib.parse import urlsplit
+
+import httpx
+from src.archive import PageArchive
+from src.http_cache import Page, PageCache
+from src.metrics import RunMetrics
+from src.rate_control import (
+    AimdRateController,
+    is_congestion_status,
+    parse_retry_after,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class TokenBucket:
+    """
+    Async token bucket: ``rate`` tokens per second, up to ``burst`` banked.
+    Waiters are served in arrival order because they queue on one lock.
+    With a controller, its current rate is used and its Retry-After pauses
+    are honoured; the bucket restarts empty after a pause.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        burst: int = 1,
+        controller: Optional[AimdRateController] = None,
+    ):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = rate
+        self.burst = max(1, burst)
+        self.controller = controller
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                if self.controller is not None:
+                    pause = self.controller.paused_until - now
+                    if pause > 0:
+                        await asyncio.sleep(pause)
+                        self._tokens = 0.0
+                        self._updated = time.monotonic()
+                        continue
+                    self.rate = self.controller.rate
+                self._tokens = min(
+                    self.burst, self._tokens + (now - self._updated) * self.rate
+                )
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+class AsyncFetcher:
+    """
+    Fetches pages over one pooled httpx.AsyncClient. At most ``concurrency``
+    requests are in flight, and each host is limited to ``rate`` requests per
+    second by its own token bucket, so crawl time is set by the politeness
+    budget rather than by round-trip latency. With ``adaptive`` each host's
+    rate starts at ``rate`` and follows an AimdRateController between
+    ``min_rate`` and ``max_rate``; otherwise it stays fixed. Up to
+    ``retries`` attempts are made per page; with a fixed rate they back off
+    by ``delay * attempt``, while adaptively the lowered rate and any
+    Retry-After pause space them out.
+    With a PageCache, requests are conditional and a 304 is served from disk;
+    a fresh page carries the CacheEntry to commit once its data is saved.
+    With a PageArchive, every page obtained is also recorded for replay.
+    ``latencies`` collects the duration of each HTTP request, and ``metrics``
+    the fetch counters and histograms (requests, bytes, retries, cache hits).
+    """
+
+    def __init__(
+        self,
+        headers: Optional[Dict[str, str]] = None,
+        concurrency: int = 8,
+        rate: float = 5.0,
+        burst: Optional[int] = None,
+        retries: int = 3,
+        delay: float = 2.0,
+        timeout: float = 30.0,
+        cache: Optional[PageCache] = None,
+        archive: Optional[PageArchive] = None,
+        adaptive: bool = True,
+        min_rate: float = 0.5,
+        max_rate: Optional[float] = None,
+        metrics: Optional[RunMetrics] = None,
+    ):
+        self.headers = headers or {}
+        self.concurrency = concurrency
+        self.rate = rate
+        self.adaptive = adaptive
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.burst = burst or concurrency
+        self.retries = retries
+        self.delay = delay
+        self.timeout = timeout
+        self.cache = cache
+        self.archive = archive
+        self.latencies: List[float] = []
+        self.metrics = metrics or RunMetrics()
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._client: Optional[httpx.AsyncClient] = None
+
+    async def __aenter__(self) -> "AsyncFetcher":
+        self._semaphore = asyncio.Semaphore(self.concurrency)
+        self._client = httpx.AsyncClient(
+            headers=self.headers,
+            timeout=self.timeout,
+            follow_redirects=True,
+            limits=httpx.Limits(
+                max_connections=self.concurrency,
+                max_keepalive_connections=self.concurrency,
+            ),
+        )
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self._client.aclose()
+        self._client = None
+
+    def _bucket_for(self, url: str) -> TokenBucket:
+        host = urlsplit(url).netloc
+        bucket = self._buckets.get(host)
+        if bucket is None:
+            controller = (
+                AimdRateController(self.rate, self.min_rate, self.max_rate)
+                if self.adaptive
+                else None
+            )
+            bucket = self._buckets[host] = TokenBucket(
+                self.rate, self.burst, controller
+            )
+        return bucket
+
+    def rates(self) -> Dict[str, float]:
+        """Current request rate per host."""
+        return {host: bucket.rate for host, bucket in self._buckets.items()}
+
+    async def fetch_page(self, url: str) -> Optional[Page]:
+        bucket = self._bucket_for(url)
+        controller = bucket.controller
+        metrics = self.metrics
+        revalidate = self.cache is not None
+        for attempt in range(self.retries):
+            if attempt:
+                metrics.count("fetch.retries")
+                if controller is None:
+                    await asyncio.sleep(self.delay * attempt)
+            await bucket.acquire()
+            try:
+                conditional = self.cache.conditional_headers(url) if revalidate else {}
+                async with self._semaphore:
+                    started = time.perf_counter()
+                    try:
+                        response = await self._client.get(url, headers=conditional)
+                    finally:
+                        latency = time.perf_counter() - started
+                        self.latencies.append(latency)
+                        metrics.count("fetch.requests")
+                        metrics.observe("fetch.latency_seconds", latency)
+                if is_congestion_status(response.status_code):
+                    metrics.count("fetch.throttled")
+                if controller is not None:
+                    if is_congestion_status(response.status_code):
+                        controller.on_congestion(
+                            parse_retry_after(response.headers.get("retry-after"))
+                        )
+                    elif response.status_code < 400:
+                        controller.on_success(latency)
+                if response.status_code != 304:
+                    response.raise_for_status()
+                    metrics.observe("fetch.bytes", len(response.content))
+                if self.cache is None:
+                    page = Page(response.text)
+                else:
+                    page = self.cache.resolve(
+                        url, response.status_code, response.headers, response.text
+                    )
+                if page is not None:
+                    if page.not_modified:
+                        metrics.count("fetch.cache_hits")
+                    if self.archive is not None:
+                        self.archive.store(url, page.text)
+                    return page
+                revalidate = False
+            except httpx.HTTPError as e:
+                metrics.count("fetch.errors")
+                if controller is not None and isinstance(e, httpx.TransportError):
+                    controller.on_congestion()
+                logger.warning(
+                    f"Request to {url} failed (attempt {attempt + 1}/{self.retries}): {e}"
+                )
+        logger.error(f"Failed to fetch {url} after {self.retries} attempts.")
+        metrics.count("fetch.failed_pages")
+        return None
+
+    async def fetch(self, url: str) -> Optional[str]:
+        """
+        The text of ``url``, cached as soon as it arrives. For pages whose
+        data is saved, use fetch_page and commit the entry after the save.
+        """
+        page = await self.fetch_page(url)
+        if page is None:
+            return None
+        if self.cache is not None:
+            self.cache.commit(page.entry)
+        return page.text
@@ -0,0 +1,145 @@
+import hashlib
+import json
+import logging
+import os
+import time
+from typing import Dict, Mapping, NamedTuple, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class CacheEntry(NamedTuple):
+    """A downloaded page and its validators, waiting to be committed to the cache."""
+
+    url: str
+    body: str
+    etag: Optional[str]
+    last_modified: Optional[str]
+
+
+class Page(NamedTuple):
+    text: str
+    not_modified: bool = False
+    # Set for a full download with validators; see PageCache.resolve.
+    entry: Optional[CacheEntry] = None
+
+
+class PageCache:
+    """
+    On-disk response cache keyed by URL, used for conditional GETs. Each entry
+    is a ``<sha1>.html`` body plus a ``<sha1>.json`` sidecar holding the URL,
+    ETag and Last-Modified validators. Only responses that carry a validator
+    are stored, since nothing else can be revalidated.
+
+    A downloaded page is not stored when it arrives: the caller commits its
+    CacheEntry once the page's data has been saved. Otherwise a page whose
+    parse or save failed would be answered with 304 from then on and never
+    be saved.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        self.hits = 0
+        self.stores = 0
+
+    def _paths(self, url: str):
+        key = hashlib.sha1(url.encode("utf-8")).hexdigest()
+        base = os.path.join(self.directory, key[:2], key)
+        return f"{base}.json", f"{base}.html"
+
+    def _load_meta(self, url: str) -> Optional[Dict]:
+        meta_path, _ = self._paths(url)
+        try:
+            with open(meta_path, "r", encoding="utf-8") as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            return None
+        return meta if meta.get("url") == url else None
+
+    def conditional_headers(self, url: str) -> Dict[str, str]:
+        meta = self._load_meta(url)
+        if not meta:
+            return {}
+        headers = {}
+        if meta.get("etag"):
+            headers["If-None-Match"] = meta["etag"]
+        if meta.get("last_modified"):
+            headers["If-Modified-Since"] = meta["last_modified"]
+        return headers
+
+    def load(self, url: str) -> Optional[str]:
+        _, body_path = self._paths(url)
+        try:
+            with open(body_path, "r", encoding="utf-8") as f:
+                body = f.read()
+        except OSError:
+            return None
+        self.hits += 1
+        return body
+
+    def entry(
+        self, url: str, headers: Mapping[str, str], body: str
+    ) -> Optional[CacheEntry]:
+        """The cache entry for a response, or None if it has no validator."""
+        etag = headers.get("etag")
+        last_modified = headers.get("last-modified")
+        if not etag and not last_modified:
+            return None
+        return CacheEntry(url, body, etag, last_modified)
+
+    def discard(self, url: str) -> None:
+        """Drops the validators for ``url`` so its next request is unconditional."""
+        meta_path, _ = self._paths(url)
+        try:
+            os.remove(meta_path)
+        except FileNotFoundError:
+            pass
+
+    def commit(self, entry: Optional[CacheEntry]) -> None:
+        """Stores ``entry`` (if any); call once the page's data has been saved."""
+        if entry is not None:
+            self.store(entry.url, entry.body, entry.etag, entry.last_modified)
+
+    def store(
+        self,
+        url: str,
+        body: str,
+        etag: Optional[str],
+        last_modified: Optional[str],
+    ) -> None:
+        if not etag and not last_modified:
+            return
+        meta_path, body_path = self._paths(url)
+        os.makedirs(os.path.dirname(meta_path), exist_ok=True)
+        meta = {
+            "url": url,
+            "etag": etag,
+            "last_modified": last_modified,
+            "fetched_at": time.time(),
+        }
+        # Drop the old validators before touching the body so a crash midway
+        # leaves an entry without validators, i.e. a plain refetch next time.
+        self.discard(url)
+        for path, content in ((body_path, body), (meta_path, json.dumps(meta))):
+            tmp_path = f"{path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                f.write(content)
+            os.replace(tmp_path, path)
+        self.stores += 1
+
+    def resolve(
+        self, url: str, status_code: int, headers: Mapping[str, str], body: str
+    ) -> Optional[Page]:
+        """
+        Turns a response into a Page: a 304 is served from the cache (or None
+        if the entry vanished); anything else carries the CacheEntry that
+        ``commit`` stores once the page has been saved.
+        """
+        if status_code == 304:
+            cached = self.load(url)
+            if cached is None:
+                logger.warning(f"Got 304 for {url} but no cached body is stored.")
+                return None
+            return Page(cached, not_modified=True)
+        return Page(body, entry=self.entry(url, headers, body))
@@ -1,10 +1,26 @@
 import argparse
+import asyncio
 import logging
+import os
 import sys
 import time
+from concurrent.futures import Executor
+from contextlib import aclosing
+from datetime import timedelta
+from typing import AsyncIterator, Callable, Dict, List, Optional, Set
+from urllib.parse import urlsplit
 
-from src.db import get_scraper_db
-from src.scrapers.mimedb import MimeDBScraper
+from src.archive import PageArchive
+from src.db import SessionLocalScraper, get_scraper_db
+from src.fetcher import AsyncFetcher
+from src.http_cache import PageCache
+from src.metrics import RunMetrics
+from src.pipeline import ScrapePipeline, discover_ids, make_parse_pool
+from src.rate_control import AimdRateController
+from src.runs import RunJournal, recently_updated_ids, unsaved_ids
+from src.scrapers.extractors import DEFAULT_EXTRACTOR, EXTRACTORS
+from src.scrapers.mimedb import FAILED, NOT_MODIFIED, MimeDBScraper, ScrapeResult
+from src.writer import BatchWriter, commit_cache_entry
 
 logging.basicConfig(
     level=logging.INFO,
@@ -16,50 +32,340 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+DEFAULT_CACHE_DIR = os.getenv("SCRAPER_CACHE_DIR", ".http_cache")
+DEFAULT_PARSE_WORKERS = max(1, min(4, (os.cpu_count() or 2) - 1))
 
-def run_scraper(max_pages: int, max_bacteria_per_page: int, delay: float):
+
+def _save(
+    scraper: MimeDBScraper,
+    result: ScrapeResult,
+    counts: Dict[str, int],
+    journal: RunJournal,
+    writer: Optional[BatchWriter] = None,
+) -> None:
+    if result.status == NOT_MODIFIED:
+        counts["unchanged"] += 1
+        journal.record(result.bacteria_id, result.status)
+    elif result.data and writer is not None and "bacteria_id" in result.data:
+        writer.submit(result.data, result.cache_entry)
+        _record_writes(writer, counts, journal)
+    elif result.data and _save_inline(scraper, result.data):
+        if scraper.cache is not None:
+            commit_cache_entry(scraper.cache, result.cache_entry)
+        counts["successful"] += 1
+        journal.record(result.bacteria_id, result.status)
+    else:
+        counts["failed"] += 1
+        error = "save failed" if result.data else "fetch failed"
+        journal.record(result.bacteria_id, FAILED, error)
+
+
+def _save_inline(scraper: MimeDBScraper, data: Dict) -> bool:
+    """Saves one record on the scraper's session, timed as a one-row batch."""
+    scraper.metrics.observe("save.batch_rows", 1)
+    with scraper.metrics.timer("save.batch_seconds"):
+        return scraper.save_bacteria_data(data)
+
+
+def _record_writes(
+    writer: BatchWriter, counts: Dict[str, int], journal: RunJournal
+) -> None:
+    """Journals records only once the batch writer has actually committed them."""
+    for bacteria_id, ok, error in writer.results():
+        if ok:
+            counts["successful"] += 1
+            journal.record(bacteria_id, "ok")
+        else:
+            counts["failed"] += 1
+            journal.record(bacteria_id, FAILED, f"save failed: {error}")
+
+
+def _select_pending(
+    db,
+    bacteria_ids: List[str],
+    skip: Set[str],
+    incremental_hours: Optional[float],
+    counts: Dict[str, int],
+) -> List[str]:
+    """Drops IDs finished earlier in a resumed run and, in incremental mode, fresh rows."""
+    pending = [bid for bid in bacteria_ids if bid not in skip]
+    if incremental_hours is not None and pending:
+        recent = recently_updated_ids(db, pending, timedelta(hours=incremental_hours))
+        pending = [bid for bid in pending if bid not in recent]
+    counts["skipped"] += len(bacteria_ids) - len(pending)
+    return pending
+
+
+def _discard_unsaved(db, scraper: MimeDBScraper, bacteria_ids: List[str]) -> None:
+    """
+    Forgets the cached validators of IDs with no stored row or a failed last
+    outcome, so they are downloaded in full instead of answered with a 304.
+    """
+    for bacteria_id in unsaved_ids(db, bacteria_ids):
+        scraper.cache.discard(scraper.detail_url(bacteria_id))
+
+
+async def _scrape_async(
+    scraper: MimeDBScraper,
+    max_pages: int,
+    id_limit: Optional[int],
+    discovered: List[str],
+    select_pending: Callable[[List[str]], List[str]],
+    concurrency: int,
+    rate: float,
+    discovery_workers: int,
+    counts: Dict[str, int],
+    journal: RunJournal,
+    writer: Optional[BatchWriter] = None,
+    parse_pool: Optional[Executor] = None,
+    parse_workers: int = 1,
+    adaptive: bool = True,
+    min_rate: float = 0.5,
+    max_rate: Optional[float] = None,
+) -> AsyncFetcher:
+    """Runs the async crawl and returns its fetcher (latencies, final rates)."""
+    async with AsyncFetcher(
+        headers=scraper.headers,
+        concurrency=concurrency,
+        rate=rate,
+        delay=scraper.delay,
+        cache=scraper.cache,
+        archive=scraper.archive,
+        adaptive=adaptive,
+        min_rate=min_rate,
+        max_rate=max_rate,
+        metrics=scraper.metrics,
+    ) as fetcher:
+
+        async def pending_ids() -> AsyncIterator[str]:
+            listing = discover_ids(scraper, fetcher, max_pages, discovery_workers)
+            async with aclosing(listing):
+                async for page_ids in listing:
+                    if id_limit is not None:
+                        page_ids = page_ids[: id_limit - len(discovered)]
+                    discovered.extend(page_ids)
+                    for bacteria_id in select_pending(page_ids):
+                        yield bacteria_id
+                    if id_limit is not None and len(discovered) >= id_limit:
+                        logger.info(f"Reached processing limit of {id_limit} bacteria.")
+                        return
+
+        pipeline = ScrapePipeline(scraper, fetcher, parse_pool, parse_workers)
+        done = 0
+        async for result in pipeline.run(pending_ids()):
+            done += 1
+            logger.info(
+                f"Processed ID {done} ({len(discovered)} discovered): {result.bacteria_id} ({result.status})"
+            )
+            _save(scraper, result, counts, journal, writer)
+    return fetcher
+
+
+def run_scraper(
+    max_pages: int,
+    max_bacteria_per_page: int,
+    delay: float,
+    engine: str = "async",
+    concurrency: int = 8,
+    rate: float = 5.0,
+    base_url: Optional[str] = None,
+    cache_dir: Optional[str] = DEFAULT_CACHE_DIR,
+    resume: Optional[str] = None,
+    incremental_hours: Optional[float] = None,
+    write_batch_size: int = 200,
+    flush_seconds: float = 2.0,
+    extractor: str = DEFAULT_EXTRACTOR,
+    parse_workers: int = DEFAULT_PARSE_WORKERS,
+    save_workers: int = 1,
+    discovery_workers: int = 4,
+    archive_dir: Optional[str] = None,
+    adaptive: bool = True,
+    min_rate: float = 0.5,
+    max_rate: Optional[float] = None,
+) -> Optional[Dict]:
+    """
+    Runs one crawl and returns its statistics (counts, elapsed seconds, HTTP
+    latencies, final request rates, DB write time, RunMetrics), or None if the
+    run failed. The metrics are also stored in scrape_metrics for the run, on
+    failure too; `python -m src.run_summary` reports them.
+    With ``adaptive`` the request rate starts at ``rate`` and is raised or
+    lowered between ``min_rate`` and ``max_rate`` as the server responds.
+    """
+    rate_mode = f"adaptive {min_rate}-{max_rate or 4 * rate}/s" if adaptive else "fixed"
     logger.info(
-        f"Starting MimeDB scrape: max_pages={max_pages}, max_bacteria_per_page={max_bacteria_per_page}, delay={delay}s"
+        f"Starting MimeDB scrape: max_pages={max_pages}, max_bacteria_per_page={max_bacteria_per_page}, delay={delay}s, "
+        f"engine={engine}, concurrency={concurrency}, rate={rate}/s ({rate_mode}), extractor={extractor}, "
+        f"parse_workers={parse_workers}, save_workers={save_workers}"
     )
 
     db_session_gen = get_scraper_db()
     db = next(db_session_gen)
 
-    scraper = MimeDBScraper(db_session=db, delay=delay)
+    cache = PageCache(cache_dir) if cache_dir else None
+    metrics = RunMetrics()
+    scraper = MimeDBScraper(
+        db_session=db,
+        delay=delay,
+        base_url=base_url,
+        cache=cache,
+        extractor=extractor,
+        archive=PageArchive(archive_dir) if archive_dir else None,
+        rate_controller=(
+            AimdRateController(rate, min_rate, max_rate)
+            if adaptive and engine == "sync"
+            else None
+        ),
+        metrics=metrics,
+    )
+    source = (
+        "mimedb_live"
+        if scraper.base_url == MimeDBScraper.BASE_URL
+        else f"mimedb:{scraper.base_url}"
+    )
+    journal = RunJournal(db)
+    writer: Optional[BatchWriter] = None
+    parse_pool: Optional[Executor] = None
+    bacteria_ids: List[str] = []
+    counts = {"successful": 0, "unchanged": 0, "failed": 0, "skipped": 0}
+    stats: Optional[Dict] = None
+    started = time.perf_counter()
 
     try:
-        bacteria_ids = scraper.get_bacteria_ids(max_pages=max_pages)
-        logger.info(f"Found {len(bacteria_ids)} bacteria IDs to process.")
+        if resume:
+            journal.resume(source, None if resume == "latest" else int(resume))
+        else:
+            journal.start(source)
 
-        successful_scrapes = 0
-        failed_scrapes = 0
+        id_limit = max_pages * max_bacteria_per_page if max_bacteria_per_page else None
+        skip = journal.completed_ids() if resume else set()
+        if skip:
+            logger.info(f"Skipping {len(skip)} IDs already completed in this run.")
 
-        for i, bacteria_id in enumerate(bacteria_ids):
-            if max_bacteria_per_page and i >= (max_pages * max_bacteria_per_page):
-                logger.info(
-                    f"Reached processing limit of {max_pages * max_bacteria_per_page} bacteria."
+        def select_pending(page_ids: List[str]) -> List[str]:
+            pending = _select_pending(db, page_ids, skip, incremental_hours, counts)
+            if cache is not None and pending:
+                _discard_unsaved(db, scraper, pending)
+            return pending
+
+        if write_batch_size > 1:
+            writer = BatchWriter(
+                SessionLocalScraper,
+                batch_size=write_batch_size,
+                flush_seconds=flush_seconds,
+                workers=save_workers,
+                metrics=metrics,
+                cache=cache,
+            )
+
+        if engine == "async":
+            # IDs stream from the listing pages straight into the detail fetchers.
+            parse_pool = make_parse_pool(parse_workers)
+            fetcher = asyncio.run(
+                _scrape_async(
+                    scraper,
+                    max_pages,
+                    id_limit,
+                    bacteria_ids,
+                    select_pending,
+                    concurrency,
+                    rate,
+                    discovery_workers,
+                    counts,
+                    journal,
+                    writer,
+                    parse_pool,
+                    parse_workers,
+                    adaptive,
+                    min_rate,
+                    max_rate,
+                )
+            )
+            latencies = fetcher.latencies
+            rates = fetcher.rates()
+        else:
+            bacteria_ids = scraper.get_bacteria_ids(max_pages=max_pages)
+            logger.info(f"Found {len(bacteria_ids)} bacteria IDs to process.")
+            if id_limit is not None and len(bacteria_ids) > id_limit:
+                logger.info(f"Reached processing limit of {id_limit} bacteria.")
+                bacteria_ids = bacteria_ids[:id_limit]
+            pending_ids = select_pending(bacteria_ids)
+            for i, bacteria_id in enumerate(pending_ids):
+                logger.info(f"Processing ID {i + 1}/{len(pending_ids)}: {bacteria_id}")
+                _save(
+                    scraper,
+                    scraper.scrape_bacteria_result(bacteria_id),
+                    counts,
+                    journal,
+                    writer,
                 )
-                break
-
-            logger.info(f"Processing ID {i + 1}/{len(bacteria_ids)}: {bacteria_id}")
-            data = scraper.scrape_bacteria_data(bacteria_id)
-            if data:
-                if scraper.save_bacteria_data(data):
-                    successful_scrapes += 1
-                else:
-                    failed_scrapes += 1
-            else:
-                failed_scrapes += 1
-            time.sleep(0.1)
+                if scraper.rate_controller is None:
+                    time.sleep(0.1)
+            latencies = scraper.latencies
+            rates = {
+                urlsplit(scraper.base_url).netloc: (
+                    scraper.rate_controller.rate if scraper.rate_controller else rate
+                )
+            }
+
+        write_seconds = None
+        if writer is not None:
+            writer.close()
+            _record_writes(writer, counts, journal)
+            logger.info(
+                f"Batch writer committed {writer.written} rows in {writer.batches} batches."
+            )
+            write_seconds = writer.write_seconds
+            writer = None
+        elapsed = time.perf_counter() - started
+        metrics.count("run.sessions")
+        metrics.count("run.elapsed_seconds", elapsed)
 
         logger.info(
-            f"Scraping finished. Successful: {successful_scrapes}, Failed: {failed_scrapes}"
+            f"Scraping finished. Found {len(bacteria_ids)} IDs. Successful: {counts['successful']}, "
+            f"Unchanged (304): {counts['unchanged']}, Failed: {counts['failed']}, "
+            f"Skipped: {counts['skipped']} ({elapsed:.1f}s)"
         )
+        journal.finish(total_ids=len(bacteria_ids), metrics=metrics)
+        logger.info(f"Scrape run {journal.run_id} completed.")
+        if adaptive:
+            logger.info(
+                "Final request rates: "
+                + ", ".join(f"{host} {value:.2f}/s" for host, value in rates.items())
+            )
+        if scraper.archive is not None:
+            logger.info(
+                f"Recorded {scraper.archive.stored} pages to {scraper.archive.directory}."
+            )
+        stats = {
+            "run_id": journal.run_id,
+            "discovered": len(bacteria_ids),
+            **counts,
+            "elapsed": elapsed,
+            "fetch_latencies": latencies,
+            "rates": rates,
+            "write_seconds": write_seconds,
+            "metrics": metrics,
+        }
 
-    except Exception as e:
-        logger.error(f"Scraper run failed: {e}", exc_info=True)
+    except (Exception, KeyboardInterrupt) as e:
+        logger.error(f"Scraper run failed: {e!r}", exc_info=True)
+        if writer is not None:
+            # Commit what was already parsed so the journal matches the table.
+            writer.close()
+            _record_writes(writer, counts, journal)
+        if journal.run is not None:
+            metrics.count("run.sessions")
+            metrics.count("run.elapsed_seconds", time.perf_counter() - started)
+            journal.finish(total_ids=len(bacteria_ids), error=repr(e), metrics=metrics)
+            logger.info(
+                f"Progress saved. Continue with --resume {journal.run_id} (or --resume for the latest run)."
+            )
     finally:
+        if parse_pool is not None:
+            parse_pool.shutdown(cancel_futures=True)
+        scraper.close()
         db.close()
+    return stats
 
 
 if __name__ == "__main__":
@@ -76,9 +382,140 @@ if __name__ == "__main__":
     parser.add_argument(
         "--delay", type=float, default=2.0, help="Delay between HTTP requests."
     )
+    parser.add_argument(
+        "--engine",
+        choices=("async", "sync"),
+        default="async",
+        help="'async' fetches detail pages concurrently; 'sync' is the one-at-a-time loop.",
+    )
+    parser.add_argument(
+        "--concurrency",
+        "--fetch-workers",
+        dest="concurrency",
+        type=int,
+        default=8,
+        help="Fetch stage: max detail requests in flight (async engine).",
+    )
+    parser.add_argument(
+        "--discovery-workers",
+        type=int,
+        default=4,
+        help="Listing pages fetched concurrently while discovering IDs (async engine).",
+    )
+    parser.add_argument(
+        "--parse-workers",
+        type=int,
+        default=DEFAULT_PARSE_WORKERS,
+        help="Parse stage: worker processes (async engine); 0 parses on the event loop.",
+    )
+    parser.add_argument(
+        "--save-workers",
+        type=int,
+        default=1,
+        help="Save stage: batch writer threads, each with its own DB connection.",
+    )
+    parser.add_argument(
+        "--rate",
+        type=float,
+        default=5.0,
+        help="Starting requests per second per host; with --fixed-rate, the limit.",
+    )
+    parser.add_argument(
+        "--min-rate",
+        type=float,
+        default=0.5,
+        help="Lowest rate the adaptive limiter backs off to after 429s, 5xx or timeouts.",
+    )
+    parser.add_argument(
+        "--max-rate",
+        type=float,
+        default=None,
+        help="Highest rate the adaptive limiter ramps up to (default: 4x --rate).",
+    )
+    parser.add_argument(
+        "--fixed-rate",
+        action="store_true",
+        help="Keep the request rate at --rate instead of adapting it to the server.",
+    )
+    parser.add_argument(
+        "--base-url",
+        default=None,
+        help="Site root to crawl instead of https://mimedb.org (e.g. a local stand-in server).",
+    )
+
+    parser.add_argument(
+        "--extractor",
+        choices=tuple(EXTRACTORS),
+        default=DEFAULT_EXTRACTOR,
+        help="Detail-page parser: 'lxml' (XPath, fast) or 'soup' (BeautifulSoup reference).",
+    )
+
+    parser.add_argument(
+        "--cache-dir",
+        default=DEFAULT_CACHE_DIR,
+        help="Directory for the conditional-GET page cache.",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Always download pages in full instead of revalidating cached copies.",
+    )
+
+    parser.add_argument(
+        "--archive-dir",
+        default=None,
+        help="Record every fetched page here for offline replay with `python -m src.standin --archive`.",
+    )
+
+    parser.add_argument(
+        "--resume",
+        nargs="?",
+        const="latest",
+        default=None,
+        metavar="RUN_ID",
+        help="Continue an interrupted run (the latest unfinished one if no RUN_ID), skipping IDs it already completed.",
+    )
+    parser.add_argument(
+        "--incremental-hours",
+        type=float,
+        default=None,
+        help="Skip IDs whose stored row was updated within this many hours.",
+    )
+
+    parser.add_argument(
+        "--write-batch-size",
+        type=int,
+        default=200,
+        help="Records per batched upsert; 1 saves each record inline as it arrives.",
+    )
+    parser.add_argument(
+        "--flush-seconds",
+        type=float,
+        default=2.0,
+        help="Max seconds a parsed record waits in the write buffer.",
+    )
 
     args = parser.parse_args()
 
     run_scraper(
-        max_pages=args.max_pages, max_bacteria_per_page=args.max_items, delay=args.delay
+        max_pages=args.max_pages,
+        max_bacteria_per_page=args.max_items,
+        delay=args.delay,
+        engine=args.engine,
+        concurrency=args.concurrency,
+        rate=args.rate,
+        base_url=args.base_url,
+        cache_dir=None if args.no_cache else args.cache_dir,
+        resume=args.resume,
+        incremental_hours=args.incremental_hours,
+        write_batch_size=args.write_batch_size,
+        flush_seconds=args.flush_seconds,
+        extractor=args.extractor,
+        parse_workers=args.parse_workers,
+        save_workers=args.save_workers,
+        discovery_workers=args.discovery_workers,
+        archive_dir=args.archive_dir,
+        adaptive=not args.fixed_rate,
+        min_rate=args.min_rate,
+        max_rate=args.max_rate,
     )
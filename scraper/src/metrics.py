@@ -0,0 +1,160 @@
+import json
+import math
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional
+
+COUNTER = "counter"
+HISTOGRAM = "histogram"
+
+# Every histogram shares one set of log-spaced buckets (10 per decade, about
+# 26% wide, from 1e-4 to 1e9), so seconds and bytes fit the same scheme and
+# histograms from different sessions of a resumed run merge exactly.
+BUCKETS_PER_DECADE = 10
+MIN_EXPONENT = -4
+MAX_EXPONENT = 9
+NUM_BUCKETS = (MAX_EXPONENT - MIN_EXPONENT) * BUCKETS_PER_DECADE + 1
+
+
+def bucket_index(value: float) -> int:
+    if value <= 10.0**MIN_EXPONENT:
+        return 0
+    index = math.ceil((math.log10(value) - MIN_EXPONENT) * BUCKETS_PER_DECADE)
+    return min(NUM_BUCKETS - 1, index)
+
+
+def bucket_upper_bound(index: int) -> float:
+    return 10.0 ** (MIN_EXPONENT + index / BUCKETS_PER_DECADE)
+
+
+class Histogram:
+    """Count, sum, min, max and log-bucket counts of observed values."""
+
+    __slots__ = ("count", "total", "min", "max", "buckets")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.min: Optional[float] = None
+        self.max: Optional[float] = None
+        self.buckets: Dict[int, int] = {}
+
+    def observe(self, value: float) -> None:
+        self.count += 1
+        self.total += value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+        index = bucket_index(value)
+        self.buckets[index] = self.buckets.get(index, 0) + 1
+
+    def merge(self, other: "Histogram") -> None:
+        if not other.count:
+            return
+        self.count += other.count
+        self.total += other.total
+        self.min = other.min if self.min is None else min(self.min, other.min)
+        self.max = other.max if self.max is None else max(self.max, other.max)
+        for index, count in other.buckets.items():
+            self.buckets[index] = self.buckets.get(index, 0) + count
+
+    @property
+    def mean(self) -> Optional[float]:
+        return self.total / self.count if self.count else None
+
+    def percentile(self, pct: float) -> Optional[float]:
+        """Upper bound of the bucket holding the ``pct`` percentile, clamped to min/max."""
+        if not self.count:
+            return None
+        rank = max(1, math.ceil(pct / 100 * self.count))
+        seen = 0
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if seen >= rank:
+                return min(max(bucket_upper_bound(index), self.min), self.max)
+        return self.max
+
+
+class RunMetrics:
+    """
+    Counters and histograms for one scrape run, named ``<stage>.<metric>``
+    (e.g. ``fetch.latency_seconds``). Safe to update from the batch writer
+    threads as well as the event loop.
+    """
+
+    def __init__(self):
+        self.counters: Dict[str, float] = {}
+        self.histograms: Dict[str, Histogram] = {}
+        self._lock = threading.Lock()
+
+    def count(self, name: str, amount: float = 1) -> None:
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+    def observe(self, name: str, value: float) -> None:
+        with self._lock:
+            histogram = self.histograms.get(name)
+            if histogram is None:
+                histogram = self.histograms[name] = Histogram()
+            histogram.observe(value)
+
+    @contextmanager
+    def timer(self, name: str) -> Iterator[None]:
+        """Observes the seconds spent in the block, even if it raises."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - started)
+
+    def merge(self, other: "RunMetrics") -> None:
+        with self._lock:
+            for name, value in other.counters.items():
+                self.counters[name] = self.counters.get(name, 0) + value
+            for name, histogram in other.histograms.items():
+                self.histograms.setdefault(name, Histogram()).merge(histogram)
+
+    def to_rows(self) -> List[Dict]:
+        """One dict per metric, shaped like a scrape_metrics row."""
+        with self._lock:
+            rows = [
+                {"name": name, "kind": COUNTER, "count": None, "total": value}
+                for name, value in self.counters.items()
+            ]
+            for name, histogram in self.histograms.items():
+                rows.append(
+                    {
+                        "name": name,
+                        "kind": HISTOGRAM,
+                        "count": histogram.count,
+                        "total": histogram.total,
+                        "min_value": histogram.min,
+                        "max_value": histogram.max,
+                        "p50": histogram.percentile(50),
+                        "p90": histogram.percentile(90),
+                        "p99": histogram.percentile(99),
+                        "buckets": json.dumps(
+                            {str(i): n for i, n in sorted(histogram.buckets.items())}
+                        ),
+                    }
+                )
+        return rows
+
+    @classmethod
+    def from_rows(cls, rows) -> "RunMetrics":
+        """Rebuilds metrics from ScrapeMetric rows."""
+        metrics = cls()
+        for row in rows:
+            if row.kind == COUNTER:
+                metrics.counters[row.name] = row.total or 0
+                continue
+            histogram = Histogram()
+            histogram.count = row.count or 0
+            histogram.total = row.total or 0.0
+            histogram.min = row.min_value
+            histogram.max = row.max_value
+            histogram.buckets = {
+                int(i): n for i, n in json.loads(row.buckets or "{}").items()
+            }
+            metrics.histograms[row.name] = histogram
+        return metrics
@@ -1,6 +1,16 @@
 from datetime import datetime
 
-from sqlalchemy import Boolean, Column, DateTime, Float, Integer, String, Text
+from sqlalchemy import (
+    Boolean,
+    Column,
+    DateTime,
+    Float,
+    ForeignKey,
+    Integer,
+    String,
+    Text,
+    UniqueConstraint,
+)
 from sqlalchemy.ext.declarative import declarative_base
 
 Base = declarative_base()
@@ -63,3 +73,46 @@ class ScrapeLog(Base):
 
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+
+class ScrapeCheckpoint(Base):
+    """Per-ID outcome journal of a scrape run, used to resume interrupted crawls."""
+
+    __tablename__ = "scrape_checkpoints"
+    __table_args__ = (UniqueConstraint("run_id", "bacteria_id"),)
+
+    id = Column(Integer, primary_key=True, index=True)
+    run_id = Column(
+        Integer, ForeignKey("scrape_logs.id", ondelete="CASCADE"), index=True
+    )
+    bacteria_id = Column(String(50), nullable=False)
+    status = Column(String(20), nullable=False)
+    error_message = Column(Text)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+
+class ScrapeMetric(Base):
+    """
+    A counter or histogram recorded by the scraper for one run. Histograms
+    keep their log-bucket counts (JSON) so sessions of a resumed run merge;
+    p50/p90/p99 are stored alongside for querying.
+    """
+
+    __tablename__ = "scrape_metrics"
+    __table_args__ = (UniqueConstraint("run_id", "name"),)
+
+    id = Column(Integer, primary_key=True, index=True)
+    run_id = Column(
+        Integer, ForeignKey("scrape_logs.id", ondelete="CASCADE"), index=True
+    )
+    name = Column(String(100), nullable=False)
+    kind = Column(String(20), nullable=False)
+    count = Column(Integer)
+    total = Column(Float)
+    min_value = Column(Float)
+    max_value = Column(Float)
+    p50 = Column(Float)
+    p90 = Column(Float)
+    p99 = Column(Float)
+    buckets = Column(Text)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
@@ -0,0 +1,224 @@
+import asyncio
+import logging
+import signal
+from concurrent.futures import BrokenExecutor, Executor, ProcessPoolExecutor
+from typing import AsyncIterable, AsyncIterator, Dict, Iterable, List, Optional, Union
+
+from src.fetcher import AsyncFetcher
+from src.http_cache import Page
+from src.scrapers.extractors import extract_page
+from src.scrapers.mimedb import (
+    FAILED,
+    NOT_MODIFIED,
+    OK,
+    MimeDBScraper,
+    ScrapeResult,
+)
+
+logger = logging.getLogger(__name__)
+
+_END = object()
+
+
+def _ignore_sigint() -> None:
+    # Ctrl-C is handled by the parent, which checkpoints and shuts the pool down.
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+
+def make_parse_pool(workers: int) -> Optional[ProcessPoolExecutor]:
+    """A process pool for the parse stage, or None to parse on the event loop."""
+    if workers <= 0:
+        return None
+    return ProcessPoolExecutor(max_workers=workers, initializer=_ignore_sigint)
+
+
+async def discover_ids(
+    scraper: MimeDBScraper, fetcher: AsyncFetcher, max_pages: int, workers: int = 4
+) -> AsyncIterator[List[str]]:
+    """
+    Fetches /microbes listing pages 1..max_pages with up to ``workers`` in
+    flight and yields the IDs not seen before as each page arrives, so detail
+    fetching can start on page 1 while later pages are still loading. Like
+    get_bacteria_ids, an empty page after the first marks the end of the
+    listing: no later page is requested and pages past it are dropped.
+    """
+    seen = set()
+    last_page = max_pages
+    next_page = 1
+    in_flight: Dict[asyncio.Task, int] = {}
+    try:
+        while in_flight or next_page <= last_page:
+            while next_page <= last_page and len(in_flight) < max(1, workers):
+                url = scraper.listing_url(next_page)
+                logger.info(f"Fetching bacteria IDs from: {url}")
+                in_flight[asyncio.create_task(fetcher.fetch(url))] = next_page
+                next_page += 1
+            done, _ = await asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED)
+            for task in sorted(done, key=in_flight.get):
+                page_num = in_flight.pop(task, None)
+                if page_num is None or page_num > last_page:
+                    continue  # past the end of the listing
+                html = task.result()
+                if not html:
+                    continue
+                page_ids = scraper.parse_listing_page(html)
+                if not page_ids:
+                    if page_num == 1:
+                        logger.warning(
+                            "No bacteria links found on first page using selector 'td.microbe-link a.btn-card'. Check website structure."
+                        )
+                        continue
+                    logger.info(
+                        f"No more IDs found on page {page_num}. Stopping ID collection."
+                    )
+                    last_page = page_num - 1
+                    for other, other_page in list(in_flight.items()):
+                        if other_page > last_page:
+                            other.cancel()
+                            del in_flight[other]
+                    continue
+                new_ids = [
+                    bacteria_id for bacteria_id in page_ids if bacteria_id not in seen
+                ]
+                seen.update(new_ids)
+                if new_ids:
+                    yield new_ids
+    finally:
+        for task in in_flight:
+            task.cancel()
+
+
+async def _iterate(bacteria_ids: Iterable[str]) -> AsyncIterator[str]:
+    for bacteria_id in bacteria_ids:
+        yield bacteria_id
+
+
+class ScrapePipeline:
+    """
+    Runs a crawl as fetch -> parse stages joined by bounded asyncio queues;
+    the caller consumes results and hands them to the save stage (BatchWriter).
+
+    - IDs: a list, or an async iterable such as discover_ids() so detail
+      pages are fetched while listing pages are still being discovered.
+    - fetch: ``fetcher.concurrency`` tasks doing I/O through the AsyncFetcher.
+    - parse: ``parse_workers`` tasks, each keeping one page in flight on
+      ``parse_pool`` (a process pool, so BeautifulSoup/lxml run outside the
+      GIL). Without a pool a single task parses on the event loop.
+
+    Each queue holds at most ``queue_size`` pages, so a slow stage makes the
+    stages before it wait instead of buffering the whole crawl in memory.
+    Parse times, parse errors and the parse backlog (pages waiting in the
+    fetched queue) go to the scraper's metrics.
+    """
+
+    def __init__(
+        self,
+        scraper: MimeDBScraper,
+        fetcher: AsyncFetcher,
+        parse_pool: Optional[Executor] = None,
+        parse_workers: int = 1,
+        queue_size: Optional[int] = None,
+    ):
+        self.scraper = scraper
+        self.fetcher = fetcher
+        self.parse_pool = parse_pool
+        self.parse_workers = max(1, parse_workers) if parse_pool else 1
+        self.queue_size = queue_size or 2 * (fetcher.concurrency + self.parse_workers)
+
+    async def _parse(self, bacteria_id: str, page: Page) -> ScrapeResult:
+        metrics = self.scraper.metrics
+        try:
+            with metrics.timer("parse.seconds"):
+                if self.parse_pool is None:
+                    data = self.scraper.parse_bacteria_page(bacteria_id, page.text)
+                else:
+                    data = await asyncio.get_running_loop().run_in_executor(
+                        self.parse_pool,
+                        extract_page,
+                        self.scraper.extractor.name,
+                        bacteria_id,
+                        page.text,
+                    )
+        except BrokenExecutor:
+            raise
+        except Exception as e:
+            logger.error(f"Failed to parse page for {bacteria_id}: {e!r}")
+            metrics.count("parse.errors")
+            return ScrapeResult(bacteria_id, None, FAILED)
+        return ScrapeResult(bacteria_id, data, OK, page.entry)
+
+    async def run(
+        self, bacteria_ids: Union[Iterable[str], AsyncIterable[str]]
+    ) -> AsyncIterator[ScrapeResult]:
+        """Yields a ScrapeResult per ID, in completion order."""
+        if not hasattr(bacteria_ids, "__aiter__"):
+            bacteria_ids = _iterate(bacteria_ids)
+        pending: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        fetched: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        parsed: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+
+        async def feed_stage() -> None:
+            async for bacteria_id in bacteria_ids:
+                await pending.put(bacteria_id)
+
+        async def fetch_stage() -> None:
+            while True:
+                bacteria_id = await pending.get()
+                if bacteria_id is _END:
+                    return
+                page = await self.fetcher.fetch_page(
+                    self.scraper.detail_url(bacteria_id)
+                )
+                if page is None:
+                    await parsed.put(ScrapeResult(bacteria_id, None, FAILED))
+                elif page.not_modified:
+                    await parsed.put(ScrapeResult(bacteria_id, None, NOT_MODIFIED))
+                else:
+                    await fetched.put((bacteria_id, page))
+
+        async def parse_stage() -> None:
+            while True:
+                item = await fetched.get()
+                if item is _END:
+                    return
+                self.scraper.metrics.observe("parse.backlog", fetched.qsize())
+                await parsed.put(await self._parse(*item))
+
+        async def guarded(stage) -> None:
+            # A crashed stage would leave the others blocked on a queue, so its
+            # error goes straight to the consumer, which stops the pipeline.
+            try:
+                await stage()
+            except Exception as e:
+                await parsed.put(e)
+
+        async def close_stages() -> None:
+            await feeder
+            for _ in fetchers:
+                await pending.put(_END)
+            await asyncio.gather(*fetchers)
+            for _ in parsers:
+                await fetched.put(_END)
+            await asyncio.gather(*parsers)
+            await parsed.put(_END)
+
+        feeder = asyncio.create_task(guarded(feed_stage))
+        fetchers = [
+            asyncio.create_task(guarded(fetch_stage))
+            for _ in range(self.fetcher.concurrency)
+        ]
+        parsers = [
+            asyncio.create_task(guarded(parse_stage)) for _ in range(self.parse_workers)
+        ]
+        closer = asyncio.create_task(close_stages())
+        try:
+            while True:
+                item = await parsed.get()
+                if item is _END:
+                    break
+                if isinstance(item, Exception):
+                    raise item
+                yield item
+        finally:
+            for task in [feeder] + fetchers + parsers + [closer]:
+                task.cancel()
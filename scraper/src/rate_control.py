@@ -0,0 +1,105 @@
+import logging
+import math
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+MAX_RETRY_AFTER = 300.0
+
+
+def is_congestion_status(status_code: int) -> bool:
+    """429 and 5xx mean the server is overloaded; other errors do not."""
+    return status_code == 429 or 500 <= status_code < 600
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Seconds to wait from a Retry-After header (delta-seconds or HTTP-date)."""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        seconds = float(value)
+    else:
+        try:
+            when = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+        if when.tzinfo is None:
+            when = when.replace(tzinfo=timezone.utc)
+        seconds = (when - datetime.now(timezone.utc)).total_seconds()
+    return min(max(seconds, 0.0), MAX_RETRY_AFTER)
+
+
+class AimdRateController:
+    """
+    Additive-increase / multiplicative-decrease request rate for one host.
+
+    Every healthy response (latency within ``slow_factor`` of the fastest
+    recently seen) adds ``increase`` requests/s, up to ``max_rate``. A 429,
+    a 5xx, a timeout or a connection error multiplies the rate by
+    ``decrease``, down to ``min_rate``, at most once per ``cooldown``
+    seconds so a burst of failures from one overload counts once. A
+    Retry-After header also pauses the host until it has passed. Slow but
+    successful responses hold the rate where it is.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        min_rate: float = 0.5,
+        max_rate: Optional[float] = None,
+        increase: float = 0.2,
+        decrease: float = 0.5,
+        slow_factor: float = 3.0,
+        cooldown: float = 1.0,
+    ):
+        self.min_rate = min(min_rate, rate)
+        self.max_rate = max(max_rate or 4 * rate, rate)
+        self.rate = rate
+        self.increase = increase
+        self.decrease = decrease
+        self.slow_factor = slow_factor
+        self.cooldown = cooldown
+        self.paused_until = 0.0
+        self.decreases = 0
+        self._baseline: Optional[float] = None
+        self._last_decrease = -math.inf
+        self._next_slot = 0.0
+
+    def on_success(self, latency: float) -> None:
+        if self._baseline is None or latency < self._baseline:
+            self._baseline = latency
+        else:
+            # Drift up slowly so a server that got slower for good stops
+            # counting as "slow" forever.
+            self._baseline += (latency - self._baseline) * 0.01
+        if latency <= self._baseline * self.slow_factor:
+            self.rate = min(self.max_rate, self.rate + self.increase)
+
+    def on_congestion(self, retry_after: Optional[float] = None) -> None:
+        now = time.monotonic()
+        if retry_after:
+            self.paused_until = max(self.paused_until, now + retry_after)
+        if now - self._last_decrease < self.cooldown:
+            return
+        self._last_decrease = now
+        self.decreases += 1
+        previous = self.rate
+        self.rate = max(self.min_rate, self.rate * self.decrease)
+        logger.info(
+            f"Server pushed back; request rate {previous:.2f} -> {self.rate:.2f}/s"
+            + (f", pausing {retry_after:.1f}s (Retry-After)" if retry_after else "")
+        )
+
+    def wait_time(self) -> float:
+        """
+        For one-at-a-time callers: seconds to sleep before the next request,
+        spacing requests 1/rate apart and honouring Retry-After pauses.
+        """
+        now = time.monotonic()
+        slot = max(now, self._next_slot, self.paused_until)
+        self._next_slot = slot + 1.0 / self.rate
+        return slot - now
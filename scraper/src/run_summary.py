@@ -0,0 +1,147 @@
+import argparse
+import logging
+from typing import List, Optional, Tuple
+
+from src.backend_models import ScrapeLog
+from src.db import SessionLocalScraper
+from src.metrics import Histogram, RunMetrics
+from src.runs import load_run_metrics
+
+logger = logging.getLogger(__name__)
+
+# Timings are recorded in seconds and shown in milliseconds.
+_SECONDS_SUFFIX = "seconds"
+
+
+def _ms(seconds: Optional[float]) -> str:
+    return "-" if seconds is None else f"{seconds * 1000:.1f}"
+
+
+def _size(num_bytes: float) -> str:
+    if num_bytes < 1024:
+        return f"{num_bytes:.0f}B"
+    for unit in ("KB", "MB", "GB"):
+        num_bytes /= 1024
+        if num_bytes < 1024 or unit == "GB":
+            break
+    return f"{num_bytes:.1f}{unit}"
+
+
+def _status(run: ScrapeLog) -> str:
+    if run.end_time is not None:
+        return "done"
+    return "failed" if run.error_message else "open"
+
+
+def summary_line(run: ScrapeLog, metrics: RunMetrics) -> str:
+    """One row of the recent-runs table."""
+    counters = metrics.counters
+    elapsed = counters.get("run.elapsed_seconds")
+    done = run.successful_scrapes or 0
+    latency = metrics.histograms.get("fetch.latency_seconds", Histogram())
+    parse = metrics.histograms.get("parse.seconds", Histogram())
+    fetched = metrics.histograms.get("fetch.bytes", Histogram())
+    requests = counters.get("fetch.requests", 0)
+    cache_hits = counters.get("fetch.cache_hits", 0)
+    return (
+        f"{run.id:>5} {run.start_time:%Y-%m-%d %H:%M} {_status(run):<6} "
+        f"{done:>7} {run.failed_scrapes or 0:>6} "
+        f"{'-' if not elapsed else f'{elapsed:.0f}s':>7} "
+        f"{'-' if not elapsed else f'{done / elapsed:.1f}':>7} "
+        f"{_ms(latency.percentile(50)):>8} {_ms(latency.percentile(99)):>8} "
+        f"{_ms(parse.percentile(50)):>8} "
+        f"{_size(fetched.total):>8} "
+        f"{f'{cache_hits / requests:.0%}' if requests else '-':>6} "
+        f"{counters.get('fetch.retries', 0):>7.0f}"
+    )
+
+
+SUMMARY_HEADER = (
+    f"{'run':>5} {'started':<16} {'status':<6} {'done':>7} {'failed':>6} "
+    f"{'time':>7} {'rec/s':>7} {'p50 ms':>8} {'p99 ms':>8} {'parse ms':>8} "
+    f"{'fetched':>8} {'cache':>6} {'retries':>7}"
+)
+
+
+def run_detail(run: ScrapeLog, metrics: RunMetrics) -> str:
+    """Every counter and histogram recorded for one run."""
+    lines = [
+        f"Scrape run {run.id} ({run.source}), started {run.start_time:%Y-%m-%d %H:%M:%S}, "
+        f"{_status(run)}",
+        f"  IDs: {run.total_urls_processed or 0}, done: {run.successful_scrapes or 0}, "
+        f"failed: {run.failed_scrapes or 0}",
+    ]
+    if run.error_message:
+        lines.append(f"  error: {run.error_message}")
+    if not metrics.counters and not metrics.histograms:
+        lines.append("  (no metrics recorded for this run)")
+        return "\n".join(lines)
+
+    lines.append("  counters:")
+    for name, value in sorted(metrics.counters.items()):
+        shown = f"{value:.1f}" if name.endswith(_SECONDS_SUFFIX) else f"{value:.0f}"
+        lines.append(f"    {name:<28} {shown:>12}")
+
+    lines.append(
+        f"  histograms:{'count':>23} {'mean':>10} {'p50':>10} {'p90':>10} "
+        f"{'p99':>10} {'max':>10}"
+    )
+    for name, histogram in sorted(metrics.histograms.items()):
+        if name.endswith(_SECONDS_SUFFIX):
+            show, label = _ms, f"{name} (ms)"
+        else:
+            show, label = (lambda v: "-" if v is None else f"{v:.1f}"), name
+        values = (
+            histogram.mean,
+            histogram.percentile(50),
+            histogram.percentile(90),
+            histogram.percentile(99),
+            histogram.max,
+        )
+        lines.append(
+            f"    {label:<28} {histogram.count:>6} "
+            + " ".join(f"{show(v):>10}" for v in values)
+        )
+    return "\n".join(lines)
+
+
+def load_runs(
+    db_session, limit: int, source: Optional[str] = None
+) -> List[Tuple[ScrapeLog, RunMetrics]]:
+    query = db_session.query(ScrapeLog)
+    if source:
+        query = query.filter(ScrapeLog.source == source)
+    runs = query.order_by(ScrapeLog.id.desc()).limit(limit).all()
+    return [(run, load_run_metrics(db_session, run.id)) for run in runs]
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    parser = argparse.ArgumentParser(
+        description="Summarise the metrics recorded for recent scrape runs"
+    )
+    parser.add_argument(
+        "--runs", type=int, default=10, help="How many recent runs to list."
+    )
+    parser.add_argument(
+        "--run-id", type=int, default=None, help="Show every metric for one run."
+    )
+    parser.add_argument("--source", default=None, help="Only runs of this source.")
+    args = parser.parse_args()
+
+    db = SessionLocalScraper()
+    try:
+        if args.run_id is not None:
+            run = db.query(ScrapeLog).filter(ScrapeLog.id == args.run_id).first()
+            if run is None:
+                raise SystemExit(f"No scrape run {args.run_id}.")
+            logger.info(run_detail(run, load_run_metrics(db, run.id)))
+        else:
+            runs = load_runs(db, args.runs, args.source)
+            if not runs:
+                raise SystemExit("No scrape runs recorded yet.")
+            logger.info(SUMMARY_HEADER)
+            for run, metrics in runs:
+                logger.info(summary_line(run, metrics))
+    finally:
+        db.close()
@@ -0,0 +1,210 @@
+import logging
+import time
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session as SQLAlchemySession
+from src.backend_models import Bacteria, ScrapeCheckpoint, ScrapeLog, ScrapeMetric
+from src.metrics import RunMetrics
+
+logger = logging.getLogger(__name__)
+
+DONE_STATUSES = ("ok", "not_modified")
+LOOKUP_CHUNK_SIZE = 500
+
+
+class RunJournal:
+    """
+    Tracks one scrape run in scrape_logs and journals the outcome of every
+    bacteria_id in scrape_checkpoints. Entries are buffered and written every
+    ``flush_every`` records or ``flush_seconds``, so a crash loses at most
+    one buffer of progress. A resumed run reuses the same ScrapeLog row and
+    skips IDs whose journaled status is done; failed IDs are retried.
+    Run metrics are kept in scrape_metrics and summed over the sessions of
+    a resumed run, like the totals on the ScrapeLog row.
+    """
+
+    def __init__(
+        self,
+        db_session: SQLAlchemySession,
+        flush_every: int = 50,
+        flush_seconds: float = 5.0,
+    ):
+        self.db_session = db_session
+        self.flush_every = flush_every
+        self.flush_seconds = flush_seconds
+        self.run: Optional[ScrapeLog] = None
+        self._buffer: Dict[str, Tuple[str, Optional[str]]] = {}
+        self._last_flush = time.monotonic()
+
+    @property
+    def run_id(self) -> Optional[int]:
+        return self.run.id if self.run else None
+
+    def start(self, source: str) -> ScrapeLog:
+        self.run = ScrapeLog(start_time=datetime.utcnow(), source=source)
+        self.db_session.add(self.run)
+        self.db_session.commit()
+        logger.info(f"Started scrape run {self.run.id} ({source}).")
+        return self.run
+
+    def resume(self, source: str, run_id: Optional[int] = None) -> ScrapeLog:
+        """Reopens ``run_id``, or the latest unfinished run for ``source``."""
+        query = self.db_session.query(ScrapeLog)
+        if run_id is not None:
+            run = query.filter(ScrapeLog.id == run_id).first()
+        else:
+            run = (
+                query.filter(ScrapeLog.source == source, ScrapeLog.end_time.is_(None))
+                .order_by(ScrapeLog.id.desc())
+                .first()
+            )
+        if run is None:
+            logger.info("No unfinished scrape run to resume. Starting a new one.")
+            return self.start(source)
+        run.end_time = None
+        self.db_session.commit()
+        self.run = run
+        logger.info(f"Resuming scrape run {run.id} started at {run.start_time}.")
+        return run
+
+    def completed_ids(self) -> Set[str]:
+        rows = self.db_session.query(ScrapeCheckpoint.bacteria_id).filter(
+            ScrapeCheckpoint.run_id == self.run_id,
+            ScrapeCheckpoint.status.in_(DONE_STATUSES),
+        )
+        return {bacteria_id for (bacteria_id,) in rows}
+
+    def record(self, bacteria_id: str, status: str, error: Optional[str] = None):
+        self._buffer[bacteria_id] = (status, error)
+        if (
+            len(self._buffer) >= self.flush_every
+            or time.monotonic() - self._last_flush >= self.flush_seconds
+        ):
+            self.flush()
+
+    def flush(self) -> None:
+        self._last_flush = time.monotonic()
+        if not self._buffer:
+            return
+        entries, self._buffer = self._buffer, {}
+        now = datetime.utcnow()
+        try:
+            self.db_session.query(ScrapeCheckpoint).filter(
+                ScrapeCheckpoint.run_id == self.run_id,
+                ScrapeCheckpoint.bacteria_id.in_(list(entries)),
+            ).delete(synchronize_session=False)
+            self.db_session.bulk_insert_mappings(
+                ScrapeCheckpoint,
+                [
+                    {
+                        "run_id": self.run_id,
+                        "bacteria_id": bacteria_id,
+                        "status": status,
+                        "error_message": error,
+                        "updated_at": now,
+                    }
+                    for bacteria_id, (status, error) in entries.items()
+                ],
+            )
+            self.db_session.commit()
+        except Exception as e:
+            self.db_session.rollback()
+            logger.error(
+                f"Could not write {len(entries)} checkpoints for run {self.run_id}: {e}"
+            )
+
+    def save_metrics(self, metrics: RunMetrics) -> None:
+        """Adds this session's metrics to those stored for the run."""
+        total = load_run_metrics(self.db_session, self.run_id)
+        total.merge(metrics)
+        self.db_session.query(ScrapeMetric).filter(
+            ScrapeMetric.run_id == self.run_id
+        ).delete(synchronize_session=False)
+        now = datetime.utcnow()
+        self.db_session.bulk_insert_mappings(
+            ScrapeMetric,
+            [
+                {**row, "run_id": self.run_id, "updated_at": now}
+                for row in total.to_rows()
+            ],
+        )
+
+    def finish(
+        self,
+        total_ids: int,
+        error: Optional[str] = None,
+        metrics: Optional[RunMetrics] = None,
+    ) -> Dict[str, int]:
+        """Flushes the journal and closes the run with totals over all its sessions."""
+        self.flush()
+        if metrics is not None:
+            self.save_metrics(metrics)
+        counts = dict(
+            self.db_session.query(ScrapeCheckpoint.status, func.count())
+            .filter(ScrapeCheckpoint.run_id == self.run_id)
+            .group_by(ScrapeCheckpoint.status)
+        )
+        self.run.total_urls_processed = total_ids
+        self.run.successful_scrapes = sum(counts.get(s, 0) for s in DONE_STATUSES)
+        self.run.failed_scrapes = counts.get("failed", 0)
+        self.run.error_message = error
+        # A run that crashed keeps end_time NULL so --resume can find it.
+        if error is None:
+            self.run.end_time = datetime.utcnow()
+        self.db_session.commit()
+        return counts
+
+
+def load_run_metrics(db_session: SQLAlchemySession, run_id: int) -> RunMetrics:
+    rows = db_session.query(ScrapeMetric).filter(ScrapeMetric.run_id == run_id)
+    return RunMetrics.from_rows(rows)
+
+
+def recently_updated_ids(
+    db_session: SQLAlchemySession, bacteria_ids: Iterable[str], max_age: timedelta
+) -> Set[str]:
+    """IDs among ``bacteria_ids`` whose stored row was updated within ``max_age``."""
+    cutoff = datetime.utcnow() - max_age
+    ids: List[str] = list(bacteria_ids)
+    recent: Set[str] = set()
+    for start in range(0, len(ids), LOOKUP_CHUNK_SIZE):
+        chunk = ids[start : start + LOOKUP_CHUNK_SIZE]
+        rows = db_session.query(Bacteria.bacteria_id).filter(
+            Bacteria.bacteria_id.in_(chunk), Bacteria.updated_at >= cutoff
+        )
+        recent.update(bacteria_id for (bacteria_id,) in rows)
+    return recent
+
+
+def unsaved_ids(db_session: SQLAlchemySession, bacteria_ids: Iterable[str]) -> Set[str]:
+    """
+    IDs among ``bacteria_ids`` that have no stored row, or whose latest
+    journaled outcome in any run was a failure.
+    """
+    ids: List[str] = list(bacteria_ids)
+    unsaved: Set[str] = set()
+    for start in range(0, len(ids), LOOKUP_CHUNK_SIZE):
+        chunk = ids[start : start + LOOKUP_CHUNK_SIZE]
+        stored = {
+            bacteria_id
+            for (bacteria_id,) in db_session.query(Bacteria.bacteria_id).filter(
+                Bacteria.bacteria_id.in_(chunk)
+            )
+        }
+        unsaved.update(
+            bacteria_id for bacteria_id in chunk if bacteria_id not in stored
+        )
+        latest: Dict[str, str] = {}
+        rows = (
+            db_session.query(ScrapeCheckpoint.bacteria_id, ScrapeCheckpoint.status)
+            .filter(ScrapeCheckpoint.bacteria_id.in_(chunk))
+            .order_by(ScrapeCheckpoint.run_id, ScrapeCheckpoint.updated_at)
+        )
+        for bacteria_id, status in rows:
+            latest[bacteria_id] = status
+        unsaved.update(
+            bacteria_id for bacteria_id, status in latest.items() if status == "failed"
+        )
+    return unsaved
@@ -0,0 +1,192 @@
+import re
+from typing import Dict, Optional, Type
+
+import lxml.html
+from bs4 import BeautifulSoup
+from lxml import etree
+
+TAXONOMY_FIELDS = {
+    "Superkingdom": "superkingdom",
+    "Kingdom": "kingdom",
+    "Phylum": "phylum",
+    "Class": "class_name",
+    "Order": "order",
+    "Family": "family",
+    "Genus": "genus",
+    "Species": "species",
+    "Strain": "strain",
+}
+PROPERTY_FIELDS = {
+    "Gram staining properties": "gram_stain",
+    "Shape": "shape",
+    "Mobility": "mobility",
+    "Flagellar presence": "flagellar_presence",
+    "Number of membranes": "number_of_membranes",
+    "Oxygen preference": "oxygen_preference",
+    "Optimal temperature": "optimal_temperature",
+    "Temperature range": "temperature_range",
+    "Habitat": "habitat",
+    "Biotic relationship": "biotic_relationship",
+    "Cell arrangement": "cell_arrangement",
+    "Sporulation": "sporulation",
+    "Metabolism": "metabolism",
+    "Energy source": "energy_source",
+}
+YES_NO_FIELDS = ("mobility", "flagellar_presence", "sporulation")
+
+_NAME_RE = re.compile(r"^(.*?) \(MMDBm\d+\)")
+_NUMBER_RE = re.compile(r"(\d+(\.\d+)?)")
+
+
+def _name(title: str):
+    name_match = _NAME_RE.match(title.strip())
+    return name_match.group(1).strip() if name_match else title.strip()
+
+
+def _taxonomy_value(text: str) -> Optional[str]:
+    return text.strip() if "Not Available" not in text else None
+
+
+def _property_value(field_name: str, text: str):
+    value = text.strip()
+    if "Not Available" in value:
+        value = None
+    if field_name in YES_NO_FIELDS:
+        return value.lower() == "yes" if value else None
+    if field_name == "optimal_temperature" and value:
+        match = _NUMBER_RE.search(value)
+        return float(match.group(1)) if match else None
+    return value
+
+
+def _is_pathogen(text: str) -> bool:
+    path_text = text.strip().lower()
+    return "pathogenic" in path_text and "non-pathogenic" not in path_text
+
+
+class Extractor:
+    """Turns a MiMeDB detail page into the dict saved by the scraper."""
+
+    name = ""
+
+    def extract(self, bacteria_id: str, html: str) -> Dict:
+        raise NotImplementedError
+
+
+class SoupExtractor(Extractor):
+    """The original BeautifulSoup + CSS selector extractor, kept as the reference."""
+
+    name = "soup"
+
+    def extract(self, bacteria_id: str, html: str) -> Dict:
+        soup = BeautifulSoup(html, "lxml")
+        data = {"bacteria_id": bacteria_id}
+
+        title_el = soup.select_one(".page-header h1")
+        if title_el:
+            data["name"] = _name(title_el.text)
+
+        for row in soup.select("#taxinfo tr"):
+            th = row.find("th")
+            td = row.find("td")
+            if th and td and th.text.strip() in TAXONOMY_FIELDS:
+                data[TAXONOMY_FIELDS[th.text.strip()]] = _taxonomy_value(td.text)
+
+        for row in soup.select("#microbe-properties tr"):
+            th = row.find("th")
+            td = row.find("td")
+            if th and td and th.text.strip() in PROPERTY_FIELDS:
+                field_name = PROPERTY_FIELDS[th.text.strip()]
+                data[field_name] = _property_value(field_name, td.text)
+
+        disease_el = soup.select_one("td.microbe-disease")
+        if disease_el:
+            data["is_pathogen"] = _is_pathogen(disease_el.text)
+
+        return data
+
+
+def _has_class(name: str) -> str:
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+
+class LxmlExtractor(Extractor):
+    """
+    Same output as SoupExtractor, read straight off the libxml2 tree with
+    precompiled XPath. Skipping the BeautifulSoup object model makes this
+    several times faster per page. An instance holds a parser and compiled
+    XPath objects, so use one per thread.
+    """
+
+    name = "lxml"
+
+    def __init__(self):
+        self._parser = lxml.html.HTMLParser(encoding="utf-8")
+        self._title = etree.XPath(f"(//*[{_has_class('page-header')}]//h1)[1]")
+        self._taxonomy_rows = etree.XPath("//*[@id='taxinfo']//tr")
+        self._property_rows = etree.XPath("//*[@id='microbe-properties']//tr")
+        self._disease = etree.XPath(f"(//td[{_has_class('microbe-disease')}])[1]")
+
+    @staticmethod
+    def _cells(rows, fields: Dict[str, str]):
+        for row in rows:
+            th = row.find(".//th")
+            td = row.find(".//td")
+            if th is None or td is None:
+                continue
+            field_name = fields.get(th.text_content().strip())
+            if field_name:
+                yield field_name, td.text_content()
+
+    def extract(self, bacteria_id: str, html: str) -> Dict:
+        data = {"bacteria_id": bacteria_id}
+        if not html.strip():
+            return data
+        # Parsing bytes lets pages that carry an XML encoding declaration through.
+        root = lxml.html.document_fromstring(html.encode("utf-8"), parser=self._parser)
+
+        title = self._title(root)
+        if title:
+            data["name"] = _name(title[0].text_content())
+
+        for field_name, text in self._cells(self._taxonomy_rows(root), TAXONOMY_FIELDS):
+            data[field_name] = _taxonomy_value(text)
+
+        for field_name, text in self._cells(self._property_rows(root), PROPERTY_FIELDS):
+            data[field_name] = _property_value(field_name, text)
+
+        disease = self._disease(root)
+        if disease:
+            data["is_pathogen"] = _is_pathogen(disease[0].text_content())
+
+        return data
+
+
+EXTRACTORS: Dict[str, Type[Extractor]] = {
+    SoupExtractor.name: SoupExtractor,
+    LxmlExtractor.name: LxmlExtractor,
+}
+DEFAULT_EXTRACTOR = LxmlExtractor.name
+
+
+def get_extractor(name: str) -> Extractor:
+    try:
+        return EXTRACTORS[name]()
+    except KeyError:
+        raise ValueError(
+            f"Unknown extractor '{name}'. Choose from: {', '.join(EXTRACTORS)}"
+        ) from None
+
+
+_process_extractors: Dict[str, Extractor] = {}
+
+
+def extract_page(extractor_name: str, bacteria_id: str, html: str) -> Dict:
+    """
+    Module-level entry point for parse worker processes: picklable by name,
+    and each process builds its extractor once and reuses it.
+    """
+    extractor = _process_extractors.get(extractor_name)
+    if extractor is None:
+        extractor = _process_extractors[extractor_name] = get_extractor(extractor_name)
+    return extractor.extract(bacteria_id, html)
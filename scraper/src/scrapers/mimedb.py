@@ -1,28 +1,36 @@
 import logging
 import os
-import re
-import sys
 import time
-from typing import Dict, List, Optional
+from typing import Dict, List, NamedTuple, Optional
 
 import requests
 from bs4 import BeautifulSoup
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session as SQLAlchemySession
+from src.archive import PageArchive
+from src.backend_models import Bacteria
+from src.http_cache import CacheEntry, Page, PageCache
+from src.metrics import RunMetrics
+from src.rate_control import (
+    AimdRateController,
+    is_congestion_status,
+    parse_retry_after,
+)
+from src.scrapers.extractors import DEFAULT_EXTRACTOR, get_extractor
 
-SCRAPER_SRC_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-PROJECT_ROOT = os.path.dirname(os.path.dirname(SCRAPER_SRC_ROOT))
-sys.path.insert(0, PROJECT_ROOT)
-try:
-    from backend.app.models.bacteria import Bacteria
-except ImportError:
-    logging.error(
-        "Could not import backend.app.models.Bacteria. Scraper save will be problematic."
-    )
-    Bacteria = None
+logger = logging.getLogger(__name__)
 
+OK = "ok"
+NOT_MODIFIED = "not_modified"
+FAILED = "failed"
 
-logger = logging.getLogger(__name__)
+
+class ScrapeResult(NamedTuple):
+    bacteria_id: str
+    data: Optional[Dict]
+    status: str
+    # Committed to the PageCache only after ``data`` has been saved.
+    cache_entry: Optional[CacheEntry] = None
 
 
 class MimeDBScraper:
@@ -34,139 +42,172 @@ class MimeDBScraper:
         db_session: SQLAlchemySession,
         delay: float = 2.0,
         user_agent: Optional[str] = None,
+        base_url: Optional[str] = None,
+        cache: Optional[PageCache] = None,
+        extractor: str = DEFAULT_EXTRACTOR,
+        archive: Optional[PageArchive] = None,
+        rate_controller: Optional[AimdRateController] = None,
+        metrics: Optional[RunMetrics] = None,
     ):
         self.db_session = db_session
+        self.cache = cache
+        self.archive = archive
+        # When set, requests are paced by the controller instead of ``delay``.
+        self.rate_controller = rate_controller
+        self.latencies: List[float] = []
+        self.metrics = metrics or RunMetrics()
+        self.extractor = get_extractor(extractor)
         self.delay = delay
+        # Overridable so crawls can be pointed at a local stand-in server.
+        self.base_url = (
+            base_url or os.getenv("MIMEDB_BASE_URL") or self.BASE_URL
+        ).rstrip("/")
+        self.microbes_url = f"{self.base_url}/microbes"
         self.headers = {
             "User-Agent": user_agent
             or os.getenv("SCRAPER_USER_AGENT", "GenericScraper/1.0"),
             "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
         }
 
-    def _get_page_content(self, url: str, retries: int = 3) -> Optional[str]:
+        # One session for the whole crawl so connections are kept alive.
+        self.session = requests.Session()
+        self.session.headers.update(self.headers)
+
+    def close(self) -> None:
+        self.session.close()
+
+    def _fetch_page(self, url: str, retries: int = 3) -> Optional[Page]:
+        controller = self.rate_controller
+        metrics = self.metrics
+        revalidate = self.cache is not None
         for attempt in range(retries):
             try:
-                time.sleep(self.delay * attempt)
-                response = requests.get(url, headers=self.headers, timeout=30)
+                if attempt:
+                    metrics.count("fetch.retries")
+                if controller is None:
+                    time.sleep(self.delay * attempt)
+                else:
+                    time.sleep(controller.wait_time())
+                conditional = self.cache.conditional_headers(url) if revalidate else {}
+                started = time.perf_counter()
+                try:
+                    response = self.session.get(url, headers=conditional, timeout=30)
+                finally:
+                    latency = time.perf_counter() - started
+                    self.latencies.append(latency)
+                    metrics.count("fetch.requests")
+                    metrics.observe("fetch.latency_seconds", latency)
+                if is_congestion_status(response.status_code):
+                    metrics.count("fetch.throttled")
+                if controller is not None:
+                    if is_congestion_status(response.status_code):
+                        controller.on_congestion(
+                            parse_retry_after(response.headers.get("Retry-After"))
+                        )
+                    elif response.status_code < 400:
+                        controller.on_success(latency)
                 response.raise_for_status()
-                return response.text
+                if response.status_code != 304:
+                    metrics.observe("fetch.bytes", len(response.content))
+                if self.cache is None:
+                    page = Page(response.text)
+                else:
+                    page = self.cache.resolve(
+                        url, response.status_code, response.headers, response.text
+                    )
+                if page is not None:
+                    if page.not_modified:
+                        metrics.count("fetch.cache_hits")
+                    if self.archive is not None:
+                        self.archive.store(url, page.text)
+                    return page
+                revalidate = False
             except requests.exceptions.RequestException as e:
+                metrics.count("fetch.errors")
+                if controller is not None and isinstance(
+                    e,
+                    (requests.exceptions.ConnectionError, requests.exceptions.Timeout),
+                ):
+                    controller.on_congestion()
                 logger.warning(
                     f"Request to {url} failed (attempt {attempt + 1}/{retries}): {e}"
                 )
         logger.error(f"Failed to fetch {url} after {retries} attempts.")
+        metrics.count("fetch.failed_pages")
         return None
 
+    def _get_page_content(self, url: str, retries: int = 3) -> Optional[str]:
+        page = self._fetch_page(url, retries)
+        if page is None:
+            return None
+        if self.cache is not None:
+            self.cache.commit(page.entry)
+        return page.text
+
+    def listing_url(self, page_num: int) -> str:
+        return f"{self.microbes_url}?page={page_num}"
+
+    def parse_listing_page(self, html: str) -> List[str]:
+        """MMDBm IDs linked from one /microbes listing page, in page order."""
+        soup = BeautifulSoup(html, "lxml")
+        ids = []
+        for link in soup.select("td.microbe-link a.btn-card"):
+            href = link.get("href")
+            if href and "/microbes/" in href:
+                bacteria_id = href.split("/microbes/")[-1]
+                if bacteria_id.startswith("MMDBm"):
+                    ids.append(bacteria_id)
+        return ids
+
     def get_bacteria_ids(self, max_pages: int = 1) -> List[str]:
         ids = []
         for page_num in range(1, max_pages + 1):
-            page_url = f"{self.MICROBES_URL}?page={page_num}"
+            page_url = self.listing_url(page_num)
             logger.info(f"Fetching bacteria IDs from: {page_url}")
             html = self._get_page_content(page_url)
             if not html:
                 continue
 
-            soup = BeautifulSoup(html, "lxml")
-            links = soup.select("td.microbe-link a.btn-card")
-            if not links and page_num == 1:
+            page_ids = self.parse_listing_page(html)
+            if not page_ids and page_num == 1:
                 logger.warning(
                     "No bacteria links found on first page using selector 'td.microbe-link a.btn-card'. Check website structure."
                 )
-            page_ids_found = 0
-            for link in links:
-                href = link.get("href")
-                if href and "/microbes/" in href:
-                    bacteria_id = href.split("/microbes/")[-1]
-                    if bacteria_id.startswith("MMDBm"):
-                        ids.append(bacteria_id)
-                        page_ids_found += 1
-            if page_ids_found == 0 and page_num > 1:
+            ids.extend(page_ids)
+            if not page_ids and page_num > 1:
                 logger.info(
                     f"No more IDs found on page {page_num}. Stopping ID collection."
                 )
                 break
-        return list(set(ids))
+        return sorted(set(ids))
+
+    def detail_url(self, bacteria_id: str) -> str:
+        return f"{self.microbes_url}/{bacteria_id}"
+
+    def scrape_bacteria_result(self, bacteria_id: str) -> ScrapeResult:
+        """Like scrape_bacteria_data, but a page revalidated with a 304 is not re-parsed."""
+        page = self._fetch_page(self.detail_url(bacteria_id))
+        return self._result_for(bacteria_id, page)
+
+    def _result_for(self, bacteria_id: str, page: Optional[Page]) -> ScrapeResult:
+        if page is None:
+            return ScrapeResult(bacteria_id, None, FAILED)
+        if page.not_modified:
+            return ScrapeResult(bacteria_id, None, NOT_MODIFIED)
+        with self.metrics.timer("parse.seconds"):
+            data = self.parse_bacteria_page(bacteria_id, page.text)
+        return ScrapeResult(bacteria_id, data, OK, page.entry)
 
     def scrape_bacteria_data(self, bacteria_id: str) -> Optional[Dict]:
-        detail_url = f"{self.BASE_URL}/microbes/{bacteria_id}"
+        detail_url = self.detail_url(bacteria_id)
         logger.info(f"Scraping details for {bacteria_id} from {detail_url}")
         html = self._get_page_content(detail_url)
         if not html:
             return None
+        return self.parse_bacteria_page(bacteria_id, html)
 
-        soup = BeautifulSoup(html, "lxml")
-        data = {"bacteria_id": bacteria_id}
-
-        title_el = soup.select_one(".page-header h1")
-        if title_el:
-            name_match = re.match(r"^(.*?) \(MMDBm\d+\)", title_el.text.strip())
-            data["name"] = (
-                name_match.group(1).strip() if name_match else title_el.text.strip()
-            )
-
-        tax_map = {
-            "Superkingdom": "superkingdom",
-            "Kingdom": "kingdom",
-            "Phylum": "phylum",
-            "Class": "class_name",
-            "Order": "order",
-            "Family": "family",
-            "Genus": "genus",
-            "Species": "species",
-            "Strain": "strain",
-        }
-        for row in soup.select("#taxinfo tr"):
-            th = row.find("th")
-            td = row.find("td")
-            if th and td and th.text.strip() in tax_map:
-                data[tax_map[th.text.strip()]] = (
-                    td.text.strip() if "Not Available" not in td.text else None
-                )
-
-        prop_map = {
-            "Gram staining properties": "gram_stain",
-            "Shape": "shape",
-            "Mobility": "mobility",
-            "Flagellar presence": "flagellar_presence",
-            "Number of membranes": "number_of_membranes",
-            "Oxygen preference": "oxygen_preference",
-            "Optimal temperature": "optimal_temperature",
-            "Temperature range": "temperature_range",
-            "Habitat": "habitat",
-            "Biotic relationship": "biotic_relationship",
-            "Cell arrangement": "cell_arrangement",
-            "Sporulation": "sporulation",
-            "Metabolism": "metabolism",
-            "Energy source": "energy_source",
-        }
-        for row in soup.select("#microbe-properties tr"):
-            th = row.find("th")
-            td = row.find("td")
-            if th and td and th.text.strip() in prop_map:
-                field_name = prop_map[th.text.strip()]
-                value = td.text.strip()
-                if "Not Available" in value:
-                    value = None
-
-                if field_name in ["mobility", "flagellar_presence", "sporulation"]:
-                    data[field_name] = value.lower() == "yes" if value else None
-                elif field_name == "optimal_temperature" and value:
-                    match = re.search(r"(\d+(\.\d+)?)", value)
-                    data[field_name] = float(match.group(1)) if match else None
-                else:
-                    data[field_name] = value
-
-        disease_el = soup.select_one("td.microbe-disease")
-        if disease_el:
-            path_text = disease_el.text.strip().lower()
-            if "non-pathogenic" in path_text:
-                data["is_pathogen"] = False
-            elif "pathogenic" in path_text:
-                data["is_pathogen"] = True
-            else:
-                data["is_pathogen"] = False
-
-        return data
+    def parse_bacteria_page(self, bacteria_id: str, html: str) -> Dict:
+        return self.extractor.extract(bacteria_id, html)
 
     def save_bacteria_data(self, data: Dict) -> bool:
         if not Bacteria:
@@ -0,0 +1,267 @@
+import argparse
+import glob
+import hashlib
+import logging
+import os
+import random
+import re
+import threading
+import time
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional
+
+from src.archive import PageArchive
+
+logger = logging.getLogger(__name__)
+
+FIXTURES_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "fixtures", "mimedb"
+)
+LISTING_PAGE_SIZE = 100
+_LISTING_PATH = re.compile(r"^/microbes\?page=\d+$")
+
+
+def listing_html(bacteria_ids) -> str:
+    """A /microbes listing page with the markup parse_listing_page reads."""
+    rows = "\n".join(
+        f'<tr><td class="microbe-link"><a class="btn-card" href="/microbes/{bacteria_id}">{bacteria_id}</a></td></tr>'
+        for bacteria_id in bacteria_ids
+    )
+    return f'<html><body><table class="table"><tbody>\n{rows}\n</tbody></table></body></html>'
+
+
+def synthetic_pages(count: int, fixtures_dir: str = FIXTURES_DIR) -> Dict[str, str]:
+    """
+    ``count`` detail pages cloned round-robin from the fixture pages under
+    fresh IDs, plus the listing pages that link them.
+    """
+    templates = []
+    for path in sorted(glob.glob(os.path.join(fixtures_dir, "*.html"))):
+        with open(path, "r", encoding="utf-8") as f:
+            templates.append((os.path.splitext(os.path.basename(path))[0], f.read()))
+    if not templates:
+        raise ValueError(f"No fixture pages in {fixtures_dir}")
+
+    pages = {}
+    ids = [f"MMDBm{i:07d}" for i in range(1, count + 1)]
+    for i, bacteria_id in enumerate(ids):
+        template_id, html = templates[i % len(templates)]
+        pages[f"/microbes/{bacteria_id}"] = html.replace(template_id, bacteria_id)
+    for start in range(0, count, LISTING_PAGE_SIZE):
+        page_num = start // LISTING_PAGE_SIZE + 1
+        pages[f"/microbes?page={page_num}"] = listing_html(
+            ids[start : start + LISTING_PAGE_SIZE]
+        )
+    return pages
+
+
+class StandInServer(ThreadingHTTPServer):
+    """
+    Serves recorded or synthetic MiMeDB pages on localhost. Each response
+    waits ``latency`` +/- ``jitter`` seconds, and a fraction ``error_rate``
+    of requests fail with ``error_status``. With ``capacity``, requests beyond
+    that many per second (over a sliding one-second window) are refused with
+    429 and a ``Retry-After`` header, like a rate-limited origin. ETags are
+    sent and honoured, so
+    conditional GETs get 304s. Listing pages past the recorded ones come
+    back empty, which is how the crawler detects the end of the listing.
+    """
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        address,
+        pages: Dict[str, str],
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        error_status: int = 503,
+        seed: Optional[int] = None,
+        capacity: float = 0.0,
+        retry_after: int = 1,
+    ):
+        super().__init__(address, _StandInHandler)
+        self.pages = {key: body.encode("utf-8") for key, body in pages.items()}
+        self.etags = {
+            key: f'"{hashlib.md5(body).hexdigest()}"'
+            for key, body in self.pages.items()
+        }
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.random = random.Random(seed)
+        self.capacity = capacity
+        self.retry_after = retry_after
+        self._recent: deque = deque()
+        self.lock = threading.Lock()
+        self.stats = {
+            "requests": 0,
+            "ok": 0,
+            "not_modified": 0,
+            "errors": 0,
+            "throttled": 0,
+            "missing": 0,
+        }
+
+    def count(self, key: str) -> None:
+        with self.lock:
+            self.stats[key] += 1
+
+    def delay_and_fault(self):
+        """Seconds to wait for this request, and whether to fail it."""
+        with self.lock:
+            delay = max(
+                0.0, self.latency + self.random.uniform(-self.jitter, self.jitter)
+            )
+            fail = self.random.random() < self.error_rate
+        return delay, fail
+
+    def over_capacity(self) -> bool:
+        """Admits this request into the one-second window unless it is full."""
+        if not self.capacity:
+            return False
+        now = time.monotonic()
+        with self.lock:
+            while self._recent and now - self._recent[0] >= 1.0:
+                self._recent.popleft()
+            if len(self._recent) >= self.capacity:
+                return True
+            self._recent.append(now)
+        return False
+
+
+class _StandInHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server: StandInServer
+
+    def log_message(self, format, *args):
+        logger.debug(format % args)
+
+    def _send(self, status: int, body: bytes = b"", headers: Optional[Dict] = None):
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if body:
+            self.wfile.write(body)
+
+    def do_GET(self):
+        server = self.server
+        server.count("requests")
+        if server.over_capacity():
+            server.count("throttled")
+            self._send(
+                429, b"Too many requests", {"Retry-After": str(server.retry_after)}
+            )
+            return
+        delay, fail = server.delay_and_fault()
+        if delay:
+            time.sleep(delay)
+        if fail:
+            server.count("errors")
+            self._send(server.error_status, b"Injected error")
+            return
+
+        body = server.pages.get(self.path)
+        if body is None and _LISTING_PATH.match(self.path):
+            body = listing_html([]).encode("utf-8")
+        if body is None:
+            server.count("missing")
+            self._send(404, b"Not found")
+            return
+
+        etag = server.etags.get(self.path)
+        if etag and self.headers.get("If-None-Match") == etag:
+            server.count("not_modified")
+            self._send(304, headers={"ETag": etag})
+            return
+        server.count("ok")
+        headers = {"Content-Type": "text/html; charset=utf-8"}
+        if etag:
+            headers["ETag"] = etag
+        self._send(200, body, headers)
+
+
+def load_pages(archive_dir: Optional[str], synthetic: int) -> Dict[str, str]:
+    if archive_dir:
+        pages = dict(PageArchive(archive_dir).pages())
+        if not pages:
+            raise SystemExit(f"No pages recorded in {archive_dir}")
+        return pages
+    return synthetic_pages(synthetic)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(message)s")
+    parser = argparse.ArgumentParser(
+        description="Local stand-in for mimedb.org serving recorded or synthetic pages"
+    )
+    parser.add_argument(
+        "--archive",
+        default=None,
+        help="Directory recorded with `python -m src.main --archive-dir` to replay.",
+    )
+    parser.add_argument(
+        "--synthetic",
+        type=int,
+        default=1000,
+        help="Without --archive, serve this many detail pages cloned from the fixtures.",
+    )
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument(
+        "--latency", type=float, default=0.05, help="Seconds added to each response."
+    )
+    parser.add_argument(
+        "--jitter",
+        type=float,
+        default=0.0,
+        help="Random +/- seconds on top of --latency.",
+    )
+    parser.add_argument(
+        "--error-rate", type=float, default=0.0, help="Fraction of requests that fail."
+    )
+    parser.add_argument("--error-status", type=int, default=503)
+    parser.add_argument(
+        "--capacity",
+        type=float,
+        default=0.0,
+        help="Requests per second served before answering 429 (0 = unlimited).",
+    )
+    parser.add_argument(
+        "--retry-after",
+        type=int,
+        default=1,
+        help="Retry-After seconds sent with each 429.",
+    )
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    pages = load_pages(args.archive, args.synthetic)
+    server = StandInServer(
+        (args.host, args.port),
+        pages,
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        error_status=args.error_status,
+        seed=args.seed,
+        capacity=args.capacity,
+        retry_after=args.retry_after,
+    )
+    logger.info(
+        f"Serving {len(pages)} pages on http://{args.host}:{args.port} "
+        f"(latency={args.latency}s, jitter={args.jitter}s, error_rate={args.error_rate}, "
+        f"capacity={args.capacity or 'unlimited'}/s)"
+    )
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        logger.info(f"Stand-in stats: {server.stats}")
@@ -0,0 +1,219 @@
+import logging
+import queue
+import threading
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple
+
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session as SQLAlchemySession
+from src.backend_models import Bacteria
+from src.http_cache import CacheEntry, PageCache
+from src.metrics import RunMetrics
+
+logger = logging.getLogger(__name__)
+
+_CLOSE = object()
+
+Item = Tuple[Dict, Optional[CacheEntry]]
+
+
+class WriteResult(NamedTuple):
+    bacteria_id: str
+    ok: bool
+    error: Optional[str] = None
+
+
+def upsert_bacteria(db_session: SQLAlchemySession, records: List[Dict]) -> None:
+    """
+    Inserts records or, for an existing bacteria_id, overwrites the columns
+    present in the record, like save_bacteria_data does one row at a time.
+    Records are grouped by their key set because parsed pages omit fields
+    the page does not show.
+    """
+    valid_keys = {column.name for column in Bacteria.__table__.columns}
+    dialect_name = db_session.get_bind().dialect.name
+    if dialect_name == "postgresql":
+        insert = pg_insert
+    elif dialect_name == "sqlite":
+        insert = sqlite_insert
+    else:
+        raise ValueError(f"Upserts are not supported for dialect '{dialect_name}'.")
+
+    # One statement may not touch the same row twice; the last record wins.
+    # Rows go in key order so concurrent writers lock them in the same order.
+    latest = {record["bacteria_id"]: record for record in records}
+    now = datetime.utcnow()
+    groups: Dict[frozenset, List[Dict]] = {}
+    for _, record in sorted(latest.items()):
+        row = {k: v for k, v in record.items() if k in valid_keys}
+        row["updated_at"] = now
+        groups.setdefault(frozenset(row), []).append(row)
+
+    for keys, rows in groups.items():
+        stmt = insert(Bacteria.__table__)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["bacteria_id"],
+            set_={key: stmt.excluded[key] for key in keys if key != "bacteria_id"},
+        )
+        db_session.execute(stmt, rows)
+
+
+def commit_cache_entry(cache: PageCache, cache_entry: Optional[CacheEntry]) -> None:
+    """Commits a saved page's validators; failing to is logged, not raised."""
+    try:
+        cache.commit(cache_entry)
+    except OSError as e:
+        logger.warning(f"Could not cache {cache_entry.url}: {e}")
+
+
+class BatchWriter:
+    """
+    Collects parsed records from the crawl and writes them on ``workers``
+    background threads (one session each) as batched upserts, each flushing
+    every ``batch_size`` records or ``flush_seconds``, whichever comes first.
+    If a batch fails it is rolled back and its records are retried one by
+    one, so one bad row only fails itself. The outcome of every record is
+    handed back through ``results()``, so the caller's own session never
+    crosses threads. With a ``cache``, the page entry submitted with a record
+    is committed to it only after the record's row is. Batch sizes and commit
+    times go to ``metrics``.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], SQLAlchemySession],
+        batch_size: int = 200,
+        flush_seconds: float = 2.0,
+        workers: int = 1,
+        metrics: Optional[RunMetrics] = None,
+        cache: Optional[PageCache] = None,
+    ):
+        self.session_factory = session_factory
+        self.cache = cache
+        self.metrics = metrics or RunMetrics()
+        self.batch_size = batch_size
+        self.flush_seconds = flush_seconds
+        self.written = 0
+        self.failed = 0
+        self.batches = 0
+        self.write_seconds = 0.0
+        self._queue: "queue.Queue[Any]" = queue.Queue(maxsize=batch_size * 10)
+        self._results: "queue.SimpleQueue[WriteResult]" = queue.SimpleQueue()
+        self._lock = threading.Lock()
+        self._threads = [
+            threading.Thread(
+                target=self._run, name=f"scraper-db-writer-{i}", daemon=True
+            )
+            for i in range(max(1, workers))
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def submit(self, record: Dict, cache_entry: Optional[CacheEntry] = None) -> None:
+        """Queues a record; blocks when the writer is far behind (backpressure)."""
+        if not any(thread.is_alive() for thread in self._threads):
+            raise RuntimeError("The batch writer threads have stopped.")
+        self._queue.put((record, cache_entry))
+
+    def results(self) -> List[WriteResult]:
+        """Outcomes committed (or given up on) since the last call."""
+        drained = []
+        while True:
+            try:
+                drained.append(self._results.get_nowait())
+            except queue.Empty:
+                return drained
+
+    def close(self) -> None:
+        """Flushes everything still queued and stops the writer threads."""
+        for thread in self._threads:
+            if thread.is_alive():
+                self._queue.put(_CLOSE)
+        for thread in self._threads:
+            thread.join()
+
+    def _run(self) -> None:
+        db_session = self.session_factory()
+        try:
+            batch: List[Item] = []
+            deadline = None
+            while True:
+                timeout = (
+                    None if deadline is None else max(0.0, deadline - time.monotonic())
+                )
+                try:
+                    item = self._queue.get(timeout=timeout)
+                except queue.Empty:
+                    item = None
+                if item is _CLOSE:
+                    self._flush(db_session, batch)
+                    return
+                if item is not None:
+                    batch.append(item)
+                    if deadline is None:
+                        deadline = time.monotonic() + self.flush_seconds
+                if len(batch) >= self.batch_size or (
+                    deadline is not None and time.monotonic() >= deadline
+                ):
+                    self._flush(db_session, batch)
+                    batch = []
+                    deadline = None
+        finally:
+            db_session.close()
+
+    def _flush(self, db_session: SQLAlchemySession, batch: List[Item]) -> None:
+        if not batch:
+            return
+        with self._lock:
+            self.batches += 1
+        self.metrics.observe("save.batch_rows", len(batch))
+        started = time.perf_counter()
+        try:
+            upsert_bacteria(db_session, [record for record, _ in batch])
+            db_session.commit()
+            self._add_write_time(started)
+            self.metrics.observe("save.batch_seconds", time.perf_counter() - started)
+            for record, cache_entry in batch:
+                self._saved(record, cache_entry)
+            logger.info(f"Wrote batch of {len(batch)} records.")
+            return
+        except Exception as e:
+            db_session.rollback()
+            self._add_write_time(started)
+            self.metrics.count("save.batch_retries")
+            logger.warning(
+                f"Batch of {len(batch)} records failed ({e}). Retrying individually."
+            )
+
+        for record, cache_entry in batch:
+            started = time.perf_counter()
+            try:
+                upsert_bacteria(db_session, [record])
+                db_session.commit()
+                self._add_write_time(started)
+                self._saved(record, cache_entry)
+            except Exception as e:
+                db_session.rollback()
+                self._add_write_time(started)
+                self.metrics.count("save.errors")
+                logger.error(f"Error saving bacteria {record.get('bacteria_id')}: {e}")
+                self._report(record["bacteria_id"], False, str(e))
+
+    def _saved(self, record: Dict, cache_entry: Optional[CacheEntry]) -> None:
+        if self.cache is not None:
+            commit_cache_entry(self.cache, cache_entry)
+        self._report(record["bacteria_id"], True, None)
+
+    def _add_write_time(self, started: float) -> None:
+        with self._lock:
+            self.write_seconds += time.perf_counter() - started
+
+    def _report(self, bacteria_id: str, ok: bool, error: Optional[str]) -> None:
+        with self._lock:
+            if ok:
+                self.written += 1
+            else:
+                self.failed += 1
+        self._results.put(WriteResult(bacteria_id, ok, error))
@@ -0,0 +1,15 @@
+import os
+import sys
+import tempfile
+
+SCRAPER_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, SCRAPER_ROOT)
+# The backend models import themselves as ``app``.
+sys.path.insert(0, os.path.join(os.path.dirname(SCRAPER_ROOT), "backend"))
+
+# src.db and app.db.session build their engines at import time. The batch
+# writer uses its own threads, so the tests share an SQLite file, not :memory:.
+os.environ.setdefault(
+    "DATABASE_URL",
+    "sqlite:///" + os.path.join(tempfile.mkdtemp(prefix="scraper-tests-"), "db.sqlite"),
+)
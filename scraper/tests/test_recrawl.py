@@ -0,0 +1,90 @@
+import threading
+
+import pytest
+from app.db.session import Base
+from src import writer as writer_module
+from src.db import SessionLocalScraper, engine
+from src.main import run_scraper
+from src.backend_models import Bacteria
+from src.standin import StandInServer, synthetic_pages
+
+PAGES = 50
+
+
+@pytest.fixture
+def server():
+    server = StandInServer(("127.0.0.1", 0), synthetic_pages(PAGES))
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture(autouse=True)
+def tables():
+    Base.metadata.create_all(engine)
+    yield
+    Base.metadata.drop_all(engine)
+
+
+def crawl(server, cache_dir, engine_name="async"):
+    host, port = server.server_address
+    return run_scraper(
+        max_pages=1,
+        max_bacteria_per_page=0,
+        delay=0.0,
+        engine=engine_name,
+        rate=1000.0,
+        adaptive=False,
+        base_url=f"http://{host}:{port}",
+        cache_dir=str(cache_dir),
+        parse_workers=0,
+        flush_seconds=0.1,
+    )
+
+
+def stored_rows() -> int:
+    db = SessionLocalScraper()
+    try:
+        return db.query(Bacteria).count()
+    finally:
+        db.close()
+
+
+def delete_rows() -> None:
+    db = SessionLocalScraper()
+    try:
+        db.query(Bacteria).delete()
+        db.commit()
+    finally:
+        db.close()
+
+
+@pytest.mark.parametrize("engine_name", ["async", "sync"])
+def test_deleted_rows_are_downloaded_again(server, tmp_path, engine_name):
+    first = crawl(server, tmp_path, engine_name)
+    assert first["successful"] == PAGES
+    assert crawl(server, tmp_path, engine_name)["unchanged"] == PAGES
+
+    delete_rows()
+    again = crawl(server, tmp_path, engine_name)
+    assert again["successful"] == PAGES
+    assert again["unchanged"] == 0
+    assert stored_rows() == PAGES
+
+
+def test_failed_saves_are_not_cached(server, tmp_path, monkeypatch):
+    def failing_upsert(db_session, records):
+        raise RuntimeError("database unavailable")
+
+    with monkeypatch.context() as patch:
+        patch.setattr(writer_module, "upsert_bacteria", failing_upsert)
+        failed = crawl(server, tmp_path)
+    assert failed["failed"] == PAGES
+    assert stored_rows() == 0
+
+    again = crawl(server, tmp_path)
+    assert again["successful"] == PAGES
+    assert again["unchanged"] == 0
+    assert stored_rows() == PAGES